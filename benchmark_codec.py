@@ -0,0 +1,249 @@
+# Codec Microbenchmark
+# ------------------------------
+# Description:
+# Microbenchmark of the Generic-Communication-Dataclass codec
+# Operations (conversion-code, pack, unpack, remap, remap from bytes and
+# construction) are timed across flat, nested and list-heavy message shapes
+# for each codec path:
+#  - generic : Field walk of the dataclass and the Type-Map (CommToolbox)
+#  - compiled : Compiled Communication Schema (precompiled struct, decode plan)
+#  - codegen : Compiled Communication Schema with code-generated functions
+#  - pickle : Python pickle (reference)
+# Reported per operation: operations per second, bytes per message and
+# peak allocated bytes per operation (tracemalloc). Results can be saved as
+# a baseline (JSON) and compared with later runs
+#
+# Usage:
+#   python benchmark_codec.py
+#   python benchmark_codec.py --shapes nested list --paths generic compiled
+#   python benchmark_codec.py --save baseline.json
+#   python benchmark_codec.py --baseline baseline.json
+
+# Version
+# ------------------------------
+# 0.0   -   Initial version
+#           [17.10.2026]
+
+# Import packages
+from dataclasses import dataclass, field
+from typing import ClassVar
+import argparse
+import json
+import pickle
+import platform
+import sys
+import timeit
+import tracemalloc
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+from lib.generic_commdata import GenericCommClass
+from comm_data import AxisData, TestClass1
+
+# Message Shapes
+# ------------------------------
+# Dataclass - Nested Message
+@dataclass
+class NestedMessage(GenericCommClass):
+    value : float = 0.909
+    axis : AxisData = field(default_factory = lambda: AxisData(45.0, 107.5, 0.33))
+    test : TestClass1 = field(default_factory = TestClass1)
+
+# Dataclass - List Message
+@dataclass
+class ListMessage(GenericCommClass):
+    count : int = 64
+    values : list = field(default_factory = lambda: [float(i) for i in range(64)])
+    limits : list = field(default_factory = lambda: [float(-i) for i in range(64)])
+
+# Dataclasses - Code-generated codec
+@dataclass
+class AxisDataCodegen(AxisData):
+    comm_codegen : ClassVar[bool] = True
+
+@dataclass
+class NestedMessageCodegen(NestedMessage):
+    comm_codegen : ClassVar[bool] = True
+
+@dataclass
+class ListMessageCodegen(ListMessage):
+    comm_codegen : ClassVar[bool] = True
+
+# Message types per shape (Schema, Code-generated)
+SHAPES : dict = {
+    'flat' : (AxisData, AxisDataCodegen),
+    'nested' : (NestedMessage, NestedMessageCodegen),
+    'list' : (ListMessage, ListMessageCodegen),
+}
+
+# Codec paths
+PATHS : tuple = ('generic', 'compiled', 'codegen', 'pickle')
+
+# Operations
+# ------------------------------
+def get_operations(message_type : type, path : str) -> tuple[dict, int]:
+    """
+    Operations of a codec path, prepared for a message type
+    :param message_type: Message type (GenericCommClass)
+    :param path: Codec path (see "PATHS")
+    :return operations: Operations by name (dict of callables without arguments)
+    :return size: Bytes per message of the codec path (int)
+    """
+
+    message = message_type()
+
+    # Generic
+    # (field walk, Type-Map built for every remap)
+    if path == 'generic':
+        packed, code = message.pack_to_bytes_generic()
+        unpacked = CommToolbox.unpack_from_bytes(packed, code)
+        return {'construct' : lambda: message_type().get_typemap(),
+                'get_byte_conversion' : message.get_byte_conversion_generic,
+                'pack_to_bytes' : message.pack_to_bytes_generic,
+                'unpack_from_bytes' : lambda: CommToolbox.unpack_from_bytes(packed, code),
+                'remap' : lambda: message.remap_dataclass(unpacked),
+                'remap_from_bytes' : lambda: message.remap_from_bytes_generic(packed, code)}, len(packed)
+
+    # Compiled and Code-generated
+    # (shared Communication Schema of the class)
+    if path in ('compiled', 'codegen'):
+        schema = message.get_schema()
+        packed, code = message.pack_to_bytes()
+        unpacked = schema.unpack(packed)
+        return {'construct' : message_type,
+                'get_byte_conversion' : message.get_byte_conversion,
+                'pack_to_bytes' : message.pack_to_bytes,
+                'unpack_from_bytes' : lambda: schema.unpack(packed),
+                'remap' : lambda: message.decode_fields(schema, unpacked),
+                'remap_in_place' : lambda: message.decode_fields(schema, unpacked, in_place = True),
+                'remap_from_bytes' : lambda: message.remap_from_bytes(packed, code)}, len(packed)
+
+    # Pickle
+    # (dataclass object is packed and created by pickle)
+    if path == 'pickle':
+        packed = pickle.dumps(message)
+        return {'construct' : message_type,
+                'pack_to_bytes' : lambda: pickle.dumps(message),
+                'remap_from_bytes' : lambda: pickle.loads(packed)}, len(packed)
+
+    # Raise error
+    raise ValueError('get_operations: ERROR - Codec path {%s} is unsupported' %(path))
+
+
+# Measure Operation
+# ------------------------------
+def measure(operation, min_time : float = 0.2, repeat : int = 3) -> dict:
+    """
+    Measure an operation
+    :param operation: Operation (callable without arguments)
+    :param min_time: Minimum time of a measurement in seconds (float)
+    :param repeat: Number of measurements, the best is reported (int)
+    :return result: Operations per second and peak allocated bytes per operation (dict)
+    """
+
+    # Operations per second
+    # (number of operations calibrated to the minimum time)
+    timer = timeit.Timer(operation)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 2
+    best = min(timer.repeat(repeat, number))
+
+    # Peak allocated bytes of a single operation
+    # (after the operation has run, caches are warm)
+    tracemalloc.start()
+    try:
+        _allocated = 0
+        for i in range(repeat):
+            _current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            operation()
+            _, _peak = tracemalloc.get_traced_memory()
+            _allocated = max(_allocated, _peak - _current)
+    finally:
+        tracemalloc.stop()
+
+    # Function return
+    return {'ops' : number / best, 'alloc' : _allocated}
+
+
+# Run Benchmark
+# ------------------------------
+def run_benchmark(shapes : list = tuple(SHAPES), paths : list = PATHS, min_time : float = 0.2, repeat : int = 3) -> dict:
+    """
+    Run the codec microbenchmark
+    :param shapes: Message shapes (see "SHAPES")
+    :param paths: Codec paths (see "PATHS")
+    :param min_time: Minimum time of a measurement in seconds (float)
+    :param repeat: Number of measurements, the best is reported (int)
+    :return results: Results by "shape/path/operation" (dict)
+    """
+    results = {}
+    for shape in shapes:
+        message_type, codegen_type = SHAPES[shape]
+        for path in paths:
+            operations, size = get_operations(codegen_type if path == 'codegen' else message_type, path)
+            for name, operation in operations.items():
+                result = measure(operation, min_time, repeat)
+                result['bytes'] = size
+                results[shape + '/' + path + '/' + name] = result
+
+    # Function return
+    return results
+
+
+# Report
+# ------------------------------
+def report(results : dict, baseline : dict = None) -> None:
+    """
+    Print the results (and the change of operations per second compared to a baseline)
+    :param results: Results by "shape/path/operation" (dict)
+    :param baseline: Results of a baseline (dict) (default: no comparison)
+    """
+    print("------------------------------")
+    print("%-44s %12s %8s %10s %10s" % ('Operation', 'Ops/s', 'Bytes', 'Alloc B', 'Baseline'))
+    for name, result in results.items():
+        _base = (baseline or {}).get(name)
+        _change = ('%+9.1f%%' % ((result['ops'] - _base['ops']) / _base['ops'] * 100.0)) if _base else ''
+        print("%-44s %12.0f %8d %10d %10s" % (name, result['ops'], result['bytes'], result['alloc'], _change))
+    print("------------------------------")
+
+
+# Main
+# ------------------------------
+def main(argv = None) -> dict:
+    parser = argparse.ArgumentParser(description = 'Codec microbenchmark of the Generic-Communication-Dataclass')
+    parser.add_argument('--shapes', nargs = '+', default = list(SHAPES), choices = list(SHAPES), help = 'Message shapes')
+    parser.add_argument('--paths', nargs = '+', default = list(PATHS), choices = list(PATHS), help = 'Codec paths')
+    parser.add_argument('--min-time', type = float, default = 0.2, help = 'Minimum time of a measurement (s)')
+    parser.add_argument('--repeat', type = int, default = 3, help = 'Number of measurements (best is reported)')
+    parser.add_argument('--save', metavar = 'PATH', help = 'Save the results as a baseline (JSON)')
+    parser.add_argument('--baseline', metavar = 'PATH', help = 'Compare the results with a saved baseline (JSON)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.shapes, args.paths, args.min_time, args.repeat)
+
+    # Compare with baseline
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+    report(results, baseline)
+
+    # Save baseline
+    # (with the environment the results were measured in)
+    if args.save is not None:
+        with open(args.save, 'w') as file:
+            json.dump({'python' : sys.version,
+                       'platform' : platform.platform(),
+                       'results' : results}, file, indent = 2)
+
+    # Function return
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# Loopback Latency Benchmark
+# ------------------------------
+# Description:
+# Round-trip latency benchmark of the UDP echo path
+# (UDPClient.sendData -> UDPCommunication.connect -> reply)
+# The server runs in a separate process on loopback, the client sends
+# a number of messages of each message type (one at a time, waiting for
+# the reply) and reports throughput and round-trip latency percentiles.
+# Results can be saved as a baseline (JSON) and compared with later runs
+#
+# Usage:
+#   python benchmark_latency.py AxisData TestClass1 payload:64 payload:1024 --count 10000
+#   python benchmark_latency.py --save baseline.json
+#   python benchmark_latency.py --baseline baseline.json
+
+# Version
+# ------------------------------
+# 0.0   -   Initial version
+#           [17.10.2026]
+
+# Import packages
+from dataclasses import field, make_dataclass
+from typing import Annotated
+import argparse
+import importlib
+import json
+import math
+import multiprocessing
+import platform
+import socket
+import sys
+import time
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+import comm_data
+import lib.comm_schema as CommSchema
+from lib.generic_commdata import GenericCommClass
+from udp_client import UDPClient
+from udp_communication import UDPCommunication
+
+# Default Message Types
+DEFAULT_MESSAGES : tuple = ('AxisData', 'TestClass1', 'payload:64', 'payload:1024')
+
+# Payload Message Types
+# (created once per size)
+_payload_types = {}
+
+# Get Message Type
+# ------------------------------
+def get_message_type(name : str) -> type:
+    """
+    Get a message type (Generic-Communication-Dataclass) by name
+     - "AxisData" : Class of the Communication Data (comm_data)
+     - "module.Class" : Class of an importable module
+     - "payload:N" : Message with a fixed-capacity array of N bytes
+    :param name: Name of the message type (str)
+    :return message_type: Message type (GenericCommClass)
+    """
+
+    # Payload of a given size
+    if name.startswith('payload:'):
+        _size = int(name.partition(':')[2])
+        if _size not in _payload_types:
+            _payload_types[_size] = make_dataclass('Payload' + format(_size),
+                [('data', Annotated[list, CommToolbox.FixedArray(CommToolbox.COMM_CONST.UCHAR, _size)],
+                  field(default_factory = lambda: [i % 256 for i in range(_size)]))],
+                bases = (GenericCommClass,))
+        return _payload_types[_size]
+
+    # Class of a module
+    _module, _, _class = name.rpartition('.')
+    _message_type = getattr(importlib.import_module(_module) if _module else comm_data, _class, None)
+    if not (isinstance(_message_type, type) and issubclass(_message_type, GenericCommClass)):
+        raise ValueError('get_message_type: ERROR - Message type {%s} is not a Generic-Communication-Dataclass' %(name))
+
+    # Function return
+    return _message_type
+
+
+# Get Frame Size
+# ------------------------------
+def get_frame_size(message) -> int:
+    """
+    Size of the message with the Communication Header (bytes)
+    """
+    return CommToolbox.HEADER_SIZE + message.get_schema().size
+
+
+# Percentile
+# ------------------------------
+def percentile(samples : list, percent : float) -> float:
+    """
+    Percentile of sorted samples (nearest rank)
+    :param samples: Sorted samples (list)
+    :param percent: Percentile (0 - 100)
+    :return value: Value of the percentile
+    """
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(percent / 100.0 * len(samples)) - 1)]
+
+
+# Loopback Server
+# ------------------------------
+def _serve(message_names : list, buffer_size : int, batch_size : int, connection, stop) -> None:
+    """
+    Run the UDP server (echo) on loopback until stopped
+    (target of the server process, the port is sent on the connection)
+    """
+
+    # Server with the messages registered
+    server = UDPCommunication(Port = 0, BufferSize = buffer_size, BatchSize = batch_size, Quiet = True,
+                              Messages = [get_message_type(name)() for name in message_names])
+
+    # Timeout socket
+    # (the stop event is checked between receives)
+    server.serverSocket.settimeout(0.1)
+    connection.send(server.port)
+    connection.close()
+
+    while not stop.is_set():
+        try:
+            server.connect()
+        except socket.timeout:
+            pass
+    server.serverSocket.close()
+
+
+# Run Benchmark
+# ------------------------------
+def run_benchmark(message_names : list = DEFAULT_MESSAGES, count : int = 10000, warmup : int = 1000,
+                  batch_size : int = 1) -> dict:
+    """
+    Run the loopback round-trip benchmark
+    :param message_names: Names of the message types (see "get_message_type")
+    :param count: Number of measured round trips per message type (int)
+    :param warmup: Number of round trips before measuring (int)
+    :param batch_size: Batch size of the server (int)
+    :return results: Results per message type (dict)
+    """
+
+    messages = [get_message_type(name)() for name in message_names]
+
+    # Buffer size of the largest message
+    # (or of the schema definitions, sent once at startup)
+    _definitions = CommSchema.pack_definitions([message.get_schema() for message in messages])
+    buffer_size = max(512, CommToolbox.HEADER_SIZE + len(_definitions), *(get_frame_size(message) for message in messages))
+
+    # Start server process
+    _receiver, _sender = multiprocessing.Pipe(False)
+    _stop = multiprocessing.Event()
+    _server = multiprocessing.Process(target = _serve, args = (list(message_names), buffer_size, batch_size, _sender, _stop),
+                                      daemon = True)
+    _server.start()
+    _sender.close()
+    port = _receiver.recv()
+    _receiver.close()
+
+    results = {}
+    try:
+        # Client
+        client = UDPClient(RemotePort = port, BufferSize = buffer_size, Quiet = True)
+        client.sendSchemas(messages)
+
+        for name, message in zip(message_names, messages):
+            # Warmup
+            for i in range(warmup):
+                client.sendData(message)
+
+            # Round trips
+            _samples = []
+            _timeouts = 0
+            _start = time.perf_counter()
+            for i in range(count):
+                _sent = time.perf_counter_ns()
+                if client.sendData(message) is None:
+                    _timeouts += 1
+                    continue
+                _samples.append(time.perf_counter_ns() - _sent)
+            _elapsed = time.perf_counter() - _start
+
+            # Results
+            # (latency in microseconds)
+            _samples.sort()
+            results[name] = {'size' : get_frame_size(message),
+                             'count' : count,
+                             'timeouts' : _timeouts,
+                             'throughput' : count / _elapsed,
+                             'mean' : (sum(_samples) / len(_samples) / 1e3) if _samples else 0.0,
+                             'p50' : percentile(_samples, 50.0) / 1e3,
+                             'p99' : percentile(_samples, 99.0) / 1e3,
+                             'p99.9' : percentile(_samples, 99.9) / 1e3,
+                             'max' : (_samples[-1] / 1e3) if _samples else 0.0}
+
+        client.clientSocket.close()
+
+    # Stop server process
+    finally:
+        _stop.set()
+        _server.join(5.0)
+
+    # Function return
+    return results
+
+
+# Report
+# ------------------------------
+def report(results : dict, baseline : dict = None) -> None:
+    """
+    Print the results (and the change compared to a baseline)
+    :param results: Results per message type (dict)
+    :param baseline: Results of a baseline (dict) (default: no comparison)
+    """
+    print("------------------------------")
+    print("%-16s %8s %12s %10s %10s %10s %10s" % ('Message', 'Bytes', 'Msg/s', 'p50 us', 'p99 us', 'p99.9 us', 'Timeouts'))
+    for name, result in results.items():
+        print("%-16s %8d %12.0f %10.1f %10.1f %10.1f %10d" % (name, result['size'], result['throughput'],
+              result['p50'], result['p99'], result['p99.9'], result['timeouts']))
+
+        # Change compared to baseline
+        # (positive throughput change and negative latency change are improvements)
+        _base = (baseline or {}).get(name)
+        if _base is not None:
+            print("%-16s %8s %+11.1f%% %+9.1f%% %+9.1f%% %+9.1f%%" % ('  vs baseline', '',
+                  _change(result['throughput'], _base['throughput']), _change(result['p50'], _base['p50']),
+                  _change(result['p99'], _base['p99']), _change(result['p99.9'], _base['p99.9'])))
+    print("------------------------------")
+
+def _change(value : float, base : float) -> float:
+    return ((value - base) / base * 100.0) if base else 0.0
+
+
+# Main
+# ------------------------------
+def main(argv = None) -> dict:
+    parser = argparse.ArgumentParser(description = 'Loopback round-trip latency benchmark of the UDP echo path')
+    parser.add_argument('messages', nargs = '*', default = list(DEFAULT_MESSAGES),
+                        help = 'Message types: class name in comm_data, module.Class or payload:N (bytes)')
+    parser.add_argument('--count', type = int, default = 10000, help = 'Measured round trips per message type')
+    parser.add_argument('--warmup', type = int, default = 1000, help = 'Round trips before measuring')
+    parser.add_argument('--batch-size', type = int, default = 1, help = 'Batch size of the server')
+    parser.add_argument('--save', metavar = 'PATH', help = 'Save the results as a baseline (JSON)')
+    parser.add_argument('--baseline', metavar = 'PATH', help = 'Compare the results with a saved baseline (JSON)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.messages, args.count, args.warmup, args.batch_size)
+
+    # Compare with baseline
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+    report(results, baseline)
+
+    # Save baseline
+    # (with the environment the results were measured in)
+    if args.save is not None:
+        with open(args.save, 'w') as file:
+            json.dump({'python' : sys.version,
+                       'platform' : platform.platform(),
+                       'count' : args.count,
+                       'results' : results}, file, indent = 2)
+
+    # Function return
+    return results
+
+if __name__ == "__main__":
+    main()
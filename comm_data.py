@@ -7,6 +7,11 @@
 
 # Version
 # ------------------------------
+# 0.3   -   Updated with Communication Schemas
+#           compiled at import time
+#           [16.10.2026]
+# 0.2   -   Updated with Axis-Data
+#           [16.10.2026]
 # 0.1   -   Updated with Generic-Communication-Dataclass
 #           [12.07.2022] - Jan T. Olsen 
 # 0.0   -   Initial version
@@ -26,4 +31,18 @@ from lib.generic_commdata import GenericCommClass
 class TestClass1(GenericCommClass):
 
     nautisk_mil : float = 1.852
-    engelsk_mil : int = 1609 
\ No newline at end of file
+    engelsk_mil : int = 1609 
+
+# Dataclass - Axis Data
+# (axis positions sent between UDP-Client and UDP-Server)
+@dataclass
+class AxisData(GenericCommClass):
+
+    axis1 : float = 0.0
+    axis2 : float = 0.0
+    axis3 : float = 0.0
+
+# Compile Communication Schemas
+# (once at import time, from the class definitions)
+TestClass1.compile_schema()
+AxisData.compile_schema()
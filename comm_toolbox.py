@@ -6,14 +6,37 @@
 
 # Version
 # ------------------------------
+# 0.6   -   Updated with port sharing (SO_REUSEPORT)
+#           in the Communication Configuration
+#           [17.10.2026]
+# 0.5   -   Updated with logging configuration and
+#           rate-limited logging (per-packet reports)
+#           [16.10.2026]
+# 0.4   -   Updated with socket buffer sizes in the
+#           Communication Configuration and kernel
+#           drop counting (SO_RXQ_OVFL)
+#           [16.10.2026]
+# 0.3   -   Updated with Receive Buffer Pool and
+#           batched receive of datagrams
+#           [16.10.2026]
+# 0.2   -   Updated with Field Declarations
+#           (fixed-capacity and length-prefixed fields)
+#           [16.10.2026]
+# 0.1   -   Updated with compiled Conversion-Codes
+#           (LRU-cache) for pack and unpack,
+#           binary Communication Header
+#           [16.10.2026]
 # 0.0   -   Initial version
 #           [26.06.2022] - Jan T. Olsen
 
 # Import packages
 from dataclasses import astuple, dataclass, field, is_dataclass
+from functools import lru_cache
+import logging
 import socket
 import struct
 import sys
+import threading
 
 # Dataclass - Communication Constants
 @dataclass(frozen = True)
@@ -66,6 +89,8 @@ class COMM_CONST:
 
 # Dictionary: Byte Format Code
 # ------------------------------
+# Default Byte Format-Code of a Python type
+# (fields can declare another width, e.g. Annotated[int, COMM_CONST.DINT])
 BYTE_FORMAT_CODE : dict[type, str] = {
     bool    : COMM_CONST.BOOL,
     bytes   : COMM_CONST.BYTE,
@@ -74,6 +99,19 @@ BYTE_FORMAT_CODE : dict[type, str] = {
     str     : COMM_CONST.STRING,
 }
 
+# Communication Header Format
+# ------------------------------
+# Fixed-size binary header (network byte order) sent in front of every message:
+#   - Version (B) : Header version
+#   - Type ID (B) : Sender type (Server, GUI, Matlab, etc)
+#   - Header length (H) : Length of the message header
+#   - Sequence (I) : Sequence number of the message
+#   - Content length (I) : Length of the message's data-content
+#   - Schema ID (I) : Schema ID of the message's data-content
+HEADER_VERSION  : int = 1
+HEADER_STRUCT   : struct.Struct = struct.Struct(COMM_CONST.Network + 'BBHIII')
+HEADER_SIZE     : int = HEADER_STRUCT.size
+
 # Dataclass - Communication Header
 @dataclass()
 class COMM_HEADER():
@@ -83,16 +121,175 @@ class COMM_HEADER():
     This contains information such as:
      - Type ID (int) : (Server, GUI, Matlab, etc)
      - Content length (int) : Length of the message's data-content
-     - Header length (int) : Length of the message header (default: 32)
+     - Header length (int) : Length of the message header (default: HEADER_SIZE)
      - Encoding (str) : Encoding used by the content (default: utf-8)
      - Byteorder (str) : Byte order of the machine (little-, big-endian) (default: sys.byteorder)    
+     - Sequence (int) : Sequence number of the message (default: 0)
+     - Schema ID (int) : Schema ID of the message's data-content (default: 0)
+    The header is packed to and unpacked from a fixed-size binary header
+    using "pack_header" and "unpack_header"
     """
 
     type_id : int
     content_length : int
-    header_length  : int = field(repr = False, default = 32)
+    header_length  : int = field(repr = False, default = HEADER_SIZE)
     encoding    : str = field(repr = False, default = 'utf-8')
     byteorder   : str = field(repr = False, default = sys.byteorder)
+    sequence    : int = 0
+    schema_id   : int = 0
+
+
+# Pack Header
+# ------------------------------
+def pack_header(type_id : int, content_length : int, sequence : int = 0, schema_id : int = 0) -> bytes:
+    """
+    Pack Communication Header to bytes
+    :param type_id: Sender type (Server, GUI, Matlab, etc) (int)
+    :param content_length: Length of the message's data-content (int)
+    :param sequence: Sequence number of the message (int)
+    :param schema_id: Schema ID of the message's data-content (int)
+    :return packed_header: Packed header (bytes)
+    """
+    return HEADER_STRUCT.pack(HEADER_VERSION, type_id, HEADER_SIZE, sequence, content_length, schema_id)
+
+
+# Pack Header into Buffer
+# ------------------------------
+def pack_header_into(buffer, offset : int, type_id : int, content_length : int, sequence : int = 0, schema_id : int = 0) -> int:
+    """
+    Pack Communication Header into a preallocated buffer
+    :param buffer: Writable buffer (bytearray, memoryview)
+    :param offset: Offset in the buffer (int)
+    :param type_id: Sender type (Server, GUI, Matlab, etc) (int)
+    :param content_length: Length of the message's data-content (int)
+    :param sequence: Sequence number of the message (int)
+    :param schema_id: Schema ID of the message's data-content (int)
+    :return size: Number of packed bytes (int)
+    """
+    HEADER_STRUCT.pack_into(buffer, offset, HEADER_VERSION, type_id, HEADER_SIZE, sequence, content_length, schema_id)
+    return HEADER_SIZE
+
+
+# Unpack Header
+# ------------------------------
+def unpack_header(buffer, offset : int = 0) -> COMM_HEADER:
+    """
+    Unpack Communication Header from a buffer
+    The header is validated against the header version, the header length and the length of the buffer
+    :param buffer: Readable buffer (bytes, bytearray, memoryview)
+    :param offset: Offset in the buffer (int)
+    :return header: Communication Header (COMM_HEADER)
+    """
+
+    # Check for incomplete header
+    if len(buffer) - offset < HEADER_SIZE:
+        raise ValueError('unpack_header: ERROR - Buffer is shorter than header')
+
+    # Unpack header from buffer
+    _version, _type_id, _header_length, _sequence, _content_length, _schema_id = HEADER_STRUCT.unpack_from(buffer, offset)
+
+    # Check for unsupported header version
+    if _version != HEADER_VERSION:
+        raise ValueError('unpack_header: ERROR - Unsupported header version {%s}' %_version)
+
+    # Check for invalid header length
+    # (the data-content starts after the header)
+    if _header_length < HEADER_SIZE:
+        raise ValueError('unpack_header: ERROR - Invalid header length {%s}' %_header_length)
+
+    # Check for incomplete message
+    if len(buffer) - offset < _header_length + _content_length:
+        raise ValueError('unpack_header: ERROR - Buffer is shorter than message')
+
+    # Function return
+    return COMM_HEADER(_type_id, _content_length, _header_length, sequence = _sequence, schema_id = _schema_id)
+
+
+# Field Declarations
+# ------------------------------
+# Declared layout of a dataclass field, given as metadata of the field annotation
+# (e.g. name : Annotated[str, FixedString(16)] = 'olsen')
+# A declared field has the same layout for every value of the field, so a dataclass
+# with only declared strings and lists has a single (value-independent) layout
+#   - Fixed-capacity: Value is padded to the capacity (strings with NUL-bytes, lists with zeros)
+#   - Length-prefixed: Value is sent with its length (LENGTH_PREFIX) in front of the capacity
+LENGTH_PREFIX : str = COMM_CONST.UINT
+
+# Byte Format-Codes of array elements (primitive values)
+ARRAY_ELEMENT_CODES : frozenset = frozenset((COMM_CONST.SCHAR, COMM_CONST.UCHAR, COMM_CONST.BOOL,
+                                             COMM_CONST.INT, COMM_CONST.UINT, COMM_CONST.DINT, COMM_CONST.UDINT,
+                                             COMM_CONST.LINT, COMM_CONST.ULINT, COMM_CONST.FLOAT, COMM_CONST.DOUBLE))
+
+# Dataclass - Fixed-Capacity String
+@dataclass(frozen = True)
+class FixedString():
+    """
+    Fixed-Capacity String
+    String field packed to a fixed number of bytes (padded with NUL-bytes),
+    trailing NUL-bytes are stripped when unpacked. Values ending with a NUL-byte
+    are rejected when packed (use "PrefixedString" for such values)
+    """
+    capacity : int
+
+    def __post_init__(self) -> None:
+        _check_capacity(self)
+
+# Dataclass - Fixed-Capacity Array
+@dataclass(frozen = True)
+class FixedArray():
+    """
+    Fixed-Capacity Array
+    List field packed to a fixed number of values (padded with zeros),
+    unpacked as a list of capacity values
+    """
+    code : str
+    capacity : int
+
+    def __post_init__(self) -> None:
+        _check_capacity(self)
+        _check_element_code(self)
+
+# Dataclass - Length-Prefixed String
+@dataclass(frozen = True)
+class PrefixedString():
+    """
+    Length-Prefixed String
+    String field packed as its length followed by a fixed number of bytes,
+    unpacked as the string of the given length
+    """
+    capacity : int
+
+    def __post_init__(self) -> None:
+        _check_capacity(self)
+
+# Dataclass - Length-Prefixed Array
+@dataclass(frozen = True)
+class PrefixedArray():
+    """
+    Length-Prefixed Array
+    List field packed as its length followed by a fixed number of values,
+    unpacked as the list of the given length
+    """
+    code : str
+    capacity : int
+
+    def __post_init__(self) -> None:
+        _check_capacity(self)
+        _check_element_code(self)
+
+
+# Check Capacity of Field Declaration
+# ------------------------------
+def _check_capacity(declaration) -> None:
+    if (type(declaration.capacity) is not int) or not (0 < declaration.capacity < 2**16):
+        raise ValueError('%s: ERROR - Capacity {%r} is invalid' %(type(declaration).__name__, declaration.capacity))
+
+
+# Check Element-Code of Field Declaration
+# ------------------------------
+def _check_element_code(declaration) -> None:
+    if declaration.code not in ARRAY_ELEMENT_CODES:
+        raise ValueError('%s: ERROR - Element Format-Code {%r} is invalid' %(type(declaration).__name__, declaration.code))
 
 
 # Dataclass - Communication Type-Map
@@ -117,13 +314,19 @@ class _CommConfig:
     """
     Communication Configuration
     Data container for Communication Configuration parameters
-    Includes IP-Address, Port and Buffer-Size
+    Includes IP-Address, Port and Buffer-Size,
+    socket buffer sizes (SO_RCVBUF, SO_SNDBUF), kernel drop counting (SO_RXQ_OVFL)
+    and port sharing (SO_REUSEPORT) (see "configure_socket")
     """
 
     IP: str = field(init=False)
     Port: int = field(init=False)
     BufferSize: int = field(init=False)
     Config: tuple = field(init=False)
+    ReceiveBufferSize: int = field(init=False)
+    SendBufferSize: int = field(init=False)
+    DropCounting: bool = field(init=False)
+    ReusePort: bool = field(init=False)
 
     def __post_init__(self) -> None:
         self.Config = (self.IP, self.Port)
@@ -143,6 +346,10 @@ class LocalConfig(_CommConfig):
     Port: int = field(default=22000)
     BufferSize: int = field(default=512)
     Config: tuple = field(init=False)
+    ReceiveBufferSize: int = field(default=None)    # SO_RCVBUF (None: system default)
+    SendBufferSize: int = field(default=None)       # SO_SNDBUF (None: system default)
+    DropCounting: bool = field(default=True)        # SO_RXQ_OVFL (where supported)
+    ReusePort: bool = field(default=False)          # SO_REUSEPORT (several sockets bound to the same address)
 
     def __post_init__(self) -> None:
         self.Config = (self.IP, self.Port)
@@ -162,11 +369,65 @@ class RemoteConfig(_CommConfig):
     Port: int = field(default=23000)
     BufferSize: int = field(default=512)
     Config: tuple = field(init=False)
+    ReceiveBufferSize: int = field(default=None)    # SO_RCVBUF (None: system default)
+    SendBufferSize: int = field(default=None)       # SO_SNDBUF (None: system default)
+    DropCounting: bool = field(default=True)        # SO_RXQ_OVFL (where supported)
+    ReusePort: bool = field(default=False)          # SO_REUSEPORT (several sockets bound to the same address)
 
     def __post_init__(self) -> None:
         self.Config = (self.IP, self.Port)
 
 
+# Kernel Drop Counting
+# ------------------------------
+# Socket option attaching the number of datagrams dropped by the kernel
+# (receive queue overflow) to received datagrams as ancillary data.
+# Not exported by the socket module, available on Linux only
+SO_RXQ_OVFL : int = getattr(socket, 'SO_RXQ_OVFL', 40 if sys.platform.startswith('linux') else None)
+_DROP_COUNT_STRUCT : struct.Struct = struct.Struct('=I')
+_DROP_COUNT_SPACE : int = socket.CMSG_SPACE(_DROP_COUNT_STRUCT.size) if hasattr(socket, 'CMSG_SPACE') else 0
+
+
+# Configure Socket
+# ------------------------------
+def configure_socket(sock : socket.socket, config : _CommConfig) -> bool:
+    """
+    Configure a socket with the Communication Configuration
+    Sets the socket buffer sizes (SO_RCVBUF, SO_SNDBUF), port sharing (SO_REUSEPORT) and enables
+    kernel drop counting (SO_RXQ_OVFL), the kernel may adjust the buffer sizes (e.g. Linux doubles them)
+    The socket needs to be configured before it is bound
+    :param sock: Socket
+    :param config: Communication Configuration (LocalConfig, RemoteConfig)
+    :return drop_counting: Kernel drop counting is enabled (bool)
+    """
+
+    # Socket buffer sizes
+    if config.ReceiveBufferSize is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, config.ReceiveBufferSize)
+    if config.SendBufferSize is not None:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, config.SendBufferSize)
+
+    # Port sharing
+    # (datagrams are spread across the sockets bound to the same address by the kernel)
+    if config.ReusePort:
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise OSError('configure_socket: ERROR - Port sharing (SO_REUSEPORT) is not supported on this platform')
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+    # Kernel drop counting is not requested or not supported
+    if (not config.DropCounting) or (SO_RXQ_OVFL is None) or (not _DROP_COUNT_SPACE):
+        return False
+
+    # Enable kernel drop counting
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+    except OSError:
+        return False
+
+    # Function return
+    return True
+
+
 # Check if object is iterable
 # ------------------------------
 def is_iterable(object) -> bool:
@@ -336,7 +597,7 @@ def pack_to_bytes(indata) -> tuple[bytes, str, object]:
                 data.append(item)
 
         # Pack data to bytes
-        packed_data = struct.pack(COMM_CONST.Network + conversion_code, *data)
+        packed_data = compile_conversion_code(conversion_code)[0].pack(*data)
 
     # In-data is Primitive Type
     # ------------------------------ 
@@ -355,85 +616,100 @@ def pack_to_bytes(indata) -> tuple[bytes, str, object]:
             data = indata
 
         # Pack data to bytes
-        packed_data = struct.pack(COMM_CONST.Network + conversion_code, data)
+        packed_data = compile_conversion_code(conversion_code)[0].pack(data)
 
     # Function return 
     return packed_data, conversion_code, data
 
 
-# Unpack Data from Bytes
+# Conversion-Code Cache Size
 # ------------------------------
-def unpack_from_bytes(packed_data : bytes, conversion_code : str):
+# Maximum number of compiled Conversion-Codes kept in cache
+CONVERSION_CACHE_SIZE : int = 256
+
+
+# Compile Conversion-Code
+# ------------------------------
+@lru_cache(maxsize = CONVERSION_CACHE_SIZE)
+def compile_conversion_code(conversion_code : str) -> tuple[struct.Struct, tuple]:
     """
-    Unpack data from bytes
-    The packed data is converted back to its original type(s)
-    using the given conversion-code
-    Unpacked-data can be used for data-received over TCP/UDP
-    :param packed_data: Packed data (bytes)
+    Compile Conversion-Code
+    The conversion-code is parsed once to a precompiled struct and 
+    the indices of the strings in the unpacked data.
+    Compiled conversion-codes are kept in a bounded LRU-cache (keyed by conversion-code),
+    repeated calls with the same conversion-code are a dictionary lookup
     :param conversion_code: Conversion-Code of packed data (str)
-    :return data: Unpacked Data
+    :return struct: Precompiled struct of the conversion-code (struct.Struct)
+    :return string_indices: Indices of the strings in the unpacked data (tuple)
     """
+
     # Define local variables
-    _unpacked_data = b''
-    _value = ''
+    _string_indices = []
+    _count = ''
     _index = 0
 
-    # Unpack data from bytes to a local variable
-    _unpacked_data = struct.unpack(COMM_CONST.Network + conversion_code, packed_data)
+    # Iterate through Conversion-Code
+    for code in conversion_code:
 
-    # Packed Data contains multiple entries
-    # ------------------------------ 
-    # (multiple variables to unpack)
-    if len(conversion_code) > 1:
+        # Special case: Digit
+        # (digits are accumulated to a count, which can span multiple characters)
+        if code.isdigit():
+            _count += code
+            continue
 
-        # Define Unpacked-Data as list
-        _unpacked_data_list = []
+        # Special case: String
+        # (the count is the length of the string, and has a single related value)
+        elif code == COMM_CONST.STRING:
+            _string_indices.append(_index)
+            _index += 1
 
-        # Iterate through Conversion-Code
-        for code in conversion_code:
-    
-            # Special case: Digit
-            if code.isdigit():
-                # Digits are only related to the length of a future string
-                # and has no related value in the Packed-Data
+        # Format character is repeated by the count
+        # (default: single value)
+        else:
+            _index += int(_count) if _count else 1
 
-                # Skip this iteration
-                continue
+        # Reset the count
+        _count = ''
 
-            # Special case: String
-            elif code == COMM_CONST.STRING:
-                # String needs to be decoded from byte-value
-                _value = _unpacked_data[_index].decode('UTF-8')
+    # Function return
+    return struct.Struct(COMM_CONST.Network + conversion_code), tuple(_string_indices)
 
-            # Assign the local value-variable equal to the indexed element of unpacked-data
-            else:
-                _value = _unpacked_data[_index]
 
-            # Update the index number
-            _index += 1
+# Unpack Data from Bytes
+# ------------------------------
+def unpack_from_bytes(packed_data : bytes, conversion_code : str):
+    """
+    Unpack data from bytes
+    The packed data is converted back to its original type(s)
+    using the given conversion-code (compiled using "compile_conversion_code")
+    Unpacked-data can be used for data-received over TCP/UDP
+    :param packed_data: Packed data (bytes)
+    :param conversion_code: Conversion-Code of packed data (str)
+    :return data: Unpacked Data
+    """
 
-            # Append index value to Unpacked-Data list
-            _unpacked_data_list.append(_value)
-        
-        # Unpacked Data contains multiple entries
-        # ------------------------------ 
-        if len(_unpacked_data_list) > 1:
+    # Get the compiled conversion-code
+    _struct, _string_indices = compile_conversion_code(conversion_code)
 
-            # Unpacked-Data-List contains more than one entry
-            # Convert Unpacked-Data-List to a tuple
-            unpacked_data = tuple(_unpacked_data_list)
+    # Unpack data from bytes to a local variable
+    _unpacked_data = _struct.unpack(packed_data)
 
-        # Unpacked Data List contains single entry
-        # ------------------------------ 
-        else:
-            # Assign the Unpacked-Data equal to the only entry of the list
-            unpacked_data = _unpacked_data_list[-1]
-    
-    # Packed Data contains single entry
+    # Strings needs to be decoded from byte-values
+    if _string_indices:
+        _unpacked_data = list(_unpacked_data)
+        for index in _string_indices:
+            _unpacked_data[index] = _unpacked_data[index].decode('UTF-8')
+
+    # Unpacked Data contains multiple entries
+    # ------------------------------ 
+    if len(_unpacked_data) > 1:
+        # Convert Unpacked-Data to a tuple
+        unpacked_data = tuple(_unpacked_data)
+
+    # Unpacked Data contains single entry
     # ------------------------------ 
-    # (Only one variable to unpack)
     else:
-        # Assign the Unpacked-data equals to the previously found local variable
+        # Assign the Unpacked-Data equal to the only entry
         unpacked_data = _unpacked_data[-1]
 
     # Function return
@@ -528,11 +804,33 @@ def remap(indata, type_map : TypeMap):
     :return data : Re-mapped data
     """
 
+    # Remap data from the start of the flat-structured indata
+    _remapped_data, _index = remap_at(indata, type_map, 0)
+
+    # Function return
+    return _remapped_data
+
+
+# Remap at Offset
+# ------------------------------
+def remap_at(indata, type_map : TypeMap, index : int = 0) -> tuple[object, int]:
+    """
+    Re-map In-data at Offset to its original type-strucute
+    Generate data from flat-structured indata (read from the given offset) back to 
+    its original format using the type-structure from the related Type-Map.
+    Nested Type-Maps are remapped at their own offset of the same flat-structured
+    indata (no sub-lists of the indata are created)
+    :param indata : Input data (flat data-structure) 
+    :param type_map : TypeMap-class of input-data type-structure
+    :param index : Offset of the data in the flat-structured indata (int)
+    :return data : Re-mapped data
+    :return index : Offset after the data in the flat-structured indata (int)
+    """
+
     # Define and assign values to local variables based on Type-Map
     _data_list = []
     _remapped_data = type_map.type 
-    _size = type_map.size
-    _index = 0  # Loop-index
+    _index = index  # Loop-index
     
     # Iterate through Map-Items
     # (Map-Items is defined as a list)
@@ -540,33 +838,15 @@ def remap(indata, type_map : TypeMap):
 
         _item_type = item[0]    # First entry equals the Type
         _item_len = item[1]     # Second entry equals the length of the Type
-        _item_list = []         # Define a Item-list
 
-         # Item is a Type-Map
+        # Item is a Type-Map
         # ------------------------------
         # (Nested dataclasses)
         if type(_item_type) is TypeMap:
 
-            # Assign Sub-Values from Item Type-Map
-            _sub_typemap = _item_type
-            _sub_data = _sub_typemap.data
-            _sub_type = _sub_typemap.type
-            _sub_items = _sub_typemap.items
-            _sub_items_size = _sub_typemap.size
-            _sub_indata = []
-            
-            # Calculate Sub-Indata
-            # ------------------------------
-            # Original Indata is related to the base TypeMap
-            # a Sub-Indata needs to be calculated to match the Sub-TypeMap
-            for i in range(_index, _index + _sub_items_size):
-                _sub_indata.append(indata[i])
-
-            # Call remap for Sub-Data
-            _sub_data = remap(_sub_indata, _sub_typemap)
-
-            # Update loop-index
-            _index += _sub_items_size
+            # Call remap for Sub-Data at current loop-index
+            # (loop-index is updated to the offset after the Sub-Data)
+            _sub_data, _index = remap_at(indata, _item_type, _index)
 
             # Append Sub-Data to data-list
             _data_list.append(_sub_data)
@@ -575,16 +855,11 @@ def remap(indata, type_map : TypeMap):
         # ------------------------------ 
         # (list, tuple, etc.)
         elif (_item_type is tuple) or (_item_type is list):
-            # Iterate through the length of the Item
-            for i in range(_item_len):
-                # Append in-data at index to item-list
-                _item_list.append(indata[_index])
+            # Append in-data of the length of the Item to data-list
+            _data_list.append(list(indata[_index:_index + _item_len]))
 
-                # Update loop-index
-                _index += 1
-            
-            # Append item-list to data-list
-            _data_list.append(_item_list)
+            # Update loop-index
+            _index += _item_len
 
         # Item is a Primitive-Type 
         # ------------------------------ 
@@ -628,7 +903,7 @@ def remap(indata, type_map : TypeMap):
         raise TypeError('remap: ERROR - Type-Map type is unsupported')
 
     # Function return
-    return _remapped_data
+    return _remapped_data, _index
 
 
 # Remap from Bytes
@@ -652,4 +927,172 @@ def remap_from_bytes(packed_data : bytes, type_map : TypeMap, conversion_code :
     remapped_data = remap(unpacked_data, type_map)
 
     # Function return
-    return remapped_data
\ No newline at end of file
+    return remapped_data
+
+
+# Receive Buffer Pool
+# ------------------------------
+class BufferPool():
+    """
+    Receive Buffer Pool
+    Preallocated receive buffer, divided into a number of equal sized slots
+    Datagrams are received directly into the slots (see "recv_batch"), and handed
+    out as memoryviews of the slots (no bytes-object is allocated per datagram).
+    The slots are reused by the next receive, received data needs to be
+    decoded (or copied) before receiving again
+    """
+
+    def __init__(self, count : int = 64, size : int = 512) -> None:
+        self.count = count
+        self.size = size
+
+        # Cumulative number of datagrams dropped by the kernel
+        # (updated by "recv_batch" with drop counting, see "configure_socket")
+        self.kernel_drops = 0
+        self.buffer = bytearray(count * size)
+        _view = memoryview(self.buffer)
+        self.slots = tuple(_view[i * size:(i + 1) * size] for i in range(count))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+# Flag for receiving without waiting
+# (not available on every platform, sockets are then switched to non-blocking)
+_MSG_DONTWAIT : int = getattr(socket, 'MSG_DONTWAIT', 0)
+
+
+# Receive Batch of Datagrams
+# ------------------------------
+def recv_batch(sock : socket.socket, pool : BufferPool, max_count : int = None, drop_counting : bool = False) -> list:
+    """
+    Receive a batch of Datagrams into the slots of a Buffer Pool
+    The first datagram is received in the mode of the socket (waiting on a blocking
+    or timeout socket), then every datagram ready on the socket is drained without
+    waiting, up to the number of slots (one wakeup for many datagrams)
+    :param sock: UDP socket
+    :param pool: Receive Buffer Pool
+    :param max_count: Maximum number of datagrams (default: number of slots)
+    :param drop_counting: Read kernel drop count into "pool.kernel_drops" (see "configure_socket")
+    :return batch: Received datagrams as (memoryview, remote address) (list)
+    """
+
+    _slots = pool.slots if max_count is None else pool.slots[:max_count]
+    _receive_into = _receive_counting_drops if drop_counting else _receive
+    batch = []
+
+    # Receive first datagram
+    # (non-blocking socket with no datagram ready returns an empty batch)
+    try:
+        _size, _address = _receive_into(sock, pool, _slots[0], 0)
+    except BlockingIOError:
+        return batch
+    batch.append((_slots[0][:_size], _address))
+
+    # No more slots to receive into
+    if len(_slots) == 1:
+        return batch
+
+    # Switch socket to non-blocking while draining
+    # (timeout sockets wait in "recvfrom_into" before receiving, even with MSG_DONTWAIT)
+    _timeout = sock.gettimeout()
+    _switch = (_timeout is None and not _MSG_DONTWAIT) or bool(_timeout)
+    if _switch:
+        sock.setblocking(False)
+
+    # Drain ready datagrams
+    try:
+        for slot in _slots[1:]:
+            try:
+                _size, _address = _receive_into(sock, pool, slot, _MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                break
+            batch.append((slot[:_size], _address))
+
+    # Restore mode of the socket
+    finally:
+        if _switch:
+            sock.settimeout(_timeout)
+
+    # Function return
+    return batch
+
+
+# Receive Datagram
+# ------------------------------
+def _receive(sock : socket.socket, pool : BufferPool, slot : memoryview, flags : int) -> tuple:
+    return sock.recvfrom_into(slot, 0, flags)
+
+
+# Receive Datagram (Kernel Drop Counting)
+# ------------------------------
+def _receive_counting_drops(sock : socket.socket, pool : BufferPool, slot : memoryview, flags : int) -> tuple:
+
+    # Receive datagram with ancillary data
+    _size, _ancdata, _flags, _address = sock.recvmsg_into((slot,), _DROP_COUNT_SPACE, flags)
+
+    # Cumulative drop count of the socket
+    # (only attached once the kernel has dropped datagrams)
+    for level, type, data in _ancdata:
+        if (level == socket.SOL_SOCKET) and (type == SO_RXQ_OVFL):
+            pool.kernel_drops = _DROP_COUNT_STRUCT.unpack_from(data)[0]
+
+    # Function return
+    return _size, _address
+
+
+# Logging Configuration
+# ------------------------------
+LOG_FORMAT      : str = '%(levelname)s - %(asctime)s: %(message)s'
+LOG_DATE_FORMAT : str = '%H:%M:%S'
+
+def configure_logging(level : int = logging.DEBUG) -> None:
+    """
+    Configure logging to the terminal (level, time and message)
+    :param level: Logging level (default: DEBUG)
+    """
+    logging.basicConfig(format=LOG_FORMAT, datefmt=LOG_DATE_FORMAT, level=level)
+
+
+# Rate-Limit Filter
+# ------------------------------
+class RateLimitFilter(logging.Filter):
+    """
+    Rate-Limit Filter
+    Logging filter emitting at most "rate" records per "interval" seconds of the same message
+    (records of the same format string, e.g. one record per received packet).
+    The number of suppressed records is added to the next emitted record of the message.
+    Records are filtered before being formatted, suppressed records are never formatted.
+    The filter can be shared by loggers used from several threads
+    """
+
+    def __init__(self, rate : int = 10, interval : float = 1.0) -> None:
+        super().__init__()
+        self.rate = rate
+        self.interval = interval
+
+        # Window start, number of emitted and suppressed records (per message)
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record : logging.LogRecord) -> bool:
+        _message = record.msg
+        with self._lock:
+            _window = self._windows.get(_message)
+
+            # New window
+            # (number of suppressed records of the previous window is added to the record)
+            if (_window is None) or (record.created - _window[0] >= self.interval):
+                self._windows[_message] = [record.created, 1, 0]
+                if (_window is not None) and _window[2]:
+                    record.msg = str(_message) + ' [%d similar messages suppressed]' % _window[2]
+                return True
+
+            # Record is within the rate of the window
+            if _window[1] < self.rate:
+                _window[1] += 1
+                return True
+
+            # Record is suppressed
+            _window[2] += 1
+            return False
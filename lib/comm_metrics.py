@@ -0,0 +1,372 @@
+# Communication Metrics
+# ------------------------------
+# Description:
+# Counters and latency histograms for communication endpoints
+# Packets and bytes are counted per message type (Schema ID), together with
+# encode and decode failures, timeouts and drops. Encode, decode and round-trip times are
+# recorded in histograms with fixed buckets (no allocation per recorded value).
+# Counting is locked, the threads of an endpoint can share its metrics.
+# A snapshot of the metrics can be taken at any time, or dumped periodically
+# to the log of a running endpoint
+
+# Version
+# ------------------------------
+# 0.3   -   Updated with thread-safe counting
+#           (counters and histograms are locked, an endpoint
+#           can count from several threads)
+#           [17.10.2026]
+# 0.2   -   Updated with encode error counter
+#           [17.10.2026]
+# 0.1   -   Updated with retransmission counter
+#           [17.10.2026]
+# 0.0   -   Initial version
+#           [16.10.2026]
+
+# Import packages
+from bisect import bisect_left
+import logging
+import threading
+import time
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Latency Buckets
+# ------------------------------
+# Upper bounds of the histogram buckets in seconds (1-2-5 series, 1 us to 5 s)
+# Values above the last bound are counted in an overflow bucket
+LATENCY_BUCKETS : tuple = tuple(float('%de%d' % (base, exponent)) for exponent in range(-6, 1)
+                                                                 for base in (1, 2, 5))
+
+# Histogram
+# ------------------------------
+class Histogram():
+    """
+    Histogram
+    Values are counted in buckets with fixed upper bounds (and an overflow bucket),
+    percentiles are estimated as the upper bound of the bucket they fall in
+    (the maximum recorded value for the overflow bucket)
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'maximum', '_lock')
+
+    def __init__(self, bounds : tuple = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self.reset()
+
+    # Pickle
+    # ------------------------------
+    # (the lock is not pickled, e.g. metrics reported by a worker process)
+    def __getstate__(self) -> tuple:
+        return (self.bounds, *self._state())
+
+    def __setstate__(self, state : tuple) -> None:
+        self.bounds, self.counts, self.count, self.total, self.maximum = state
+        self._lock = threading.Lock()
+
+    # Reset
+    # ------------------------------
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.maximum = 0.0
+
+    # Record
+    # ------------------------------
+    def record(self, value : float) -> None:
+        """
+        Record a value
+        :param value: Value (float, e.g. time in seconds)
+        """
+        _bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[_bucket] += 1
+            self.count += 1
+            self.total += value
+            if value > self.maximum:
+                self.maximum = value
+
+    # State
+    # ------------------------------
+    def _state(self) -> tuple:
+        """
+        Copy of the recorded values
+        :return state: Counts of the buckets, count, total and maximum (tuple)
+        """
+        with self._lock:
+            return list(self.counts), self.count, self.total, self.maximum
+
+    # Merge
+    # ------------------------------
+    def merge(self, other : 'Histogram') -> None:
+        """
+        Add the recorded values of another histogram (with the same bounds)
+        :param other: Histogram
+        """
+        if other.bounds != self.bounds:
+            raise ValueError('Histogram: ERROR - Bounds of the merged histogram are different')
+
+        # Copy of the other histogram
+        # (only one lock is held at a time)
+        _counts, _count, _total, _maximum = other._state()
+        with self._lock:
+            for i, count in enumerate(_counts):
+                self.counts[i] += count
+            self.count += _count
+            self.total += _total
+            self.maximum = max(self.maximum, _maximum)
+
+    # Percentile
+    # ------------------------------
+    def percentile(self, percent : float) -> float:
+        """
+        Estimate a percentile of the recorded values
+        :param percent: Percentile (0 - 100)
+        :return value: Upper bound of the bucket of the percentile (0.0: no recorded values)
+        """
+        _counts, _count, _total, _maximum = self._state()
+        return self._percentile(percent, _counts, _count, _maximum)
+
+    def _percentile(self, percent : float, counts : list, count : int, maximum : float) -> float:
+        if not count:
+            return 0.0
+
+        # Bucket of the percentile
+        _rank = percent / 100.0 * count
+        _cumulative = 0
+        for i, _bucket_count in enumerate(counts):
+            _cumulative += _bucket_count
+            if _cumulative >= _rank and _bucket_count:
+                return min(self.bounds[i], maximum) if i < len(self.bounds) else maximum
+
+        # Function return
+        return maximum
+
+    # Snapshot
+    # ------------------------------
+    def snapshot(self) -> dict:
+        """
+        Snapshot of the histogram
+        :return snapshot: Count, mean, maximum and percentiles (p50, p99, p99.9),
+                          and counts of the buckets (dict)
+        """
+        _counts, _count, _total, _maximum = self._state()
+        return {'count' : _count,
+                'mean' : (_total / _count) if _count else 0.0,
+                'max' : _maximum,
+                'p50' : self._percentile(50.0, _counts, _count, _maximum),
+                'p99' : self._percentile(99.0, _counts, _count, _maximum),
+                'p99.9' : self._percentile(99.9, _counts, _count, _maximum),
+                'buckets' : _counts}
+
+
+# Communication Metrics
+# ------------------------------
+class CommMetrics():
+    """
+    Communication Metrics
+    Metrics of a communication endpoint (server or client):
+     - Packets and bytes in and out : Counted per message type (Schema ID)
+     - Encode errors : Messages that could not be packed (not sent)
+     - Decode errors : Received messages that could not be decoded (invalid header or unknown Schema ID)
+     - Timeouts : Replies not received within the timeout
+     - Retransmits : Requests sent again after their deadline
+     - Drops : Messages dropped (e.g. by the kernel or a full queue)
+     - Encode, decode and round-trip time : Histograms (seconds)
+    Counting is done by the endpoint (locked, from any thread), metrics are read with "snapshot"
+    """
+
+    # Counters of events (see "count")
+    COUNTERS : tuple = ('encode_errors', 'decode_errors', 'timeouts', 'retransmits', 'drops')
+
+    def __init__(self, name : str = '') -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self.encode_time = Histogram()
+        self.decode_time = Histogram()
+        self.round_trip_time = Histogram()
+        self.reset()
+
+    # Reset
+    # ------------------------------
+    def reset(self) -> None:
+        """
+        Reset every counter and histogram
+        """
+        with self._lock:
+            self.packets_in = {}
+            self.bytes_in = {}
+            self.packets_out = {}
+            self.bytes_out = {}
+            for _counter in self.COUNTERS:
+                setattr(self, _counter, 0)
+            self.started = time.monotonic()
+        self.encode_time.reset()
+        self.decode_time.reset()
+        self.round_trip_time.reset()
+
+    # Pickle
+    # ------------------------------
+    # (the lock is not pickled, e.g. metrics reported by a worker process)
+    def __getstate__(self) -> dict:
+        with self._lock:
+            _state = dict(self.__dict__)
+            for _counters in ('packets_in', 'bytes_in', 'packets_out', 'bytes_out'):
+                _state[_counters] = dict(_state[_counters])
+        del _state['_lock']
+        return _state
+
+    def __setstate__(self, state : dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    # Count Received Message
+    # ------------------------------
+    def count_in(self, message_type : int, size : int) -> None:
+        """
+        Count a received message
+        :param message_type: Message type (Schema ID)
+        :param size: Size of the message in bytes (header and data-content)
+        """
+        with self._lock:
+            self.packets_in[message_type] = self.packets_in.get(message_type, 0) + 1
+            self.bytes_in[message_type] = self.bytes_in.get(message_type, 0) + size
+
+    # Count Sent Message
+    # ------------------------------
+    def count_out(self, message_type : int, size : int) -> None:
+        """
+        Count a sent message
+        :param message_type: Message type (Schema ID)
+        :param size: Size of the message in bytes (header and data-content)
+        """
+        with self._lock:
+            self.packets_out[message_type] = self.packets_out.get(message_type, 0) + 1
+            self.bytes_out[message_type] = self.bytes_out.get(message_type, 0) + size
+
+    # Count Event
+    # ------------------------------
+    def count(self, counter : str, value : int = 1) -> None:
+        """
+        Count an event (e.g. a decode error, timeout or drop)
+        :param counter: Name of the counter (see "COUNTERS")
+        :param value: Number of events (int)
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + value)
+
+    # Merge
+    # ------------------------------
+    def merge(self, other : 'CommMetrics') -> None:
+        """
+        Add the counters and histograms of other metrics (e.g. of several endpoints)
+        :param other: Communication Metrics
+        """
+
+        # Copy of the other metrics
+        # (only one lock is held at a time)
+        _other = other.__getstate__()
+        with self._lock:
+            for _counters in ('packets_in', 'bytes_in', 'packets_out', 'bytes_out'):
+                _merged = getattr(self, _counters)
+                for message_type, count in _other[_counters].items():
+                    _merged[message_type] = _merged.get(message_type, 0) + count
+            for _counter in self.COUNTERS:
+                setattr(self, _counter, getattr(self, _counter) + _other[_counter])
+        self.encode_time.merge(other.encode_time)
+        self.decode_time.merge(other.decode_time)
+        self.round_trip_time.merge(other.round_trip_time)
+
+    # Snapshot
+    # ------------------------------
+    def snapshot(self) -> dict:
+        """
+        Snapshot of the metrics
+        (copied, the snapshot is not changed by later counting)
+        :return snapshot: Counters per message type, totals, error counters and histograms (dict)
+        """
+        with self._lock:
+            _packets_in = dict(self.packets_in)
+            _bytes_in = dict(self.bytes_in)
+            _packets_out = dict(self.packets_out)
+            _bytes_out = dict(self.bytes_out)
+            _counters = {_counter : getattr(self, _counter) for _counter in self.COUNTERS}
+            _started = self.started
+        return {'name' : self.name,
+                'elapsed' : time.monotonic() - _started,
+                'packets_in' : sum(_packets_in.values()),
+                'bytes_in' : sum(_bytes_in.values()),
+                'packets_out' : sum(_packets_out.values()),
+                'bytes_out' : sum(_bytes_out.values()),
+                'types' : {message_type : {'packets_in' : _packets_in.get(message_type, 0),
+                                           'bytes_in' : _bytes_in.get(message_type, 0),
+                                           'packets_out' : _packets_out.get(message_type, 0),
+                                           'bytes_out' : _bytes_out.get(message_type, 0)}
+                           for message_type in {**_packets_in, **_packets_out}},
+                **_counters,
+                'encode_time' : self.encode_time.snapshot(),
+                'decode_time' : self.decode_time.snapshot(),
+                'round_trip_time' : self.round_trip_time.snapshot()}
+
+    # Dump
+    # ------------------------------
+    def dump(self, log : logging.Logger = None) -> dict:
+        """
+        Log a summary of the metrics (throughput and tail latency)
+        :param log: Logger (default: logger of this module)
+        :return snapshot: Snapshot of the metrics (dict)
+        """
+        _snapshot = self.snapshot()
+        _elapsed = max(_snapshot['elapsed'], 1e-9)
+        _rtt = _snapshot['round_trip_time']
+        _decode = _snapshot['decode_time']
+        (log or logger).info('Metrics %s: in %d pkt (%.0f pkt/s, %d B), out %d pkt (%.0f pkt/s, %d B), '
+                             'encode errors %d, decode errors %d, timeouts %d, retransmits %d, drops %d, '
+                             'decode p50/p99 %.1f/%.1f us, rtt p50/p99/p99.9 %.1f/%.1f/%.1f us',
+                             self.name,
+                             _snapshot['packets_in'], _snapshot['packets_in'] / _elapsed, _snapshot['bytes_in'],
+                             _snapshot['packets_out'], _snapshot['packets_out'] / _elapsed, _snapshot['bytes_out'],
+                             _snapshot['encode_errors'], _snapshot['decode_errors'], _snapshot['timeouts'], _snapshot['retransmits'], _snapshot['drops'],
+                             _decode['p50'] * 1e6, _decode['p99'] * 1e6,
+                             _rtt['p50'] * 1e6, _rtt['p99'] * 1e6, _rtt['p99.9'] * 1e6)
+        return _snapshot
+
+    # Dump Periodically
+    # ------------------------------
+    def dump_every(self, interval : float, log : logging.Logger = None) -> 'MetricsDump':
+        """
+        Dump the metrics periodically from a background thread
+        (the endpoint is not interrupted, the thread is stopped with "stop")
+        :param interval: Interval in seconds (float)
+        :param log: Logger (default: logger of this module)
+        :return dump: Periodic Metrics Dump (started)
+        """
+        _dump = MetricsDump(self, interval, log)
+        _dump.start()
+        return _dump
+
+
+# Periodic Metrics Dump
+# ------------------------------
+class MetricsDump(threading.Thread):
+    """
+    Periodic Metrics Dump
+    Daemon thread dumping the metrics with a fixed interval, until stopped
+    """
+
+    def __init__(self, metrics : CommMetrics, interval : float, log : logging.Logger = None) -> None:
+        super().__init__(name = 'MetricsDump', daemon = True)
+        self.metrics = metrics
+        self.interval = interval
+        self.log = log
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.metrics.dump(self.log)
+
+    def stop(self) -> None:
+        self._stopped.set()
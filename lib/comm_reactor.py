@@ -0,0 +1,227 @@
+# Communication Reactor
+# ------------------------------
+# Description:
+# Single-threaded event loop for communication sockets
+# Sockets are monitored with "selectors" (epoll on Linux, kqueue on BSD/macOS,
+# select on Windows), ready sockets are dispatched to per-socket read- and
+# write-callbacks, and timers are run in between (no polling)
+
+# Version
+# ------------------------------
+# 0.0   -   Initial version
+#           [16.10.2026]
+
+# Import packages
+import heapq
+import itertools
+import selectors
+import time
+
+# Reactor Timer
+# ------------------------------
+class Timer():
+    """
+    Reactor Timer
+    Callback scheduled at a (monotonic) deadline, optionally repeated with an interval
+    A timer is cancelled with "cancel" (it is skipped when its deadline is reached)
+    """
+
+    __slots__ = ('deadline', 'interval', 'callback', 'args', 'cancelled')
+
+    def __init__(self, deadline : float, interval : float, callback, args : tuple) -> None:
+        self.deadline = deadline
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+# Communication Reactor
+# ------------------------------
+class CommReactor():
+    """
+    Communication Reactor
+    Runs several sockets (UDP and TCP, listening and connected) in one thread:
+     - Read-callback : Called with the socket when data can be read (or a connection accepted)
+     - Write-callback : Called with the socket when data can be written (set while data is pending)
+     - Timers : Callbacks called once ("call_later") or repeatedly ("call_every")
+    The reactor blocks in the selector until a socket is ready or the next timer is due
+    """
+
+    def __init__(self) -> None:
+        self.selector = selectors.DefaultSelector()
+        self._timers = []
+        self._counter = itertools.count()
+        self._running = False
+
+    # Register Socket
+    # ------------------------------
+    def register(self, sock, on_read = None, on_write = None) -> None:
+        """
+        Register a socket with its read- and write-callbacks
+        :param sock: Non-blocking socket
+        :param on_read: Read-callback, called as on_read(sock) (None: not monitored for reading)
+        :param on_write: Write-callback, called as on_write(sock) (None: not monitored for writing)
+        """
+        sock.setblocking(False)
+        self.selector.register(sock, self._get_events(on_read, on_write), (on_read, on_write))
+
+    # Modify Socket
+    # ------------------------------
+    def modify(self, sock, on_read = None, on_write = None) -> None:
+        """
+        Replace the read- and write-callbacks of a registered socket
+        (a socket without callbacks is unregistered)
+        :param sock: Registered socket
+        :param on_read: Read-callback (None: not monitored for reading)
+        :param on_write: Write-callback (None: not monitored for writing)
+        """
+        _events = self._get_events(on_read, on_write)
+        if not _events:
+            self.selector.unregister(sock)
+            return
+
+        self.selector.modify(sock, _events, (on_read, on_write))
+
+    # Set Write-Callback
+    # ------------------------------
+    def set_writer(self, sock, on_write) -> None:
+        """
+        Set (or clear) the write-callback of a registered socket
+        (typically set while data is pending, and cleared when the data has been sent)
+        :param sock: Registered socket
+        :param on_write: Write-callback (None: not monitored for writing)
+        """
+        _on_read, _on_write = self.selector.get_key(sock).data
+        if _on_write is not on_write:
+            self.modify(sock, _on_read, on_write)
+
+    # Unregister Socket
+    # ------------------------------
+    def unregister(self, sock) -> None:
+        """
+        Unregister a socket (the socket is not closed)
+        :param sock: Registered socket
+        """
+        self.selector.unregister(sock)
+
+    # Get Events
+    # ------------------------------
+    @staticmethod
+    def _get_events(on_read, on_write) -> int:
+        _events = 0
+        if on_read is not None:
+            _events |= selectors.EVENT_READ
+        if on_write is not None:
+            _events |= selectors.EVENT_WRITE
+        return _events
+
+    # Call Later
+    # ------------------------------
+    def call_later(self, delay : float, callback, *args) -> Timer:
+        """
+        Call a callback once after a delay
+        :param delay: Delay in seconds (float)
+        :param callback: Callback, called as callback(*args)
+        :return timer: Reactor Timer (can be cancelled)
+        """
+        return self._add_timer(Timer(time.monotonic() + delay, None, callback, args))
+
+    # Call Every
+    # ------------------------------
+    def call_every(self, interval : float, callback, *args) -> Timer:
+        """
+        Call a callback repeatedly with a fixed interval
+        :param interval: Interval in seconds (float)
+        :param callback: Callback, called as callback(*args)
+        :return timer: Reactor Timer (can be cancelled)
+        """
+        return self._add_timer(Timer(time.monotonic() + interval, interval, callback, args))
+
+    def _add_timer(self, timer : Timer) -> Timer:
+        heapq.heappush(self._timers, (timer.deadline, next(self._counter), timer))
+        return timer
+
+    # Run Timers
+    # ------------------------------
+    def _run_timers(self) -> None:
+        _now = time.monotonic()
+        while self._timers and (self._timers[0][0] <= _now):
+            _, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled:
+                continue
+            timer.callback(*timer.args)
+
+            # Repeated timer is scheduled from its previous deadline (no drift)
+            # (missed intervals are skipped, not run back-to-back)
+            if (timer.interval is not None) and (not timer.cancelled):
+                timer.deadline += timer.interval
+                if timer.deadline <= _now:
+                    timer.deadline = _now + timer.interval
+                self._add_timer(timer)
+
+    # Run Once
+    # ------------------------------
+    def run_once(self, timeout : float = None) -> int:
+        """
+        Wait for ready sockets (or the next timer) and dispatch the callbacks
+        :param timeout: Maximum time to wait in seconds (default: until the next timer)
+        :return count: Number of dispatched socket events (int)
+        """
+
+        # Wait until the next timer is due
+        if self._timers:
+            _delay = max(0.0, self._timers[0][0] - time.monotonic())
+            timeout = _delay if (timeout is None) else min(timeout, _delay)
+
+        # Dispatch ready sockets
+        # (callbacks are looked up when dispatched, a previous callback
+        # may have changed them or unregistered the socket)
+        _events = self.selector.select(timeout)
+        _map = self.selector.get_map()
+        for key, mask in _events:
+            if mask & selectors.EVENT_READ:
+                _key = _map.get(key.fd)
+                if (_key is not None) and (_key.data[0] is not None):
+                    _key.data[0](key.fileobj)
+            if mask & selectors.EVENT_WRITE:
+                _key = _map.get(key.fd)
+                if (_key is not None) and (_key.data[1] is not None):
+                    _key.data[1](key.fileobj)
+
+        # Run due timers
+        self._run_timers()
+
+        # Function return
+        return len(_events)
+
+    # Run
+    # ------------------------------
+    def run(self) -> None:
+        """
+        Run the reactor until stopped
+        """
+        self._running = True
+        while self._running:
+            self.run_once()
+
+    # Stop
+    # ------------------------------
+    def stop(self) -> None:
+        """
+        Stop the reactor (after the current iteration)
+        """
+        self._running = False
+
+    # Close
+    # ------------------------------
+    def close(self) -> None:
+        """
+        Close the reactor and every registered socket
+        """
+        for key in list(self.selector.get_map().values()):
+            key.fileobj.close()
+        self.selector.close()
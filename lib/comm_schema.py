@@ -0,0 +1,1878 @@
+# Communication Schema
+# ------------------------------
+# Description:
+# Compiled Communication Schema for Generic-Communication-Dataclasses
+# A schema is compiled once per dataclass (and data-shape) and cached
+# on the class, holding a precompiled struct, a flat field-accessor plan
+# and a decode plan used for packing and unpacking to and from bytes
+
+# Version
+# ------------------------------
+# 0.9   -   Updated with bounded schema-caches (least recently
+#           used layouts are evicted and unregistered)
+#           [17.10.2026]
+# 0.8   -   Updated with declared Byte Format-Codes (field widths)
+#           and schemas compiled from the class definition
+#           [16.10.2026]
+# 0.7   -   Updated with declared fixed-capacity and
+#           length-prefixed fields (value-independent layout)
+#           [16.10.2026]
+# 0.6   -   Updated with process-wide Schema Registry
+#           and exchange of schema definitions
+#           [16.10.2026]
+# 0.5   -   Updated with in-place assign of flat data
+#           to existing dataclass objects
+#           [16.10.2026]
+# 0.4   -   Updated with immutable (slotted) schemas
+#           with byte offsets and sizes
+#           [16.10.2026]
+# 0.3   -   Updated with NumPy structured dtype
+#           [16.10.2026]
+# 0.2   -   Updated with batch packing and unpacking
+#           of records with a repeated layout
+#           [16.10.2026]
+# 0.1   -   Updated with code-generated pack, unpack
+#           and remap functions (opt-in per class)
+#           [16.10.2026]
+# 0.0   -   Initial version
+#           [16.10.2026]
+
+# Import packages
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from itertools import accumulate, starmap
+from operator import attrgetter
+from dataclasses import make_dataclass
+from typing import Annotated, get_args, get_origin, get_type_hints
+import json
+import keyword
+import struct
+import zlib
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Leaf Kinds
+# ------------------------------
+# Kind of each leaf in the flat field-accessor plan
+LEAF_VALUE      : int = 0   # Primitive value (bool, int, float)
+LEAF_STRING     : int = 1   # String (encoded/decoded as UTF-8)
+LEAF_SEQUENCE   : int = 2   # List or tuple of primitive values
+LEAF_FIXED_STRING       : int = 3   # Declared fixed-capacity string (padded with NUL-bytes)
+LEAF_FIXED_SEQUENCE     : int = 4   # Declared fixed-capacity list (padded with zeros)
+LEAF_PREFIXED_STRING    : int = 5   # Declared length-prefixed string (length, bytes)
+LEAF_PREFIXED_SEQUENCE  : int = 6   # Declared length-prefixed list (length, values)
+
+# Leaf-kinds sized by the value of the field (part of the data-shape)
+VARIABLE_KINDS : tuple = (LEAF_STRING, LEAF_SEQUENCE)
+
+# Leaf-kind of every Field Declaration
+DECLARED_KINDS : dict[type, int] = {
+    CommToolbox.FixedString     : LEAF_FIXED_STRING,
+    CommToolbox.FixedArray      : LEAF_FIXED_SEQUENCE,
+    CommToolbox.PrefixedString  : LEAF_PREFIXED_STRING,
+    CommToolbox.PrefixedArray   : LEAF_PREFIXED_SEQUENCE,
+}
+
+# Name of the class attribute holding the schema cache
+_CACHE_ATTRIBUTE : str = '_comm_schema_cache'
+
+# Maximum number of schemas (and Type-Maps) kept in the cache of a class
+# (a layout depending on the values, e.g. the length of a list, gets a schema per length)
+MAX_CACHED_SCHEMAS : int = 256
+
+# Name of the class attribute enabling code-generated functions
+CODEGEN_ATTRIBUTE : str = 'comm_codegen'
+
+
+# Communication Schema
+# ------------------------------
+class CommSchema():
+    """
+    Communication Schema
+    Compiled layout of a Generic-Communication-Dataclass with a given data-shape
+    (string lengths and list lengths). This contains:
+     - Data type (type) : Dataclass type of the compiled schema
+     - Codes (tuple) : Format-Code of every value in the packed data
+     - Conversion-Code (str) : Byte Conversion-Code of the dataclass
+     - Struct (struct.Struct) : Precompiled struct of the Conversion-Code
+     - Offsets, Sizes (tuple) : Byte offset and byte size of every value in the packed data
+     - Paths (tuple) : Attribute paths of every leaf (flat field-accessor plan)
+     - Kinds (tuple) : Leaf-kind of every leaf (value, string, sequence or declared field)
+     - Shape (tuple) : Lengths of the variable sized leaves (strings and lists)
+     - Capacities (tuple) : Capacities of the declared leaves (see "CommToolbox.FixedString")
+     - Decode plan (tuple) : Nested plan used to rebuild the dataclass from flat data
+     - Schema ID (int) : Checksum identifying the schema in the message header
+    The pack, unpack and remap functions follow the flat field-accessor plan and
+    the decode plan, or are code-generated functions (see "generate_codec")
+    Schemas are immutable and hold no reference to dataclass objects, a single
+    schema is shared by every object of the same class and data-shape (hashable).
+    A dataclass with only declared strings and lists has a single schema (empty data-shape)
+    """
+
+    __slots__ = ('data_type', 'codes', 'conversion_code', 'struct', 'size', 'count', 'offsets', 'sizes',
+                 'paths', 'kinds', 'shape', 'capacities', 'decode_plan', 'variable_paths', 'string_indices', 'is_flat',
+                 'is_generated', 'source', 'pack', 'pack_into', 'unpack', 'unpack_from', 'remap',
+                 'assign', 'schema_id', '_getter', '_single', '_variable_getter', '_assign_plan', '_string_plan',
+                 '_prefix_plan',
+                 '_key')
+
+    def __init__(self, data_type : type, codes : tuple, paths : tuple, kinds : tuple, shape : tuple,
+                 capacities : tuple, decode_plan : tuple, codegen : bool = False) -> None:
+
+        # Schema is immutable
+        # (attributes are only assigned during initialization)
+        _set = object.__setattr__
+
+        # Schema attributes
+        _set(self, 'data_type', data_type)
+        _set(self, 'codes', codes)
+        _set(self, 'conversion_code', ''.join(codes))
+        _set(self, 'struct', struct.Struct(CommToolbox.COMM_CONST.Network + self.conversion_code))
+        _set(self, 'size', self.struct.size)
+        _set(self, 'paths', paths)
+        _set(self, 'kinds', kinds)
+        _set(self, 'shape', shape)
+        _set(self, 'capacities', capacities)
+        _set(self, 'decode_plan', decode_plan)
+
+        # Byte offset and byte size of every value in the packed data
+        _sizes = tuple(struct.calcsize(CommToolbox.COMM_CONST.Network + code) for code in codes)
+        _offsets = tuple(accumulate(_sizes, initial = 0))[:-1]
+        _set(self, 'sizes', _sizes)
+        _set(self, 'offsets', _offsets)
+
+        # Flat field-accessor plan
+        # (a single attrgetter returns every leaf of the dataclass in one call)
+        _set(self, '_getter', attrgetter(*paths))
+        _set(self, '_single', len(paths) == 1)
+
+        # Flat assign plan
+        # (parent-accessor, field-name, leaf-kind, flat index and length of every leaf)
+        _set(self, '_assign_plan', tuple((attrgetter(path.rpartition('.')[0]) if '.' in path else None,
+                                           path.rpartition('.')[2], kind, start, length)
+                                          for path, kind, length, start in _iterate_leaves(self)))
+
+        # Variable sized leaves (strings and sequences)
+        _set(self, 'variable_paths', tuple(path for path, kind in zip(paths, kinds) if kind in VARIABLE_KINDS))
+        _set(self, '_variable_getter', attrgetter(*self.variable_paths) if self.variable_paths else None)
+
+        # Flat indices and leaf-kinds of the unpacked strings (to be decoded from bytes)
+        # and number of values in the unpacked data
+        _string_plan, _count = _get_string_plan(self)
+        _set(self, '_string_plan', _string_plan)
+        _set(self, 'string_indices', tuple(index for index, kind in _string_plan))
+        _set(self, 'count', _count)
+
+        # Flat indices and capacities of the length-prefixes
+        # (checked when unpacked, a prefix beyond the capacity would read the following values)
+        _set(self, '_prefix_plan', tuple((start, length) for path, kind, length, start in _iterate_leaves(self)
+                                         if kind in (LEAF_PREFIXED_STRING, LEAF_PREFIXED_SEQUENCE)))
+
+        # Schema contains only primitive values
+        # (leaf values can be packed directly without any conversion)
+        _set(self, 'is_flat', all(kind == LEAF_VALUE for kind in kinds))
+
+        # Schema identity
+        # (used for hashing and comparison, schemas of different data-shapes are different)
+        _set(self, '_key', (data_type, self.conversion_code, paths, kinds, shape, capacities))
+
+        # Schema ID
+        # (32-bit checksum of the layout, sent in the message header)
+        _set(self, 'schema_id', get_schema_id(data_type.__name__, codes, paths, kinds, shape, capacities))
+
+        # Code-generated pack, unpack and remap functions
+        if codegen:
+            _functions = generate_codec(self)
+            _set(self, 'source', _functions.pop('source'))
+            _set(self, 'is_generated', True)
+
+        # Pack, unpack and remap functions
+        # (following the flat field-accessor plan and decode plan)
+        else:
+            _functions = {'pack' : self.pack_plan, 'pack_into' : self.pack_into_plan,
+                          'unpack' : self.unpack_plan, 'unpack_from' : self.unpack_from_plan,
+                          'remap' : self.remap_plan, 'assign' : self.assign_plan}
+            _set(self, 'source', None)
+            _set(self, 'is_generated', False)
+
+        # Assign the functions of the schema
+        for name, function in _functions.items():
+            _set(self, name, function)
+
+    def __setattr__(self, name : str, value) -> None:
+        raise AttributeError('CommSchema: ERROR - Schema is immutable, cannot assign {%s}' %name)
+
+    def __delattr__(self, name : str) -> None:
+        raise AttributeError('CommSchema: ERROR - Schema is immutable, cannot delete {%s}' %name)
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not CommSchema:
+            return NotImplemented
+        return self._key == other._key
+
+    def __repr__(self) -> str:
+        return 'CommSchema(%s, %r)' % (self.data_type.__name__, self.conversion_code)
+
+    # Get Shape
+    # ------------------------------
+    def get_shape(self, indata) -> tuple:
+        """
+        Get the data-shape (lengths of strings and lists) of a dataclass object
+        :param indata : Dataclass object
+        :return shape : Data-shape (tuple)
+        """
+
+        # Dataclass has no variable sized leaves
+        if self._variable_getter is None:
+            return ()
+
+        # Dataclass has a single variable sized leaf
+        if len(self.variable_paths) == 1:
+            return (len(self._variable_getter(indata)),)
+
+        # Function return
+        return tuple(map(len, self._variable_getter(indata)))
+
+    # Get Layout
+    # ------------------------------
+    def get_layout(self, indata) -> tuple:
+        """
+        Get the layout (data-shape and value types) of a dataclass object
+        The Format-Codes of values compiled from the dataclass object depend on the
+        type of the values (e.g. int or float), a schema compiled from a dataclass object
+        only matches other objects of the same layout
+        :param indata : Dataclass object
+        :return layout : Type of every value, length of every string and
+                         types of every sequence (tuple)
+        """
+
+        # Get every leaf of the dataclass
+        _leaves = self._getter(indata)
+        if self._single:
+            _leaves = (_leaves,)
+
+        # Function return
+        return tuple(type(leaf) if kind == LEAF_VALUE else
+                     len(leaf) if kind == LEAF_STRING else
+                     tuple(map(type, leaf)) if kind == LEAF_SEQUENCE else None
+                     for kind, leaf in zip(self.kinds, _leaves))
+
+    # Get Leaf Values
+    # ------------------------------
+    def get_values(self, indata) -> tuple:
+        """
+        Get the flat leaf values of a dataclass object
+        :param indata : Dataclass object
+        :return values : Flat leaf values (strings encoded, sequences flattened) (tuple)
+        """
+
+        # Get every leaf of the dataclass
+        _leaves = self._getter(indata)
+        if self._single:
+            _leaves = (_leaves,)
+
+        # Schema contains only primitive values
+        if self.is_flat:
+            return _leaves
+
+        # Convert strings and flatten sequences
+        _values = []
+        _capacities = iter(self.capacities)
+        for path, kind, leaf in zip(self.paths, self.kinds, _leaves):
+
+            # Primitive value
+            if kind == LEAF_VALUE:
+                _values.append(leaf)
+
+            # String needs to be encoded to byte-value
+            elif kind == LEAF_STRING:
+                _values.append(leaf.encode('UTF-8'))
+
+            # Sequence is flattened
+            elif kind == LEAF_SEQUENCE:
+                _values.extend(leaf)
+
+            # Declared field
+            # (value needs to fit the capacity of the field)
+            else:
+                _capacity = next(_capacities)
+                if kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+                    leaf = leaf.encode('UTF-8')
+                if len(leaf) > _capacity:
+                    raise ValueError('CommSchema: ERROR - Field {%s} exceeds capacity {%d}' %(path, _capacity))
+
+                # Fixed-capacity string can not end with NUL-bytes
+                # (they can not be told apart from the padding when unpacked)
+                if (kind == LEAF_FIXED_STRING) and leaf.endswith(b'\x00'):
+                    raise ValueError('CommSchema: ERROR - Field {%s} ends with a NUL-byte' %path)
+
+                # Length-prefix in front of the value
+                if kind in (LEAF_PREFIXED_STRING, LEAF_PREFIXED_SEQUENCE):
+                    _values.append(len(leaf))
+
+                # String is padded by the struct
+                if kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+                    _values.append(leaf)
+
+                # Sequence is flattened and padded with zeros
+                else:
+                    _values.extend(leaf)
+                    _values.extend((0,) * (_capacity - len(leaf)))
+
+        # Function return
+        return tuple(_values)
+
+    # Pack to Bytes
+    # ------------------------------
+    def pack_plan(self, indata) -> bytes:
+        """
+        Pack a dataclass object to bytes using the precompiled struct
+        :param indata : Dataclass object
+        :return packed_data : Packed data (bytes)
+        """
+        return self.struct.pack(*self.get_values(indata))
+
+    # Pack into Buffer
+    # ------------------------------
+    def pack_into_plan(self, indata, buffer, offset : int = 0) -> None:
+        """
+        Pack a dataclass object into a writable buffer using the precompiled struct
+        :param indata : Dataclass object
+        :param buffer : Writable buffer (bytearray, memoryview)
+        :param offset : Offset in the buffer (int)
+        """
+        self.struct.pack_into(buffer, offset, *self.get_values(indata))
+
+    # Unpack from Bytes
+    # ------------------------------
+    def unpack_plan(self, packed_data : bytes) -> tuple:
+        """
+        Unpack bytes to flat-structured data using the precompiled struct
+        :param packed_data : Packed data (bytes)
+        :return unpacked_data : Flat-structured data (strings decoded) (tuple)
+        """
+        return self.decode_strings(self.struct.unpack(packed_data))
+
+    # Unpack from Buffer
+    # ------------------------------
+    def unpack_from_plan(self, buffer, offset : int = 0) -> tuple:
+        """
+        Unpack a buffer to flat-structured data using the precompiled struct
+        :param buffer : Readable buffer (bytes, bytearray, memoryview)
+        :param offset : Offset in the buffer (int)
+        :return unpacked_data : Flat-structured data (strings decoded) (tuple)
+        """
+        return self.decode_strings(self.struct.unpack_from(buffer, offset))
+
+    # Pack Batch to Bytes
+    # ------------------------------
+    def pack_batch(self, items) -> bytes:
+        """
+        Pack a sequence of dataclass objects to a single contiguous buffer
+        Every object is packed as a record with the layout of the schema
+        (the records are packed back-to-back, record "i" starts at offset i*size)
+        :param items : Sequence of dataclass objects (same data-shape)
+        :return packed_data : Packed records (bytes)
+        """
+
+        # Ensure every object matches the data-shape of the schema
+        # (strings of other lengths would otherwise be truncated or padded)
+        if self._variable_getter is not None:
+            for item in items:
+                if self.get_shape(item) != self.shape:
+                    raise ValueError('pack_batch: ERROR - Data-shape of {%r} does NOT match schema' %item)
+
+        # Schema contains only primitive values
+        # (leaf values are passed directly from the field-accessor to the struct)
+        if self.is_flat:
+            if self._single:
+                return b''.join(map(self.struct.pack, map(self._getter, items)))
+            return b''.join(starmap(self.struct.pack, map(self._getter, items)))
+
+        # Function return
+        return b''.join(map(self.pack, items))
+
+    # Iterate Unpack Batch
+    # ------------------------------
+    def iter_unpack(self, buffer):
+        """
+        Iterate through the records of a packed batch
+        Records are unpacked with "struct.iter_unpack" (streaming, no intermediate copies)
+        :param buffer : Readable buffer of packed records (bytes, bytearray, memoryview)
+        :return unpacked_data : Iterator of flat-structured data (strings decoded)
+        """
+
+        # No strings to decode (or length-prefixes to check)
+        if not (self.string_indices or self._prefix_plan):
+            return self.struct.iter_unpack(buffer)
+
+        # Function return
+        return map(self.decode_strings, self.struct.iter_unpack(buffer))
+
+    # Iterate Remap Batch
+    # ------------------------------
+    def iter_remap(self, buffer):
+        """
+        Iterate through the records of a packed batch as new dataclass objects
+        :param buffer : Readable buffer of packed records (bytes, bytearray, memoryview)
+        :return data : Iterator of new dataclass objects
+        """
+        return map(self.remap, self.iter_unpack(buffer))
+
+    # Decode Strings
+    # ------------------------------
+    def decode_strings(self, unpacked_data : tuple) -> tuple:
+        """
+        Decode the strings of unpacked data from byte-values
+        The length-prefixes are checked against the capacities of their leaves
+        :param unpacked_data : Unpacked data (tuple)
+        :return unpacked_data : Unpacked data (strings decoded) (tuple)
+        """
+
+        # Check the length-prefixes
+        for index, capacity in self._prefix_plan:
+            if unpacked_data[index] > capacity:
+                raise ValueError('CommSchema: ERROR - Length-prefix {%d} exceeds capacity {%d}' %(unpacked_data[index], capacity))
+
+        # No strings to decode
+        if not self.string_indices:
+            return unpacked_data
+
+        # Decode strings from byte-values
+        _unpacked_data = list(unpacked_data)
+        for index, kind in self._string_plan:
+
+            # String
+            if kind == LEAF_STRING:
+                _unpacked_data[index] = _unpacked_data[index].decode('UTF-8')
+
+            # Fixed-capacity string is stripped of the padding
+            # (packed values never end with a NUL-byte)
+            elif kind == LEAF_FIXED_STRING:
+                _unpacked_data[index] = _unpacked_data[index].rstrip(b'\x00').decode('UTF-8')
+
+            # Length-prefixed string is cut to the length in front of it
+            else:
+                _unpacked_data[index] = _unpacked_data[index][:_unpacked_data[index - 1]].decode('UTF-8')
+
+        # Function return
+        return tuple(_unpacked_data)
+
+    # Remap
+    # ------------------------------
+    def remap_plan(self, indata) -> object:
+        """
+        Remap flat-structured data to a new dataclass object using the decode plan
+        :param indata : Flat-structured data
+        :return data : New dataclass object
+        """
+        return _build(self.decode_plan, indata)
+
+    # Assign
+    # ------------------------------
+    def assign_plan(self, target, indata) -> None:
+        """
+        Assign flat-structured data directly to an existing dataclass object (in-place)
+        Every leaf is written to the existing object-tree (nested dataclasses are not
+        replaced), and list fields are updated in-place
+        :param target : Dataclass object (same data-shape as the schema)
+        :param indata : Flat-structured data
+        """
+
+        # Iterate through the flat assign plan
+        for parent, name, kind, start, length in self._assign_plan:
+
+            # Get the (nested) dataclass of the leaf
+            _target = target if parent is None else parent(target)
+
+            # Sequence is updated in-place
+            # (other sequence types are replaced by a list)
+            if kind in (LEAF_SEQUENCE, LEAF_FIXED_SEQUENCE, LEAF_PREFIXED_SEQUENCE):
+                _values = _get_sequence(kind, start, length, indata)
+                _sequence = getattr(_target, name)
+                if type(_sequence) is list:
+                    _sequence[:] = _values
+                else:
+                    setattr(_target, name, list(_values))
+
+            # Length-prefixed string (after the length)
+            elif kind == LEAF_PREFIXED_STRING:
+                setattr(_target, name, indata[start + 1])
+
+            # Primitive value or string
+            else:
+                setattr(_target, name, indata[start])
+
+
+# Get Schema ID
+# ------------------------------
+def get_schema_id(type_name : str, codes : tuple, paths : tuple, kinds : tuple, shape : tuple, capacities : tuple) -> int:
+    """
+    Get the Schema ID of a schema layout
+    32-bit checksum of the class name, field paths, conversion-code, leaf-kinds,
+    data-shape and capacities (schemas of different layouts have different Schema IDs)
+    :param type_name : Class name of the dataclass (str)
+    :param codes : Format-Code of every value in the packed data (tuple)
+    :param paths : Attribute paths of every leaf (tuple)
+    :param kinds : Leaf-kind of every leaf (tuple)
+    :param shape : Lengths of the variable sized leaves (tuple)
+    :param capacities : Capacities of the declared leaves (tuple)
+    :return schema_id : Schema ID (int)
+    """
+    return zlib.crc32(('%s:%s:%s:%s:%s:%s' % (type_name, ','.join(paths), ''.join(codes), ','.join(map(str, kinds)),
+                                              ','.join(map(str, shape)), ','.join(map(str, capacities)))).encode('UTF-8'))
+
+
+# Get String Plan
+# ------------------------------
+def _get_string_plan(schema : CommSchema) -> tuple:
+    """
+    Find the flat indices of the string leaves in the unpacked data
+    :param schema : Communication Schema (during initialization)
+    :return plan : Flat index and leaf-kind of every string (tuple)
+    :return count : Number of values in the unpacked data (int)
+    """
+
+    _plan = []
+    _index = 0
+
+    # Iterate through the leaves
+    for path, kind, length, start in _iterate_leaves(schema):
+
+        # String is a single entry in the unpacked data
+        if kind in (LEAF_STRING, LEAF_FIXED_STRING):
+            _plan.append((start, kind))
+
+        # Length-prefixed string is the entry after the length
+        elif kind == LEAF_PREFIXED_STRING:
+            _plan.append((start + 1, kind))
+
+        _index = start + _get_width(kind, length)
+
+    # Function return
+    return tuple(_plan), _index
+
+
+# Get Leaf Width
+# ------------------------------
+def _get_width(kind : int, length : int) -> int:
+    """
+    Get the number of values of a leaf in the unpacked data
+    :param kind : Leaf-kind
+    :param length : Length (or capacity) of the leaf
+    :return width : Number of values (int)
+    """
+
+    # Sequence contributes one entry per element
+    if kind in (LEAF_SEQUENCE, LEAF_FIXED_SEQUENCE):
+        return length
+
+    # Length-prefixed leaf contributes the length in front of the value
+    if kind == LEAF_PREFIXED_SEQUENCE:
+        return length + 1
+    if kind == LEAF_PREFIXED_STRING:
+        return 2
+
+    # Function return
+    return 1
+
+
+# Get Sequence from Flat Data
+# ------------------------------
+def _get_sequence(kind : int, start : int, length : int, indata):
+    """
+    Get the values of a sequence leaf from flat-structured data
+    :param kind : Leaf-kind
+    :param start : Flat index of the leaf
+    :param length : Length (or capacity) of the leaf
+    :param indata : Flat-structured data
+    :return values : Values of the sequence (tuple)
+    """
+
+    # Length-prefixed sequence is cut to the length in front of it
+    if kind == LEAF_PREFIXED_SEQUENCE:
+        return indata[start + 1:start + 1 + indata[start]]
+
+    # Function return
+    return indata[start:start + length]
+
+
+# Build Dataclass from Decode Plan
+# ------------------------------
+def _build(plan : tuple, indata):
+    """
+    Build a dataclass object from flat-structured data using a decode plan
+    :param plan : Decode plan (dataclass type, item plans)
+    :param indata : Flat-structured data
+    :return data : New dataclass object
+    """
+
+    _data_type, _items = plan
+    _kwargs = {}
+
+    # Iterate through the item plans
+    # (fields are assigned by name)
+    for kind, start, item, name in _items:
+
+        # Nested dataclass
+        if kind is None:
+            _kwargs[name] = _build(item, indata)
+
+        # Sequence (list of primitive values)
+        elif kind in (LEAF_SEQUENCE, LEAF_FIXED_SEQUENCE, LEAF_PREFIXED_SEQUENCE):
+            _kwargs[name] = list(_get_sequence(kind, start, item, indata))
+
+        # Length-prefixed string (after the length)
+        elif kind == LEAF_PREFIXED_STRING:
+            _kwargs[name] = indata[start + 1]
+
+        # Primitive value or string
+        else:
+            _kwargs[name] = indata[start]
+
+    # Function return
+    return _data_type(**_kwargs)
+
+
+# Generate Remap Expression
+# ------------------------------
+def _generate_remap_expression(plan : tuple, namespace : dict) -> str:
+    """
+    Generate the source expression building a dataclass object from a decode plan
+    :param plan : Decode plan (dataclass type, item plans)
+    :param namespace : Namespace of the generated code (dataclass types are added)
+    :return expression : Source expression (str)
+    """
+
+    _data_type, _items = plan
+
+    # Add the dataclass type to the namespace of the generated code
+    _type_name = '_T%d' % len(namespace)
+    namespace[_type_name] = _data_type
+
+    # Generate the argument of every item plan
+    # (keyword arguments, fields are assigned by name)
+    _args = []
+    for kind, start, item, name in _items:
+
+        # Nested dataclass
+        if kind is None:
+            _args.append(_generate_remap_expression(item, namespace))
+
+        # Sequence (list of primitive values)
+        elif kind in (LEAF_SEQUENCE, LEAF_FIXED_SEQUENCE):
+            _args.append('[' + ', '.join('v[%d]' % i for i in range(start, start + item)) + ']')
+
+        # Length-prefixed sequence (cut to the length in front of it)
+        elif kind == LEAF_PREFIXED_SEQUENCE:
+            _args.append('list(v[%d:%d + v[%d]])' % (start + 1, start + 1, start))
+
+        # Length-prefixed string (after the length)
+        elif kind == LEAF_PREFIXED_STRING:
+            _args.append('v[%d]' % (start + 1))
+
+        # Primitive value or string
+        else:
+            _args.append('v[%d]' % start)
+        _args[-1] = '%s=%s' % (name, _args[-1])
+
+    # Function return
+    return '%s(%s)' % (_type_name, ', '.join(_args))
+
+
+# Generate Codec
+# ------------------------------
+def generate_codec(schema : CommSchema) -> dict:
+    """
+    Generate straight-line pack, pack-into, unpack, unpack-from, remap and assign functions of a Communication Schema
+    The source code is generated from the flat field-accessor plan and decode plan
+    and compiled with "exec", attributes are read directly (e.g. self.class3.class2.lista_mi[0])
+    without any loops, type checks or iterable checks.
+    The generated functions are used as the functions of the schema
+    :param schema : Communication Schema (during initialization)
+    :return functions : Generated functions and source code (dict)
+    """
+
+    # Generate Pack function
+    # ------------------------------
+    _lines = ['def pack(self):']
+    _values = []
+    for index, (path, kind, length, start) in enumerate(_iterate_leaves(schema)):
+
+        # Primitive value
+        if kind == LEAF_VALUE:
+            _values.append('self.' + path)
+
+        # String needs to be encoded to byte-value
+        elif kind == LEAF_STRING:
+            _values.append("self.%s.encode('UTF-8')" % path)
+
+        # Sequence is flattened
+        # (assigned to a local variable to avoid repeated attribute lookups)
+        elif kind == LEAF_SEQUENCE:
+            _lines.append('    _s%d = self.%s' % (index, path))
+            _values.extend('_s%d[%d]' % (index, i) for i in range(length))
+
+        # Declared field
+        # (value needs to fit the capacity of the field)
+        else:
+            if kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+                _lines.append("    _s%d = self.%s.encode('UTF-8')" % (index, path))
+            else:
+                _lines.append('    _s%d = self.%s' % (index, path))
+            _lines.append('    if len(_s%d) > %d: raise ValueError(%r)'
+                          % (index, length, 'CommSchema: ERROR - Field {%s} exceeds capacity {%d}' %(path, length)))
+            if kind == LEAF_FIXED_STRING:
+                _lines.append("    if _s%d.endswith(b'\\x00'): raise ValueError(%r)"
+                              % (index, 'CommSchema: ERROR - Field {%s} ends with a NUL-byte' %path))
+
+            # Length-prefix in front of the value
+            if kind in (LEAF_PREFIXED_STRING, LEAF_PREFIXED_SEQUENCE):
+                _values.append('len(_s%d)' % index)
+
+            # String is padded by the struct, sequence is padded with zeros
+            if kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+                _values.append('_s%d' % index)
+            else:
+                _values.append('*_s%d, *_zeros[:%d - len(_s%d)]' % (index, length, index))
+
+    _lines.append('    return _pack(%s)' % ', '.join(_values))
+    _pack_source = '\n'.join(_lines)
+
+    # Generate Pack-Into function
+    # (same leaf values as the pack function)
+    _lines[0] = 'def pack_into(self, buffer, offset=0):'
+    _lines[-1] = '    _pack_into(buffer, offset, %s)' % ', '.join(_values)
+    _pack_into_source = '\n'.join(_lines)
+
+    # Generate Unpack function
+    # ------------------------------
+    _lines = ['def unpack(packed_data):']
+
+    # Length-prefixes are checked against the capacities of their leaves
+    _prefix_checks = ['    if v[%d] > %d: raise ValueError(%r %% v[%d])'
+                      % (index, capacity, 'CommSchema: ERROR - Length-prefix {%%d} exceeds capacity {%d}' % capacity, index)
+                      for index, capacity in schema._prefix_plan]
+
+    # Strings needs to be decoded from byte-values
+    # (fixed-capacity strings are stripped of the padding,
+    # length-prefixed strings are cut to the length in front of them)
+    if schema.string_indices:
+        _values = ['v[%d]' % i for i in range(schema.count)]
+        for i, kind in schema._string_plan:
+            if kind == LEAF_STRING:
+                _values[i] = "v[%d].decode('UTF-8')" % i
+            elif kind == LEAF_FIXED_STRING:
+                _values[i] = "v[%d].rstrip(b'\\x00').decode('UTF-8')" % i
+            else:
+                _values[i] = "v[%d][:v[%d]].decode('UTF-8')" % (i, i - 1)
+        _lines.append('    v = _unpack(packed_data)')
+        _lines.extend(_prefix_checks)
+        _lines.append('    return (%s,)' % ', '.join(_values))
+
+    # Unpacked data can be returned directly
+    # (after the length-prefixes are checked)
+    elif _prefix_checks:
+        _lines.append('    v = _unpack(packed_data)')
+        _lines.extend(_prefix_checks)
+        _lines.append('    return v')
+    else:
+        _lines.append('    return _unpack(packed_data)')
+
+    _unpack_source = '\n'.join(_lines)
+
+    # Generate Unpack-From function
+    # (same decoding as the unpack function)
+    _lines[0] = 'def unpack_from(buffer, offset=0):'
+    _lines = [line.replace('_unpack(packed_data)', '_unpack_from(buffer, offset)') for line in _lines]
+    _unpack_from_source = '\n'.join(_lines)
+
+    # Generate Remap function
+    # ------------------------------
+    _namespace = {}
+    _remap_source = 'def remap(v):\n    return ' + _generate_remap_expression(schema.decode_plan, _namespace)
+
+    # Generate Assign function
+    # ------------------------------
+    # (parents of the leaves are assigned to local variables once)
+    _lines = ['def assign(self, v):']
+    _parents = {'' : 'self'}
+    for index, (path, kind, length, start) in enumerate(_iterate_leaves(schema)):
+        _parent, _, _name = path.rpartition('.')
+        if _parent not in _parents:
+            _parents[_parent] = '_p%d' % index
+            _lines.append('    %s = self.%s' % (_parents[_parent], _parent))
+
+        # Sequence is updated in-place (element by element)
+        if kind == LEAF_SEQUENCE:
+            _lines.append('    _s%d = %s.%s' % (index, _parents[_parent], _name))
+            _lines.extend('    _s%d[%d] = v[%d]' % (index, i, start + i) for i in range(length))
+
+        # Declared sequence is updated in-place (slice, length may differ)
+        elif kind == LEAF_FIXED_SEQUENCE:
+            _lines.append('    %s.%s[:] = v[%d:%d]' % (_parents[_parent], _name, start, start + length))
+        elif kind == LEAF_PREFIXED_SEQUENCE:
+            _lines.append('    %s.%s[:] = v[%d:%d + v[%d]]' % (_parents[_parent], _name, start + 1, start + 1, start))
+
+        # Length-prefixed string (after the length)
+        elif kind == LEAF_PREFIXED_STRING:
+            _lines.append('    %s.%s = v[%d]' % (_parents[_parent], _name, start + 1))
+
+        # Primitive value or string
+        else:
+            _lines.append('    %s.%s = v[%d]' % (_parents[_parent], _name, start))
+
+    _assign_source = '\n'.join(_lines)
+
+    # Compile the generated functions
+    # ------------------------------
+    _source = '\n\n'.join((_pack_source, _pack_into_source, _unpack_source, _unpack_from_source,
+                           _remap_source, _assign_source))
+    _namespace['_pack'] = schema.struct.pack
+    _namespace['_pack_into'] = schema.struct.pack_into
+    _namespace['_unpack'] = schema.struct.unpack
+    _namespace['_unpack_from'] = schema.struct.unpack_from
+    _namespace['_zeros'] = (0,) * max(schema.capacities, default = 0)
+    exec(compile(_source, '<CommSchema %s>' % schema.data_type.__name__, 'exec'), _namespace)
+
+    # Function return
+    return {'pack' : _namespace['pack'], 'pack_into' : _namespace['pack_into'],
+            'unpack' : _namespace['unpack'], 'unpack_from' : _namespace['unpack_from'],
+            'remap' : _namespace['remap'], 'assign' : _namespace['assign'], 'source' : _source}
+
+
+# Iterate Leaves
+# ------------------------------
+def _iterate_leaves(schema : CommSchema):
+    """
+    Iterate through the leaves of a Communication Schema
+    :param schema : Communication Schema
+    :return leaves : Generator of (path, kind, length or capacity, flat index) of every leaf
+    """
+    _shape = iter(schema.shape)
+    _capacities = iter(schema.capacities)
+    _index = 0
+    for path, kind in zip(schema.paths, schema.kinds):
+
+        # Length of variable sized leaf, or capacity of declared leaf
+        if kind == LEAF_VALUE:
+            _length = 1
+        elif kind in VARIABLE_KINDS:
+            _length = next(_shape)
+        else:
+            _length = next(_capacities)
+
+        yield path, kind, _length, _index
+        _index += _get_width(kind, _length)
+
+
+# NumPy Type Codes
+# ------------------------------
+# NumPy type of every Byte Format-Code (byte order is added separately)
+NUMPY_TYPE_CODE : dict[str, str] = {
+    CommToolbox.COMM_CONST.CHAR     : 'S1',
+    CommToolbox.COMM_CONST.SCHAR    : 'i1',
+    CommToolbox.COMM_CONST.UCHAR    : 'u1',
+    CommToolbox.COMM_CONST.BOOL     : '?',
+    CommToolbox.COMM_CONST.INT      : 'i2',
+    CommToolbox.COMM_CONST.UINT     : 'u2',
+    CommToolbox.COMM_CONST.DINT     : 'i4',
+    CommToolbox.COMM_CONST.UDINT    : 'u4',
+    CommToolbox.COMM_CONST.LINT     : 'i4',
+    CommToolbox.COMM_CONST.ULINT    : 'u4',
+    CommToolbox.COMM_CONST.FLOAT    : 'f4',
+    CommToolbox.COMM_CONST.DOUBLE   : 'f8',
+    CommToolbox.COMM_CONST.STRING   : 'S',
+}
+
+# NumPy byte order of every Byte Order character
+NUMPY_BYTE_ORDER : dict[str, str] = {
+    CommToolbox.COMM_CONST.Native       : '=',
+    CommToolbox.COMM_CONST.LittleEndian : '<',
+    CommToolbox.COMM_CONST.BigEndian    : '>',
+    CommToolbox.COMM_CONST.Network      : '>',
+}
+
+
+# NumPy dtypes of the compiled schemas
+# (created on first use, keyed by schema)
+_NUMPY_DTYPES : dict = {}
+
+
+# Get NumPy Type
+# ------------------------------
+def _get_numpy_type(code : str) -> str:
+    """
+    Get the NumPy type of a Byte Format-Code (with byte order of the network)
+    :param code : Byte Format-Code (str) (e.g. 'f', '5s')
+    :return numpy_type : NumPy type (str) (e.g. '>f4', 'S5')
+    """
+
+    # Special case: String
+    # (String-length number is added to the NumPy type)
+    if code[-1] == CommToolbox.COMM_CONST.STRING:
+        return NUMPY_TYPE_CODE[CommToolbox.COMM_CONST.STRING] + code[:-1]
+
+    # Function return
+    return NUMPY_BYTE_ORDER[CommToolbox.COMM_CONST.Network] + NUMPY_TYPE_CODE[code]
+
+
+# Get NumPy dtype Specification
+# ------------------------------
+def get_numpy_spec(schema : CommSchema) -> list:
+    """
+    Get the NumPy structured dtype specification of a Communication Schema
+    Nested dataclasses become nested fields, lists become sub-arrays, strings become
+    fixed-length byte-strings and length-prefixed fields become (length, data) fields
+    :param schema : Communication Schema
+    :return spec : NumPy dtype specification (list of (name, type[, shape]) tuples)
+    """
+
+    spec = []
+    _codes = iter(schema.codes)
+
+    # Iterate through the leaves
+    for path, kind, length, start in _iterate_leaves(schema):
+
+        # Find the specification of the (nested) dataclass of the leaf
+        _names = path.split('.')
+        _spec = spec
+        for name in _names[:-1]:
+            if (not _spec) or (_spec[-1][0] != name):
+                _spec.append((name, []))
+            _spec = _spec[-1][1]
+
+        # Length-prefixed leaf is a nested field of the length and the value
+        if kind in (LEAF_PREFIXED_STRING, LEAF_PREFIXED_SEQUENCE):
+            _prefix = ('length', _get_numpy_type(next(_codes)))
+            if kind == LEAF_PREFIXED_STRING:
+                _spec.append((_names[-1], [_prefix, ('data', _get_numpy_type(next(_codes)))]))
+            else:
+                _types = {_get_numpy_type(next(_codes)) for i in range(length)}
+                _spec.append((_names[-1], [_prefix, ('data', _types.pop(), (length,))]))
+
+        # Sequence is a sub-array
+        # (elements needs to be of same type)
+        elif kind in (LEAF_SEQUENCE, LEAF_FIXED_SEQUENCE):
+            _types = {_get_numpy_type(next(_codes)) for i in range(length)}
+            if len(_types) > 1:
+                raise TypeError('get_numpy_spec: ERROR - Sequence {%s} has mixed types' %path)
+            _spec.append((_names[-1], _types.pop() if _types else 'u1', (length,)))
+
+        # Primitive value or string
+        else:
+            _spec.append((_names[-1], _get_numpy_type(next(_codes))))
+
+    # Function return
+    return spec
+
+
+# Get NumPy dtype
+# ------------------------------
+def get_numpy_dtype(schema : CommSchema):
+    """
+    Get the NumPy structured dtype of a Communication Schema
+    The dtype has the same (packed) layout as a record of the schema,
+    and is created once per schema
+    :param schema : Communication Schema
+    :return dtype : NumPy structured dtype (numpy.dtype)
+    """
+
+    # NumPy dtype has been created
+    dtype = _NUMPY_DTYPES.get(schema)
+    if dtype is not None:
+        return dtype
+
+    # NumPy is an optional dependency
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('get_numpy_dtype: ERROR - NumPy is required for structured dtypes')
+
+    # Create NumPy dtype
+    dtype = numpy.dtype(get_numpy_spec(schema))
+
+    # Ensure the dtype matches the record size of the schema
+    if dtype.itemsize != schema.size:
+        raise TypeError('get_numpy_dtype: ERROR - dtype size does NOT match schema size')
+
+    # Store NumPy dtype of the schema
+    _NUMPY_DTYPES[schema] = dtype
+
+    # Function return
+    return dtype
+
+
+# Compile Dataclass Fields
+# ------------------------------
+def _compile_fields(data_type : type, indata, prefix : str, codes : list, paths : list, kinds : list,
+                    shape : list, capacities : list, index : int):
+    """
+    Iterate through the fields of a dataclass and append the leaves
+    to the flat field-accessor plan
+    Declared fields (see "get_declarations") are compiled from the declaration,
+    independent of the value of the field. Other fields are compiled from the value
+    of the dataclass object, or from the annotation if no object is given
+    :param data_type : Dataclass type
+    :param indata : Dataclass object (None: compile from the class definition)
+    :param prefix : Attribute path prefix of the dataclass
+    :param codes : Format-Codes of the leaves
+    :param paths : Attribute paths of the leaves
+    :param kinds : Leaf-kinds of the leaves
+    :param shape : Lengths of the variable sized leaves
+    :param capacities : Capacities of the declared leaves
+    :param index : Flat index of the first value of the dataclass
+    :return plan : Decode plan of the dataclass (tuple)
+    :return index : Flat index after the last value of the dataclass (int)
+    """
+
+    _items = []
+    _hints = _get_hints(data_type)
+    _declarations = get_declarations(data_type)
+
+    # Iterate through the fields of the dataclass
+    for field in fields(data_type):
+
+        # Get the data of current field
+        # (annotation of the field if compiled from the class definition)
+        _field_name = field.name
+        _field_path = prefix + _field_name
+        _declaration = _declarations.get(_field_name)
+        if indata is None:
+            _field_data = None
+            _field_type = _hints.get(_field_name, field.type)
+            if get_origin(_field_type) is Annotated:
+                _field_type = get_args(_field_type)[0]
+        else:
+            _field_data = getattr(indata, _field_name)
+            _field_type = type(_field_data)
+
+        # Field is a Type-Map
+        # ------------------------------
+        if _field_type is CommToolbox.TypeMap:
+            # Skip if field is a Type-Map
+            continue
+
+        # Field is declared with a Byte Format-Code
+        # ------------------------------
+        # (primitive value)
+        elif type(_declaration) is str:
+            codes.append(_declaration)
+            paths.append(_field_path)
+            kinds.append(LEAF_VALUE)
+            _items.append((LEAF_VALUE, index, None, _field_name))
+            index += 1
+
+        # Field is declared
+        # ------------------------------
+        # (fixed-capacity or length-prefixed string or list)
+        elif _declaration is not None:
+            _kind = DECLARED_KINDS[type(_declaration)]
+            _capacity = _declaration.capacity
+
+            # Length-prefix in front of the value
+            if _kind in (LEAF_PREFIXED_STRING, LEAF_PREFIXED_SEQUENCE):
+                codes.append(CommToolbox.LENGTH_PREFIX)
+
+            # String of capacity bytes, or capacity values
+            if _kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+                codes.append(str(_capacity) + CommToolbox.COMM_CONST.STRING)
+            else:
+                codes.extend((_declaration.code,) * _capacity)
+
+            paths.append(_field_path)
+            kinds.append(_kind)
+            capacities.append(_capacity)
+            _items.append((_kind, index, _capacity, _field_name))
+            index += _get_width(_kind, _capacity)
+
+        # Field-data is a dataclass
+        # ------------------------------
+        elif is_dataclass(_field_type):
+            # Compile the nested dataclass
+            _start = index
+            _sub_plan, index = _compile_fields(_field_type, _field_data, _field_path + '.', codes, paths, kinds,
+                                               shape, capacities, index)
+            _items.append((None, _start, _sub_plan, _field_name))
+
+        # Field is compiled from the class definition
+        # ------------------------------
+        # (only primitive annotations have a value-independent layout)
+        elif indata is None:
+            if _field_type not in (bool, int, float):
+                raise TypeError('compile_class_schema: ERROR - Field {%s} has no fixed layout '
+                                '(annotation {%r} needs a declaration)' %(_field_path, _field_type))
+            codes.append(CommToolbox.BYTE_FORMAT_CODE[_field_type])
+            paths.append(_field_path)
+            kinds.append(LEAF_VALUE)
+            _items.append((LEAF_VALUE, index, None, _field_name))
+            index += 1
+
+        # Field-data is Iterable-Type
+        # ------------------------------
+        # (list, tuple)
+        elif (_field_type is tuple) or (_field_type is list):
+            # Only flat sequences of primitive values are supported
+            for item in _field_data:
+                if CommToolbox.is_iterable(item) or is_dataclass(item):
+                    raise TypeError('compile_schema: ERROR - Nested sequence in field {%s} is unsupported' %_field_path)
+                codes.append(CommToolbox.get_byte_format(item))
+
+            paths.append(_field_path)
+            kinds.append(LEAF_SEQUENCE)
+            shape.append(len(_field_data))
+            _items.append((LEAF_SEQUENCE, index, len(_field_data), _field_name))
+            index += len(_field_data)
+
+        # Field-data is Primitive Type
+        # ------------------------------
+        # (int, float, string, etc.)
+        else:
+            codes.append(CommToolbox.get_byte_format(_field_data))
+            paths.append(_field_path)
+
+            # Special case: String
+            if _field_type is str:
+                kinds.append(LEAF_STRING)
+                shape.append(len(_field_data))
+                _items.append((LEAF_STRING, index, None, _field_name))
+            else:
+                kinds.append(LEAF_VALUE)
+                _items.append((LEAF_VALUE, index, None, _field_name))
+            index += 1
+
+    # Function return
+    return (data_type, tuple(_items)), index
+
+
+# Get Field Annotations
+# ------------------------------
+def _get_hints(data_type : type) -> dict:
+    """
+    Get the resolved annotations of a dataclass type (including metadata)
+    Unresolvable annotations (e.g. forward references) are used as is
+    :param data_type : Dataclass type
+    :return hints : Annotation of every field (dict)
+    """
+    try:
+        return get_type_hints(data_type, include_extras = True)
+    except (NameError, TypeError):
+        return {field.name : field.type for field in fields(data_type)}
+
+
+# Get Field Declarations
+# ------------------------------
+def get_declarations(data_type : type) -> dict:
+    """
+    Get the Field Declarations of a dataclass type
+    A field is declared in the metadata of its annotation, either by a Byte Format-Code
+    (e.g. engelsk_mil : Annotated[int, COMM_CONST.DINT] = 1609) or by a Field Declaration
+    (e.g. name : Annotated[str, CommToolbox.FixedString(16)] = 'olsen')
+    :param data_type : Dataclass type
+    :return declarations : Byte Format-Code or Field Declaration of every declared field (dict)
+    """
+
+    _hints = _get_hints(data_type)
+
+    # Find the declaration in the metadata of every annotation
+    declarations = {}
+    for field in fields(data_type):
+        _hint = _hints.get(field.name, field.type)
+        if get_origin(_hint) is not Annotated:
+            continue
+        for metadata in get_args(_hint)[1:]:
+            if (type(metadata) in DECLARED_KINDS) or ((type(metadata) is str) and (metadata in CommToolbox.ARRAY_ELEMENT_CODES)):
+                declarations[field.name] = metadata
+                break
+
+    # Function return
+    return declarations
+
+
+# Verify Generated Codec
+# ------------------------------
+def _verify_codec(schema : CommSchema, indata) -> None:
+    """
+    Verify the generated functions of a schema against the flat field-accessor plan
+    :param schema : Communication Schema (with generated functions)
+    :param indata : Dataclass object (matching the schema)
+    """
+    _packed_data = schema.pack_plan(indata)
+    if (schema.pack(indata) != _packed_data) or (schema.unpack(_packed_data) != schema.unpack_plan(_packed_data)):
+        raise RuntimeError('compile_schema: ERROR - Generated codec of {%s} does NOT match' %schema.data_type.__name__)
+
+
+# Compile Schema
+# ------------------------------
+def compile_schema(indata) -> CommSchema:
+    """
+    Compile a Communication Schema of a dataclass object
+    The schema is based on the field-structure of the dataclass and the
+    data-shape (string and list lengths) of the given object
+    (declared fields use the declaration of the field)
+    :param indata : Dataclass object
+    :return schema : Compiled Communication Schema
+    """
+
+    # Check that in-data is a dataclass
+    if not is_dataclass(indata):
+        raise TypeError('compile_schema: ERROR - In-Data is NOT a Dataclass')
+
+    # Compile the fields of the dataclass
+    _codes, _paths, _kinds, _shape, _capacities = [], [], [], [], []
+    _decode_plan, _ = _compile_fields(type(indata), indata, '', _codes, _paths, _kinds, _shape, _capacities, 0)
+
+    # Check for empty dataclass
+    if not _paths:
+        raise TypeError('compile_schema: ERROR - Dataclass {%s} has no fields to pack' %type(indata).__name__)
+
+    # Create Communication Schema
+    # (with code-generated functions if enabled for the dataclass)
+    schema = CommSchema(type(indata), tuple(_codes), tuple(_paths), tuple(_kinds), tuple(_shape), tuple(_capacities),
+                        _decode_plan, getattr(type(indata), CODEGEN_ATTRIBUTE, False))
+
+    # Verify generated functions against the flat field-accessor plan
+    if schema.is_generated:
+        _verify_codec(schema, indata)
+
+    # Function return
+    return schema
+
+
+# Compile Class Schema
+# ------------------------------
+def compile_class_schema(data_type : type) -> CommSchema:
+    """
+    Compile the Communication Schema of a dataclass type from the class definition
+    Every field needs a value-independent layout: a declaration (see "get_declarations"),
+    a primitive annotation (bool, int, float) or a nested dataclass annotation.
+    The schema does not depend on any dataclass object, and can be compiled once at import time
+    :param data_type : Dataclass type
+    :return schema : Compiled Communication Schema
+    """
+
+    # Check that data-type is a dataclass
+    if not (isinstance(data_type, type) and is_dataclass(data_type)):
+        raise TypeError('compile_class_schema: ERROR - Data-Type is NOT a Dataclass')
+
+    # Compile the fields of the dataclass
+    _codes, _paths, _kinds, _shape, _capacities = [], [], [], [], []
+    _decode_plan, _ = _compile_fields(data_type, None, '', _codes, _paths, _kinds, _shape, _capacities, 0)
+
+    # Check for empty dataclass
+    if not _paths:
+        raise TypeError('compile_class_schema: ERROR - Dataclass {%s} has no fields to pack' %data_type.__name__)
+
+    # Create Communication Schema
+    schema = CommSchema(data_type, tuple(_codes), tuple(_paths), tuple(_kinds), (), tuple(_capacities),
+                        _decode_plan, getattr(data_type, CODEGEN_ATTRIBUTE, False))
+
+    # Verify generated functions against the flat field-accessor plan
+    # (using a dataclass object decoded from a zeroed record)
+    if schema.is_generated:
+        _verify_codec(schema, schema.remap_plan(schema.unpack_plan(bytes(schema.size))))
+
+    # Function return
+    return schema
+
+
+# Schema Cache
+# ------------------------------
+class SchemaCache():
+    """
+    Schema Cache
+    Per-class cache of compiled Communication Schemas
+    Schemas are stored by layout (for packing) and by conversion-code (for unpacking).
+    The layout of a class compiled from the class definition is the data-shape,
+    otherwise the data-shape and the value types (see "CommSchema.get_layout").
+    At most MAX_CACHED_SCHEMAS layouts are kept, the least recently used schema
+    is evicted (and removed from the Schema Registry)
+    """
+
+    def __init__(self, schema : CommSchema, typed : bool = False) -> None:
+        self.by_layout = OrderedDict()
+        self.by_code = {}
+
+        # Shared Type-Maps of the class (by layout, see "get_type_map")
+        self.type_maps = OrderedDict()
+
+        # Layout of a dataclass object
+        # (leaves are the same for every schema of the class)
+        self.get_layout = schema.get_layout if typed else schema.get_shape
+
+    # Add Schema
+    # ------------------------------
+    def add(self, schema : CommSchema, layout : tuple) -> None:
+        self.by_layout[layout] = schema
+        self.by_code[schema.conversion_code] = schema
+
+        # Register schema in the process-wide Schema Registry
+        register_schema(schema)
+
+        # Evict the least recently used schemas
+        while len(self.by_layout) > MAX_CACHED_SCHEMAS:
+            _layout, _schema = self.by_layout.popitem(last = False)
+            if self.by_code.get(_schema.conversion_code) is _schema:
+                del self.by_code[_schema.conversion_code]
+            unregister_schema(_schema)
+
+    # Add Type-Map
+    # ------------------------------
+    def add_type_map(self, type_map : CommToolbox.TypeMap, layout : tuple) -> None:
+        self.type_maps[layout] = type_map
+
+        # Evict the least recently used Type-Maps
+        while len(self.type_maps) > MAX_CACHED_SCHEMAS:
+            self.type_maps.popitem(last = False)
+
+
+# Get Schema
+# ------------------------------
+def get_schema(indata) -> CommSchema:
+    """
+    Get the Communication Schema of a dataclass object
+    Schemas are compiled once per dataclass and layout (data-shape, and value types of
+    fields without a fixed layout) and cached on the class itself (a changed or
+    redefined class gets its own cache).
+    A dataclass with a value-independent layout is compiled once from the class definition
+    :param indata : Dataclass object
+    :return schema : Compiled Communication Schema
+    """
+
+    _data_type = type(indata)
+
+    # Get the schema-cache of the class
+    # (class-dictionary lookup, subclasses do not inherit the cache of the parent)
+    _cache = _data_type.__dict__.get(_CACHE_ATTRIBUTE)
+
+    # No schema-cache exists for the class
+    if _cache is None:
+        # Compile the schema and create the schema-cache
+        return compile_class(_data_type, indata)
+
+    # Lookup the schema by layout
+    _layout = _cache.get_layout(indata)
+    schema = _cache.by_layout.get(_layout)
+
+    # Schema for layout has not been compiled
+    if schema is None:
+        schema = compile_schema(indata)
+        _cache.add(schema, _layout)
+
+    # Most recently used schema
+    else:
+        _cache.by_layout.move_to_end(_layout)
+
+    # Function return
+    return schema
+
+
+# Compile Class
+# ------------------------------
+def compile_class(data_type : type, indata = None) -> CommSchema:
+    """
+    Compile the Communication Schema of a dataclass type and create its schema-cache
+    The schema is compiled from the class definition if every field has a value-independent
+    layout (see "compile_class_schema"), otherwise from the data-shape of the dataclass object
+    :param data_type : Dataclass type
+    :param indata : Dataclass object (None: compile from the class definition only)
+    :return schema : Compiled Communication Schema
+    """
+
+    # Compile the schema from the class definition
+    # (cached by data-shape, the class has no variable sized leaves)
+    try:
+        schema = compile_class_schema(data_type)
+        _cache = SchemaCache(schema)
+        _layout = schema.shape
+
+    # Layout depends on the values of the dataclass
+    # (cached by data-shape and value types)
+    except TypeError:
+        if indata is None:
+            raise
+        schema = compile_schema(indata)
+        _cache = SchemaCache(schema, typed = True)
+        _layout = _cache.get_layout(indata)
+
+    # Create the schema-cache of the class
+    _cache.add(schema, _layout)
+    setattr(data_type, _CACHE_ATTRIBUTE, _cache)
+
+    # Function return
+    return schema
+
+
+# Get Class Schema
+# ------------------------------
+def get_class_schema(data_type : type) -> CommSchema:
+    """
+    Get the Communication Schema of a dataclass type compiled from the class definition
+    (compiled once, e.g. at import time, see "compile_class_schema")
+    :param data_type : Dataclass type
+    :return schema : Compiled Communication Schema
+    """
+
+    # Schema of the class definition has been compiled
+    _cache = data_type.__dict__.get(_CACHE_ATTRIBUTE)
+    if _cache is not None:
+        schema = _cache.by_layout.get(())
+        if (schema is not None) and (not schema.variable_paths):
+            return schema
+
+    # Function return
+    return compile_class(data_type)
+
+
+# Get Type-Map
+# ------------------------------
+def get_type_map(indata) -> CommToolbox.TypeMap:
+    """
+    Get the shared Type-Map of a dataclass object (used by the generic remap)
+    The Type-Map is built once per dataclass and layout (data-shape and value types)
+    and cached with the schemas of the class. A shared Type-Map holds no reference
+    to dataclass objects (data is None at every nesting level)
+    :param indata : Dataclass object (Generic-Communication-Dataclass)
+    :return type_map : Shared Type-Map
+    """
+
+    # Get the compiled schema of the dataclass
+    try:
+        schema = get_schema(indata)
+
+    # Unsupported data-shape (nested sequences)
+    # (Type-Map is built for the dataclass object)
+    except TypeError:
+        return _share_type_map(indata.get_typemap())
+
+    # Lookup the Type-Map by layout
+    _cache = type(indata).__dict__[_CACHE_ATTRIBUTE]
+    _layout = schema.get_layout(indata)
+    type_map = _cache.type_maps.get(_layout)
+
+    # Type-Map for layout has not been built
+    if type_map is None:
+        type_map = _share_type_map(indata.get_typemap())
+        _cache.add_type_map(type_map, _layout)
+
+    # Most recently used Type-Map
+    else:
+        _cache.type_maps.move_to_end(_layout)
+
+    # Function return
+    return type_map
+
+
+# Share Type-Map
+# ------------------------------
+def _share_type_map(type_map : CommToolbox.TypeMap) -> CommToolbox.TypeMap:
+    """
+    Copy a Type-Map without the references to the dataclass objects
+    :param type_map : Type-Map of a dataclass object
+    :return type_map : Shared Type-Map (data is None at every nesting level)
+    """
+    return CommToolbox.TypeMap(None, type_map.type,
+                               [(_share_type_map(item) if type(item) is CommToolbox.TypeMap else item, length)
+                                for item, length in type_map.items],
+                               type_map.size)
+
+
+# Get Schema by Conversion-Code
+# ------------------------------
+def get_schema_by_code(data_type : type, conversion_code : str):
+    """
+    Get a previously compiled Communication Schema by its Conversion-Code
+    :param data_type : Dataclass type
+    :param conversion_code : Byte Conversion-Code (str)
+    :return schema : Compiled Communication Schema (None if not compiled)
+    """
+
+    _cache = data_type.__dict__.get(_CACHE_ATTRIBUTE)
+
+    # No schema-cache exists for the class
+    if _cache is None:
+        return None
+
+    # Function return
+    return _cache.by_code.get(conversion_code)
+
+
+# Schema Registry
+# ------------------------------
+# Process-wide registry of compiled schemas (keyed by Schema ID)
+# and of the dataclass types used by the schemas (keyed by class name)
+# (bounded by the schema-caches of the classes and by MAX_DEFINITIONS)
+SCHEMA_REGISTRY : dict = {}
+_REGISTERED_TYPES : dict = {}
+
+# Schema ID reserved for messages containing schema definitions
+SCHEMA_DEFINITION_ID : int = 0
+
+# Errors of decoding received data
+# (invalid schema definitions or data-content sent by a peer)
+DECODE_ERRORS : tuple = (ValueError, TypeError, KeyError, IndexError, struct.error)
+
+
+# Register Schema
+# ------------------------------
+def register_schema(schema : CommSchema) -> None:
+    """
+    Register a Communication Schema in the process-wide Schema Registry
+    The schema (and the dataclass types of its decode plan) can be looked up by
+    Schema ID. A schema of a redefined class (same name and layout) replaces the previous
+    :param schema : Communication Schema
+    """
+
+    # Check for reserved Schema ID
+    if schema.schema_id == SCHEMA_DEFINITION_ID:
+        raise ValueError('register_schema: ERROR - Schema ID of {%r} is reserved' %schema)
+
+    # Check for Schema ID collision
+    # (different layout with same Schema ID)
+    _registered = SCHEMA_REGISTRY.get(schema.schema_id)
+    if (_registered is not None) and (_registered.data_type.__name__, *_registered._key[1:]) != (schema.data_type.__name__, *schema._key[1:]):
+        raise ValueError('register_schema: ERROR - Schema ID of {%r} collides with {%r}' %(schema, _registered))
+
+    # Register schema
+    SCHEMA_REGISTRY[schema.schema_id] = schema
+
+    # Register dataclass types of the decode plan
+    _register_types(schema.decode_plan)
+
+
+# Unregister Schema
+# ------------------------------
+def unregister_schema(schema : CommSchema) -> None:
+    """
+    Remove a Communication Schema from the process-wide Schema Registry
+    (only if registered, a schema of a redefined class is kept)
+    :param schema : Communication Schema
+    """
+    if SCHEMA_REGISTRY.get(schema.schema_id) is schema:
+        del SCHEMA_REGISTRY[schema.schema_id]
+
+
+# Register Types
+# ------------------------------
+def _register_types(plan : tuple) -> None:
+    """
+    Register the dataclass types of a decode plan (by class name)
+    :param plan : Decode plan (dataclass type, item plans)
+    """
+    _data_type, _items = plan
+    _REGISTERED_TYPES[_data_type.__name__] = _data_type
+    for kind, start, item, name in _items:
+        if kind is None:
+            _register_types(item)
+
+
+# Get Registered Schema
+# ------------------------------
+def get_registered_schema(schema_id : int):
+    """
+    Get a Communication Schema from the process-wide Schema Registry
+    :param schema_id : Schema ID (int)
+    :return schema : Communication Schema (None if not registered)
+    """
+    return SCHEMA_REGISTRY.get(schema_id)
+
+
+# Get Schema Definition
+# ------------------------------
+def get_definition(schema : CommSchema) -> dict:
+    """
+    Get the definition of a Communication Schema
+    The definition contains everything needed to rebuild the schema on a peer
+    (dataclass types are referred to by class name)
+    :param schema : Communication Schema
+    :return definition : Schema definition (dict, JSON serializable)
+    """
+    return {'id' : schema.schema_id, 'codes' : list(schema.codes), 'paths' : list(schema.paths),
+            'kinds' : list(schema.kinds), 'shape' : list(schema.shape), 'capacities' : list(schema.capacities),
+            'plan' : _plan_to_definition(schema.decode_plan)}
+
+
+# Decode Plan to Definition
+# ------------------------------
+def _plan_to_definition(plan : tuple) -> list:
+    """
+    Convert a decode plan to a definition (dataclass types referred to by class name)
+    :param plan : Decode plan (dataclass type, item plans)
+    :return definition : Decode plan definition (list)
+    """
+    _data_type, _items = plan
+    return [_data_type.__name__, [[kind, start, _plan_to_definition(item) if kind is None else item, name]
+                                  for kind, start, item, name in _items]]
+
+
+# Definition to Decode Plan
+# ------------------------------
+def _definition_to_plan(definition : list) -> tuple:
+    """
+    Convert a decode plan definition to a decode plan
+    Dataclass types are resolved by class name from the registered types (the fields
+    of the registered type need to match the definition), unknown dataclass types are
+    created from the field names of the definition (at most MAX_DEFINITION_TYPES)
+    :param definition : Decode plan definition (list)
+    :return plan : Decode plan (dataclass type, item plans)
+    """
+
+    _type_name, _items = definition
+    _items = tuple((kind, start, _definition_to_plan(item) if kind is None else item, name)
+                   for kind, start, item, name in _items)
+    _names = tuple(name for kind, start, item, name in _items)
+
+    # Resolve dataclass type by class name
+    # (field names and order of the registered type need to match the definition)
+    _data_type = _REGISTERED_TYPES.get(_type_name)
+    if (_data_type is not None) and (tuple(field.name for field in fields(_data_type)) != _names):
+        raise ValueError('schema_from_definition: ERROR - Fields of {%s} do NOT match definition' %_type_name)
+
+    # Unknown dataclass type
+    # (create a dataclass with the field names of the definition)
+    if _data_type is None:
+        if len(_DEFINITION_TYPES) >= MAX_DEFINITION_TYPES:
+            raise ValueError('schema_from_definition: ERROR - Too many dataclass types created from definitions')
+        _data_type = make_dataclass(_type_name, _names)
+        _REGISTERED_TYPES[_type_name] = _data_type
+        _DEFINITION_TYPES.add(_type_name)
+
+    # Function return
+    return _data_type, _items
+
+
+# Maximum length of a string or sequence in a schema definition
+# (a datagram can not hold more bytes)
+MAX_DEFINITION_LENGTH : int = 65535
+
+# Maximum number of schemas registered, and dataclass types created, from definitions
+# (definitions are sent by peers, the Schema Registry is not grown without bound)
+MAX_DEFINITIONS : int = 1024
+MAX_DEFINITION_TYPES : int = 1024
+_DEFINITION_IDS : set = set()
+_DEFINITION_TYPES : set = set()
+
+# Byte Format-Codes of the values in a schema definition
+_DEFINITION_VALUE_CODES : frozenset = CommToolbox.ARRAY_ELEMENT_CODES | {CommToolbox.COMM_CONST.CHAR}
+
+
+# Check Name
+# ------------------------------
+def _check_name(name) -> None:
+    """
+    Check that a name of a schema definition is a Python identifier
+    (not a keyword, and not a special "__name__")
+    :param name : Class name or field name
+    """
+    if (type(name) is not str) or (not name.isidentifier()) or keyword.iskeyword(name) or name.startswith('__'):
+        raise ValueError('check_definition: ERROR - Name {%r} is NOT an identifier' %(name,))
+
+
+# Check Length
+# ------------------------------
+def _check_length(length, minimum : int = 0) -> None:
+    """
+    Check that a length or capacity of a schema definition is in range
+    :param length : Length or capacity
+    :param minimum : Minimum length (int)
+    """
+    if (type(length) is not int) or not (minimum <= length <= MAX_DEFINITION_LENGTH):
+        raise ValueError('check_definition: ERROR - Length {%r} is out of range' %(length,))
+
+
+# Check Definition
+# ------------------------------
+def check_definition(definition) -> None:
+    """
+    Check a schema definition (e.g. received from a peer) before it is rebuilt
+    Class names and field names need to be Python identifiers. Leaf-kinds, Format-Codes,
+    lengths and capacities need to be in range, and the attribute paths, leaf-kinds and
+    flat indices need to match the decode plan (as compiled by "compile_schema")
+    :param definition : Schema definition (dict)
+    """
+
+    # Check the entries of the definition
+    if type(definition) is not dict:
+        raise ValueError('check_definition: ERROR - Definition is NOT a dictionary')
+    for key in ('id', 'codes', 'paths', 'kinds', 'shape', 'capacities', 'plan'):
+        if key not in definition:
+            raise ValueError('check_definition: ERROR - Definition has no {%s}' %key)
+        if (key != 'id') and (type(definition[key]) is not list):
+            raise ValueError('check_definition: ERROR - Definition {%s} is NOT a list' %key)
+    if type(definition['id']) is not int:
+        raise ValueError('check_definition: ERROR - Schema ID is NOT an integer')
+
+    # Check the leaf-kinds, data-shape and capacities
+    _paths, _kinds = definition['paths'], definition['kinds']
+    _shape, _capacities = definition['shape'], definition['capacities']
+    if (not _paths) or (len(_paths) != len(_kinds)):
+        raise ValueError('check_definition: ERROR - Paths do NOT match leaf-kinds')
+    for kind in _kinds:
+        if (type(kind) is not int) or not (LEAF_VALUE <= kind <= LEAF_PREFIXED_SEQUENCE):
+            raise ValueError('check_definition: ERROR - Leaf-kind {%r} is invalid' %(kind,))
+    if len(_shape) != sum(kind in VARIABLE_KINDS for kind in _kinds):
+        raise ValueError('check_definition: ERROR - Data-shape does NOT match leaf-kinds')
+    if len(_capacities) != sum((kind != LEAF_VALUE) and (kind not in VARIABLE_KINDS) for kind in _kinds):
+        raise ValueError('check_definition: ERROR - Capacities do NOT match leaf-kinds')
+    for length in _shape:
+        _check_length(length)
+    for capacity in _capacities:
+        _check_length(capacity, 1)
+
+    # Leaves of the definition
+    # (path, leaf-kind, length of sequence or capacity of declared leaf, flat index)
+    _leaves = []
+    _shape, _capacities = iter(_shape), iter(_capacities)
+    _index = 0
+    for path, kind in zip(_paths, _kinds):
+        if kind in (LEAF_VALUE, LEAF_STRING):
+            _length = 1 if kind == LEAF_VALUE else next(_shape)
+            _leaves.append((path, kind, None, _index))
+        else:
+            _length = next(_shape) if kind == LEAF_SEQUENCE else next(_capacities)
+            _leaves.append((path, kind, _length, _index))
+        _index += _get_width(kind, _length)
+
+    # Check the attribute paths, leaf-kinds and flat indices against the decode plan
+    if _leaves != _plan_definition_leaves(definition['plan'], ''):
+        raise ValueError('check_definition: ERROR - Paths do NOT match decode plan')
+
+    # Check the Format-Codes of every leaf
+    # (same codes as compiled by "_compile_fields", None: any value code)
+    _expected = []
+    for path, kind, length, index in _leaves:
+        if kind == LEAF_VALUE:
+            _expected.append(None)
+        elif kind == LEAF_STRING:
+            _expected.append(str(_get_string_length(_paths, _kinds, definition['shape'], path)) + CommToolbox.COMM_CONST.STRING)
+        elif kind in (LEAF_FIXED_STRING, LEAF_PREFIXED_STRING):
+            _expected.extend(((CommToolbox.LENGTH_PREFIX,) if kind == LEAF_PREFIXED_STRING else ())
+                             + (str(length) + CommToolbox.COMM_CONST.STRING,))
+        else:
+            _expected.extend(((CommToolbox.LENGTH_PREFIX,) if kind == LEAF_PREFIXED_SEQUENCE else ()) + (None,) * length)
+    _codes = definition['codes']
+    if len(_codes) != len(_expected):
+        raise ValueError('check_definition: ERROR - Format-Codes do NOT match leaf-kinds')
+    for code, expected in zip(_codes, _expected):
+        if (code != expected) and ((expected is not None) or (code not in _DEFINITION_VALUE_CODES)):
+            raise ValueError('check_definition: ERROR - Format-Code {%r} is invalid' %(code,))
+
+
+# String Length of Definition
+# ------------------------------
+def _get_string_length(paths : list, kinds : list, shape : list, path : str) -> int:
+    """
+    Get the length of a variable length string of a schema definition (from the data-shape)
+    :param paths : Attribute paths (list)
+    :param kinds : Leaf-kinds (list)
+    :param shape : Data-shape (list)
+    :param path : Attribute path of the string (str)
+    :return length : Length of the string (int)
+    """
+    _variable_paths = [_path for _path, kind in zip(paths, kinds) if kind in VARIABLE_KINDS]
+    return shape[_variable_paths.index(path)]
+
+
+# Leaves of Decode Plan Definition
+# ------------------------------
+def _plan_definition_leaves(definition, prefix : str) -> list:
+    """
+    Check a decode plan definition and get its leaves (see "check_definition")
+    :param definition : Decode plan definition (list)
+    :param prefix : Attribute path of the decode plan (str)
+    :return leaves : (path, leaf-kind, length or capacity, flat index) of every leaf (list)
+    """
+    if (type(definition) is not list) or (len(definition) != 2) or (type(definition[1]) is not list):
+        raise ValueError('check_definition: ERROR - Decode plan is invalid')
+    _type_name, _items = definition
+    _check_name(_type_name)
+
+    # Leaves of every item plan
+    _leaves = []
+    _names = set()
+    for item in _items:
+        if (type(item) is not list) or (len(item) != 4):
+            raise ValueError('check_definition: ERROR - Decode plan item {%r} is invalid' %(item,))
+        _kind, _start, _item, _name = item
+        _check_name(_name)
+        if _name in _names:
+            raise ValueError('check_definition: ERROR - Name {%s} is NOT unique' %_name)
+        _names.add(_name)
+
+        # Nested dataclass
+        # (starts at the flat index of its first leaf)
+        if _kind is None:
+            _sub_leaves = _plan_definition_leaves(_item, prefix + _name + '.')
+            if (not _sub_leaves) or (_start != _sub_leaves[0][3]):
+                raise ValueError('check_definition: ERROR - Decode plan item {%s} is invalid' %_name)
+            _leaves.extend(_sub_leaves)
+        else:
+            _leaves.append((prefix + _name, _kind, _item, _start))
+
+    # Function return
+    return _leaves
+
+
+# Schema from Definition
+# ------------------------------
+def schema_from_definition(definition : dict) -> CommSchema:
+    """
+    Rebuild a Communication Schema from a definition and register it
+    The definition is checked (see "check_definition"), and the Schema ID of the
+    definition needs to match the layout of the definition. Schemas rebuilt from a
+    definition never use code-generated functions (the definition can be sent by a peer)
+    :param definition : Schema definition (dict)
+    :return schema : Communication Schema
+    """
+
+    # Check the definition
+    check_definition(definition)
+
+    # Ensure Schema ID matches the definition
+    _codes, _paths, _kinds = tuple(definition['codes']), tuple(definition['paths']), tuple(definition['kinds'])
+    _shape, _capacities = tuple(definition['shape']), tuple(definition['capacities'])
+    if get_schema_id(definition['plan'][0], _codes, _paths, _kinds, _shape, _capacities) != definition['id']:
+        raise ValueError('schema_from_definition: ERROR - Schema ID does NOT match definition of {%s}' %definition['plan'][0])
+
+    # Limit the number of schemas registered from definitions
+    if (definition['id'] not in _DEFINITION_IDS) and (len(_DEFINITION_IDS) >= MAX_DEFINITIONS):
+        raise ValueError('schema_from_definition: ERROR - Too many schemas registered from definitions')
+
+    # Rebuild decode plan and schema
+    # (without code-generated functions)
+    _decode_plan = _definition_to_plan(definition['plan'])
+    schema = CommSchema(_decode_plan[0], _codes, _paths, _kinds, _shape, _capacities, _decode_plan)
+
+    # Register schema
+    register_schema(schema)
+    _DEFINITION_IDS.add(schema.schema_id)
+
+    # Function return
+    return schema
+
+
+# Pack Schema Definitions
+# ------------------------------
+def pack_definitions(schemas) -> bytes:
+    """
+    Pack the definitions of Communication Schemas to bytes (JSON)
+    Typically exchanged once between peers at startup (with Schema ID: SCHEMA_DEFINITION_ID)
+    :param schemas : Communication Schemas
+    :return packed_definitions : Packed schema definitions (bytes)
+    """
+    return json.dumps([get_definition(schema) for schema in schemas]).encode('UTF-8')
+
+
+# Register Schema Definitions
+# ------------------------------
+def register_definitions(packed_definitions) -> list:
+    """
+    Unpack schema definitions from bytes (JSON) and register the rebuilt schemas
+    :param packed_definitions : Packed schema definitions (bytes, bytearray, memoryview)
+    :return schemas : Registered Communication Schemas (list)
+    """
+    return [schema_from_definition(definition) for definition in json.loads(bytes(packed_definitions).decode('UTF-8'))]
@@ -7,6 +7,18 @@
 
 # Version
 # ------------------------------
+# 0.3   -   Updated with declared fields and
+#           schemas compiled from the class definition
+#           [16.10.2026]
+# 0.2   -   Updated with compiled Communication Schema
+#           (cached per class) for pack and unpack,
+#           with opt-in code-generated functions,
+#           pack and unpack to and from buffers
+#           and batches of records,
+#           NumPy structured dtype,
+#           Type-Map no longer stored per object,
+#           in-place decode, framing with header
+#           [16.10.2026]
 # 0.1   -   Updated with pack and unpack to 
 #           and from bytes
 #           [14.07.2022] - Jan T. Olsen 
@@ -18,30 +30,43 @@
 
 # Import packages
 from dataclasses import dataclass, field, fields, is_dataclass
+from typing import ClassVar
+import struct
 
 # Import Toolbox
 import comm_toolbox as CommToolbox
 
+# Import Class Files
+import lib.comm_schema as CommSchema
+
 # Dataclass - Generic Communication Dataclass
 @dataclass()
 class GenericCommClass():
     """
     Generic Communication Dataclass
     Acts as a Parent class for inherited Communication dataclasses
-    This dataclass contains data on the Type-Structure-Map, and functions
-    related to generating the type-map, remapping/updating the dataclass
+    This dataclass contains functions related to generating the type-map
+    and the shared Communication Schema, remapping/updating the dataclass
     attributes, finding the Byte-Conversion-Code, aswell as packing and unpacking
     the Data-Class to and from bytes (respectively)
     """
 
-    # Dataclass Type-Map
-    type_map : CommToolbox.TypeMap = field(init=False, default_factory=CommToolbox.TypeMap, repr=False)
+    # Code-generated pack, unpack and remap functions
+    # (opt-in per class, see "CommSchema.generate_codec")
+    comm_codegen : ClassVar[bool] = False
 
-    # Post Initialization
+    # Dataclass Type-Map
     # ------------------------------
-    def __post_init__(self):
-        # Get and Assign Class Type-Map using "get_map"-function
-        self.type_map = self.get_typemap()
+    @property
+    def type_map(self) -> CommToolbox.TypeMap:
+        """
+        Dataclass Type-Map
+        Type-Map is built once per class and layout (used by the generic remap),
+        and cached with the Communication Schemas of the class (see "CommSchema.get_type_map").
+        The shared Type-Map holds no reference to the dataclass object (see "get_typemap")
+        :return TypeMap : Dataclass Type-Map (shared)
+        """
+        return CommSchema.get_type_map(self)
 
     # Get Type-Map
     # ------------------------------
@@ -79,7 +104,7 @@ class GenericCommClass():
             # ------------------------------ 
             elif is_dataclass(_field_data):
                 # Get Type-Map of Dataclass
-                _field_map = _field_data.type_map
+                _field_map = _field_data.get_typemap()
 
                 # Create a data-tuple on current field 
                 _item_tuple = (_field_map, _field_length)
@@ -125,9 +150,130 @@ class GenericCommClass():
         # Function return
         return type_map
 
+    # Get Schema
+    # ------------------------------
+    def get_schema(self) -> CommSchema.CommSchema:
+        """
+        Get Communication Schema
+        The schema is compiled once per dataclass and data-shape
+        (string and list lengths) and cached on the class.
+        Declared fields (fixed-capacity and length-prefixed, see "CommToolbox.FixedString")
+        are not part of the data-shape
+        :param self : Dataclass object
+        :return schema : Compiled Communication Schema
+        """
+        return CommSchema.get_schema(self)
+
+    # Compile Schema
+    # ------------------------------
+    @classmethod
+    def compile_schema(cls) -> CommSchema.CommSchema:
+        """
+        Compile the Communication Schema from the class definition
+        Every field needs a value-independent layout, given by its annotation 
+        (bool, int, float, nested dataclass) or a declaration in the annotation metadata 
+        (e.g. engelsk_mil : Annotated[int, COMM_CONST.DINT]). Typically called once 
+        at import time, the schema is then shared by every object of the class
+        :return schema : Compiled Communication Schema
+        """
+        return CommSchema.get_class_schema(cls)
+
+    # Get Schema by Conversion-Code
+    # ------------------------------
+    def get_schema_by_code(self, conversion_code : str):
+        """
+        Get the Communication Schema of the dataclass matching a conversion-code
+        Uses a previously compiled schema of the class, or compiles the schema
+        of the dataclass if its conversion-code matches
+        :param conversion_code : Byte-Conversion-Code (str)
+        :return schema : Compiled Communication Schema (None if not matching)
+        """
+
+        # Get the compiled schema matching the conversion-code
+        schema = CommSchema.get_schema_by_code(type(self), conversion_code)
+
+        # Conversion-Code has not been compiled for the dataclass
+        # (compile the schema of the dataclass and compare conversion-codes)
+        if schema is None:
+            try:
+                schema = self.get_schema()
+
+            # Unsupported data-shape (nested sequences)
+            except TypeError:
+                return None
+
+            # Conversion-Code does not match the dataclass
+            if schema.conversion_code != conversion_code:
+                return None
+
+        # Function return
+        return schema
+
+    # Decode Fields
+    # ------------------------------
+    def decode_fields(self, schema : CommSchema.CommSchema, indata, in_place : bool = False) -> None:
+        """
+        Decode flat-structured data to the fields of the dataclass
+        Default: New (nested) dataclass objects are created using the decode plan of the
+        schema, and assigned to the fields of the dataclass.
+        In-place: Values are written directly into the existing object-tree, list fields 
+        are updated in-place and no new dataclass objects are created (no allocation
+        besides the unpacked data). Falls back to default if the data-shape of the 
+        dataclass does not match the schema
+        :param schema : Communication Schema of the flat-structured data
+        :param indata : Flat-structured data
+        :param in_place : Write values directly into the existing object-tree (bool)
+        """
+
+        # Decode in-place
+        # (data-shape of the dataclass needs to match the schema)
+        if in_place and (schema.get_shape(self) == schema.shape):
+            try:
+                schema.assign(self, indata)
+                return
+
+            # Field can not be updated in-place (e.g. tuple)
+            except TypeError:
+                pass
+
+        # Remap Dataclass using the decode plan of the schema
+        self.update_fields(schema.remap(indata))
+
+    # Update Fields
+    # ------------------------------
+    def update_fields(self, indata) -> None:
+        """
+        Update the fields of the dataclass with the fields of another dataclass object
+        :param indata : Dataclass object of same type
+        """
+        for field in fields(self):
+            setattr(self, field.name, getattr(indata, field.name))
+
     # Get Byte Conversion Code
     # ------------------------------
     def get_byte_conversion(self) -> str:
+        """
+        Find the Byte Conversion-Code of the dataclass
+        Uses the compiled Communication Schema of the dataclass
+        (falls back to the generic field walk for unsupported data-shapes)
+        :param self: Dataclass object
+        :return conversion_code: Byte Conversion-Code of dataclass (str)
+        """
+
+        # Get the compiled schema of the dataclass
+        try:
+            schema = self.get_schema()
+
+        # Unsupported data-shape (nested sequences)
+        except TypeError:
+            return self.get_byte_conversion_generic()
+
+        # Function return
+        return schema.conversion_code
+
+    # Get Byte Conversion Code (Generic)
+    # ------------------------------
+    def get_byte_conversion_generic(self) -> str:
         """
         Find the Byte Conversion-Code of the dataclass
         Searches through the attributes and uses the 
@@ -158,8 +304,8 @@ class GenericCommClass():
             # Field-data is a dataclass
             # ------------------------------ 
             elif is_dataclass(_field_data):
-                # Call "pack_to_bytes"-function of the Field-data dataclass
-                field_conversion_code = _field_data.get_byte_conversion()
+                # Call "get_byte_conversion"-function of the Field-data dataclass
+                field_conversion_code = _field_data.get_byte_conversion_generic()
                 
                 # Update ConversionCode with data from current field-dataclass 
                 conversion_code += field_conversion_code
@@ -189,45 +335,50 @@ class GenericCommClass():
         :return self : Updated Dataclass Object 
         """
 
+        # Remap dataclass from the start of the flat structured data
+        _new_dataclass, _index = self.remap_dataclass_at(indata, 0)
+
+        # Function return
+        return _new_dataclass
+
+    # Remap Dataclass at Offset
+    # ------------------------------
+    def remap_dataclass_at(self, indata, index : int = 0, type_map : CommToolbox.TypeMap = None) -> tuple[object, int]:
+        """
+        Remap dataclass at Offset
+        Incomming flat structured data is read from the given offset together
+        with the dataclass Type-Map to update and remap the attributes of
+        the governing dataclass. Nested dataclasses are remapped at their own offset
+        of the same flat structured data (no sub-lists of the data are created)
+        with the nested Type-Map (the Type-Map is looked up once)
+        :param indata : Flat structured data to update the class
+        :param index : Offset of the dataclass in the flat structured data (int)
+        :param type_map : Type-Map of the dataclass (default: shared Type-Map of the dataclass)
+        :return self : Updated Dataclass Object 
+        :return index : Offset after the dataclass in the flat structured data (int)
+        """
+
         # Define and assign values to local variables based on Type-Map
+        _type_map = self.type_map if type_map is None else type_map
         _data_list = []
-        _new_dataclass = self.type_map.type 
-        _index = 0  # Loop-index
-        _size = self.type_map.size
+        _new_dataclass = _type_map.type 
+        _index = index  # Loop-index
 
         # Iterate through Map-Items
-        # (Map-Items is defined as a list)
-        for item in self.type_map.items:
+        # (Map-Items is defined as a list, in the order of the fields)
+        for field, item in zip(fields(self), _type_map.items):
 
             _item_type = item[0]    # First entry equals the Type
             _item_len = item[1]     # Second entry equals the length of the Type
-            _item_list = []         # Define a Item-list
 
             # Item is a Type-Map
             # ------------------------------
             # (Nested dataclasses)
             if type(_item_type) is CommToolbox.TypeMap:
 
-                # Assign Sub-Values from Item Type-Map
-                _sub_typemap = _item_type
-                _sub_data = _sub_typemap.data
-                _sub_type = _sub_typemap.type
-                _sub_items = _sub_typemap.items
-                _sub_items_size = _sub_typemap.size
-                _sub_indata = []
-
-                # Calculate Sub-Indata
-                # ------------------------------
-                # Original Indata is related to the base TypeMap
-                # a Sub-Indata needs to be calculated to match the Sub-TypeMap
-                for i in range(_index, _index + _sub_items_size):
-                    _sub_indata.append(indata[i])
-
-                # Call remap for Sub-Dataclass
-                _sub_dataclass = _sub_data.remap_dataclass(_sub_indata)
-
-                # Update loop-index
-                _index += _sub_items_size
+                # Call remap for Sub-Dataclass at current loop-index
+                # (loop-index is updated to the offset after the Sub-Dataclass)
+                _sub_dataclass, _index = getattr(self, field.name).remap_dataclass_at(indata, _index, _item_type)
 
                 # Append Sub-Dataclass to data-list
                 _data_list.append(_sub_dataclass)
@@ -236,16 +387,11 @@ class GenericCommClass():
             # ------------------------------ 
             # (list, tuple, etc.)
             elif (_item_type is tuple) or (_item_type is list):
-                # Iterate through the length of the Item
-                for i in range(_item_len):
-                    # Append in-data at index to item-list
-                    _item_list.append(indata[_index])
+                # Append in-data of the length of the Item to data-list
+                _data_list.append(list(indata[_index:_index + _item_len]))
 
-                    # Update loop-index
-                    _index += 1
-                
-                # Append item-list to data-list
-                _data_list.append(_item_list)
+                # Update loop-index
+                _index += _item_len
 
             # Item is a Primitive-Type 
             # ------------------------------ 
@@ -264,29 +410,40 @@ class GenericCommClass():
 
         # Convert and Update Dataclass
         # ------------------------------
-        _data_tuple = tuple(_data_list)                 # Convert data-list to a tuple (easier to apply entries for a dataclass)
-        _new_dataclass = _new_dataclass(*_data_tuple)   # Unpack tuple to new dataclass
+        _new_dataclass = _new_dataclass(*_data_list)   # Unpack data-list to new dataclass
 
-        # Update data-class with local defined variable
-
-        # Iterate through the fields of the original dataclass
-        for field in fields(self):
-            # Get the name of current field
-            _field_name = field.name
-            
-            # Check if New-Dataclass has the field-name of the original dataclass
-            if hasattr(_new_dataclass, _field_name):
-                # Get field attribute of the related field-name of the New-Dataclass 
-                _field_data = _new_dataclass.__getattribute__(_field_name)
-                # Assign attribute from the New-Dataclass to the original dataclass
-                setattr(self, _field_name, _field_data)
+        # Update data-class with the fields of the new dataclass
+        self.update_fields(_new_dataclass)
 
         # Function return
-        return _new_dataclass
+        return _new_dataclass, _index
 
     # Pack Dataclass to Bytes
     # ------------------------------
     def pack_to_bytes(self) -> tuple[bytes, str]:
+        """
+        Pack the Dataclass to Bytes
+        Uses the compiled Communication Schema of the dataclass, packing
+        every field with a single call to the precompiled struct
+        (falls back to the generic field walk for unsupported data-shapes)
+        :return packed_dataclass: Packed Dataclass data (bytes)
+        :return conversion_code: Dataclass Conversion-Code (str)
+        """
+
+        # Get the compiled schema of the dataclass
+        try:
+            schema = self.get_schema()
+
+        # Unsupported data-shape (nested sequences)
+        except TypeError:
+            return self.pack_to_bytes_generic()
+
+        # Function return
+        return schema.pack(self), schema.conversion_code
+
+    # Pack Dataclass to Bytes (Generic)
+    # ------------------------------
+    def pack_to_bytes_generic(self) -> tuple[bytes, str]:
         """
         Pack the Dataclass to Bytes
         Get data entries from dataclass and pack them to bytes with correct 
@@ -318,7 +475,7 @@ class GenericCommClass():
             # ------------------------------ 
             elif is_dataclass(_field_data):
                 # Call "pack_to_bytes"-function of the Field-data dataclass
-                field_packed_data, field_conversion_code = _field_data.pack_to_bytes()
+                field_packed_data, field_conversion_code = _field_data.pack_to_bytes_generic()
                 
                 # Update Packed Dataclass and ConversionCode with data from current field-dataclass 
                 packed_dataclass += field_packed_data
@@ -341,7 +498,44 @@ class GenericCommClass():
 
     # Remap Dataclass from Bytes
     # ------------------------------
-    def remap_from_bytes(self, packed_dataclass : bytes, conversion_code : str):
+    def remap_from_bytes(self, packed_dataclass : bytes, conversion_code : str, in_place : bool = False):
+        """
+        Remap Dataclass from Bytes
+        Uses a previously compiled Communication Schema matching the conversion-code
+        to unpack and remap the dataclass (falls back to the generic remap if the
+        conversion-code has not been compiled for the dataclass)
+        :param packed_dataclass : Packed Dataclass (bytes)
+        :param conversion_code : Byte-Conversion-Code (str)
+        :param in_place : Write values directly into the existing object-tree (see "decode_fields")
+        :return self : Updated Dataclass Object 
+        :return unpacked_dataclass : Unpacked Dataclass Object (flat-structured) 
+        """
+
+        # Get the compiled schema matching the conversion-code
+        schema = self.get_schema_by_code(conversion_code)
+
+        # Conversion-Code does not match the dataclass
+        if schema is None:
+            return self.remap_from_bytes_generic(packed_dataclass, conversion_code)
+
+        # Unpack Dataclass from bytes
+        # (this will create "flat-structured"-data of the dataclass attributes)
+        unpacked_dataclass = schema.unpack(packed_dataclass)
+
+        # Remap Dataclass using the schema
+        self.decode_fields(schema, unpacked_dataclass, in_place)
+
+        # Unpacked data with a single entry is returned as the entry
+        # (same as "CommToolbox.unpack_from_bytes")
+        if len(unpacked_dataclass) == 1:
+            unpacked_dataclass = unpacked_dataclass[0]
+
+        # Function return
+        return unpacked_dataclass
+
+    # Remap Dataclass from Bytes (Generic)
+    # ------------------------------
+    def remap_from_bytes_generic(self, packed_dataclass : bytes, conversion_code : str):
         """
         Remap Dataclass from Bytes
         Packed-dataclass (bytes) is used together with the conversion-code 
@@ -360,4 +554,185 @@ class GenericCommClass():
         self.remap_dataclass(unpacked_dataclass)
 
         # Function return
-        return unpacked_dataclass
\ No newline at end of file
+        return unpacked_dataclass
+
+    # Pack Dataclass into Buffer
+    # ------------------------------
+    def pack_into(self, buffer, offset : int = 0) -> int:
+        """
+        Pack the Dataclass into a preallocated Buffer
+        Packed-data is written directly into the buffer (bytearray, memoryview)
+        at the given offset, without creating intermediate bytes-objects
+        (a sender can reuse the same send-buffer for every message)
+        :param buffer : Writable buffer (bytearray, memoryview)
+        :param offset : Offset in the buffer (int)
+        :return size : Number of packed bytes (int)
+        """
+
+        # Get the compiled schema of the dataclass
+        try:
+            schema = self.get_schema()
+
+        # Unsupported data-shape (nested sequences)
+        # (pack using the generic field walk and copy into the buffer)
+        except TypeError:
+            packed_dataclass, conversion_code = self.pack_to_bytes_generic()
+            buffer[offset:offset + len(packed_dataclass)] = packed_dataclass
+            return len(packed_dataclass)
+
+        # Pack Dataclass into buffer
+        schema.pack_into(self, buffer, offset)
+
+        # Function return
+        return schema.size
+
+    # Unpack Dataclass from Buffer
+    # ------------------------------
+    def unpack_from(self, buffer, offset : int = 0, conversion_code : str = None, in_place : bool = False) -> int:
+        """
+        Unpack the Dataclass from a Buffer
+        Packed-data is decoded directly from the buffer (bytes, bytearray, memoryview)
+        at the given offset, (e.g. the buffer of a "recv_into"-call) and used
+        to update the attributes of the governing dataclass
+        :param buffer : Readable buffer (bytes, bytearray, memoryview)
+        :param offset : Offset in the buffer (int)
+        :param conversion_code : Byte-Conversion-Code (str) (default: Conversion-Code of the dataclass)
+        :param in_place : Write values directly into the existing object-tree (see "decode_fields")
+        :return size : Number of unpacked bytes (int)
+        """
+
+        # Get the compiled schema of the dataclass
+        if conversion_code is None:
+            schema = self.get_schema()
+        # Get the compiled schema matching the conversion-code
+        else:
+            schema = self.get_schema_by_code(conversion_code)
+
+        # Conversion-Code does not match the dataclass
+        # (copy the packed data from the buffer and use the generic remap)
+        if schema is None:
+            _size = struct.calcsize(CommToolbox.COMM_CONST.Network + conversion_code)
+            self.remap_from_bytes_generic(bytes(buffer[offset:offset + _size]), conversion_code)
+            return _size
+
+        # Unpack and remap Dataclass from buffer
+        self.decode_fields(schema, schema.unpack_from(buffer, offset), in_place)
+
+        # Function return
+        return schema.size
+
+    # Pack Dataclass to Frame
+    # ------------------------------
+    def pack_frame(self, type_id : int, sequence : int = 0) -> bytearray:
+        """
+        Pack the Dataclass to a Frame
+        The frame consists of the binary Communication Header (with type-id, sequence
+        number, content length and schema-id of the dataclass) followed by the packed dataclass
+        :param type_id : Sender type (Server, GUI, Matlab, etc) (int)
+        :param sequence : Sequence number of the message (int)
+        :return frame : Packed header and dataclass (bytearray)
+        """
+
+        # Get the compiled schema of the dataclass
+        schema = self.get_schema()
+
+        # Pack header and dataclass into a single buffer
+        frame = bytearray(CommToolbox.HEADER_SIZE + schema.size)
+        CommToolbox.pack_header_into(frame, 0, type_id, schema.size, sequence, schema.schema_id)
+        schema.pack_into(self, frame, CommToolbox.HEADER_SIZE)
+
+        # Function return
+        return frame
+
+    # Pack Batch to Bytes
+    # ------------------------------
+    @classmethod
+    def pack_batch(cls, items) -> tuple[bytes, str]:
+        """
+        Pack a Batch of Dataclasses to Bytes
+        Every dataclass is packed as a record with the same (repeated) layout
+        into a single contiguous buffer
+        :param items : Sequence of dataclass objects (same type and data-shape)
+        :return packed_batch : Packed records (bytes)
+        :return conversion_code : Conversion-Code of a single record (str)
+        """
+
+        # Check for empty batch
+        if not items:
+            raise ValueError('pack_batch: ERROR - Batch is empty')
+
+        # Get the compiled schema of the first dataclass
+        schema = items[0].get_schema()
+
+        # Function return
+        return schema.pack_batch(items), schema.conversion_code
+
+    # Iterate Unpack Batch from Bytes
+    # ------------------------------
+    def iter_unpack_batch(self, packed_batch, conversion_code : str = None):
+        """
+        Iterate Unpack Batch from Bytes
+        Records of a packed batch are decoded one at a time (streaming) into new
+        dataclass objects, the governing dataclass is used as template of the layout
+        :param packed_batch : Packed records (bytes, bytearray, memoryview)
+        :param conversion_code : Conversion-Code of a single record (str) (default: Conversion-Code of the dataclass)
+        :return data : Iterator of new dataclass objects
+        """
+
+        # Get the compiled schema of the dataclass
+        if conversion_code is None:
+            schema = self.get_schema()
+        # Get the compiled schema matching the conversion-code
+        else:
+            schema = self.get_schema_by_code(conversion_code)
+
+        # Conversion-Code does not match the dataclass
+        if schema is None:
+            raise ValueError('iter_unpack_batch: ERROR - Conversion-Code {%s} does NOT match dataclass' %conversion_code)
+
+        # Function return
+        return schema.iter_remap(packed_batch)
+
+    # Get NumPy dtype
+    # ------------------------------
+    def to_numpy_dtype(self):
+        """
+        Get NumPy structured dtype
+        Structured dtype matching the packed layout of the dataclass
+        (nested dataclasses become nested fields, lists become sub-arrays)
+        Note: Requires NumPy
+        :return dtype : NumPy structured dtype (numpy.dtype)
+        """
+        return CommSchema.get_numpy_dtype(self.get_schema())
+
+    # Unpack Batch to NumPy array
+    # ------------------------------
+    def unpack_batch_numpy(self, packed_batch, conversion_code : str = None):
+        """
+        Unpack Batch to NumPy array
+        Records of a packed batch are decoded in a single vectorized call
+        ("numpy.frombuffer", no copy of the buffer) to a structured array
+        Note: Requires NumPy
+        :param packed_batch : Packed records (bytes, bytearray, memoryview)
+        :param conversion_code : Conversion-Code of a single record (str) (default: Conversion-Code of the dataclass)
+        :return array : NumPy structured array of the records (numpy.ndarray)
+        """
+
+        # Get the compiled schema of the dataclass
+        if conversion_code is None:
+            schema = self.get_schema()
+        # Get the compiled schema matching the conversion-code
+        else:
+            schema = self.get_schema_by_code(conversion_code)
+
+        # Conversion-Code does not match the dataclass
+        if schema is None:
+            raise ValueError('unpack_batch_numpy: ERROR - Conversion-Code {%s} does NOT match dataclass' %conversion_code)
+
+        # Get NumPy dtype of the schema
+        # (NumPy is an optional dependency, checked by "get_numpy_dtype")
+        _dtype = CommSchema.get_numpy_dtype(schema)
+        import numpy
+
+        # Function return
+        return numpy.frombuffer(packed_batch, dtype=_dtype)
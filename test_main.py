@@ -10,14 +10,35 @@
 
 # Import packages
 from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Annotated, ClassVar
+import asyncio
+import contextlib
+import io
+import json
+import logging
 import pickle
+import socket
+import struct
+import threading
+import time
 
 # Import Toolbox
 import comm_toolbox as CommToolbox
 
 # Import Class Files
+import benchmark_codec
+import benchmark_latency
+import lib.comm_schema as CommSchema
 from lib.generic_commdata import GenericCommClass
-from comm_data import TestClass1
+from comm_data import AxisData, TestClass1
+from lib.comm_metrics import CommMetrics, Histogram
+from lib.comm_reactor import CommReactor
+from udp_async import AsyncUDPClient, AsyncUDPCommunication
+from udp_client import UDPClient
+from udp_communication import UDPCommunication
+from udp_publisher import UDPPublisher
+from udp_pipeline import BLOCK, DROP_NEWEST, DROP_OLDEST, BoundedRing, UDPPipeline
+from udp_workers import UDPWorkerServer
 
 @dataclass
 class TestClass2(GenericCommClass):
@@ -38,6 +59,37 @@ class TestClass6(GenericCommClass):
     class3 : TestClass3
     class1 : TestClass1
 
+@dataclass
+class TestClass7(TestClass6):
+    comm_codegen : ClassVar[bool] = True
+
+@dataclass
+class TestClass8(GenericCommClass):
+    name : Annotated[str, CommToolbox.FixedString(8)] = 'olsen'
+    tag : Annotated[str, CommToolbox.PrefixedString(8)] = ''
+    lista_mi : Annotated[list, CommToolbox.FixedArray(CommToolbox.COMM_CONST.FLOAT, 4)] = field(default_factory=list)
+    lista_var : Annotated[list, CommToolbox.PrefixedArray(CommToolbox.COMM_CONST.DINT, 4)] = field(default_factory=list)
+
+@dataclass
+class TestClass14(TestClass8):
+    comm_codegen : ClassVar[bool] = True
+
+@dataclass
+class TestClass15(GenericCommClass):
+    a : Annotated[list, CommToolbox.PrefixedArray(CommToolbox.COMM_CONST.DINT, 2)] = field(default_factory=list)
+    b : int = 0
+    c : int = 0
+
+@dataclass
+class TestClass16(TestClass15):
+    comm_codegen : ClassVar[bool] = True
+
+@dataclass
+class TestClass9(GenericCommClass):
+    nautisk_mil : Annotated[float, CommToolbox.COMM_CONST.DOUBLE] = 1.852
+    engelsk_mil : Annotated[int, CommToolbox.COMM_CONST.DINT] = 1609
+    teller : Annotated[int, CommToolbox.COMM_CONST.UDINT] = 0
+    class1 : TestClass1 = field(default_factory=TestClass1)
     
 
 def test():
@@ -258,6 +310,1208 @@ def test3():
     print('---------------------')
     print('\n')
 
+def test4():
+    # ------------------------------
+    testClass1 = TestClass1()
+    testClass2 = TestClass2(lista_mi=[1.852, 77.0, 995.0])
+    testClass3 = TestClass3(testClass1, testClass2)
+    testClass6 = TestClass6(0.909, testClass3, testClass1)
+
+    # ------------------------------
+    new_data_1 = TestClass1(456.675, 995)
+    new_data_2 = TestClass2('jens', 35, 1.92, [99.0, 88.0, 77.0])
+    new_data_3 = TestClass3(new_data_1, new_data_2)
+    new_data_6 = TestClass6(808.8, new_data_3, new_data_1)
+    # ------------------------------
+
+    data = testClass6
+    new_data = new_data_6
+
+    # ------------------------------
+    print('\n')
+    print(' Compiled Schema ')
+    print('---------------------')
+    schema = new_data.get_schema()
+    print(schema)
+    print(schema.paths)
+    print('---------------------')
+    print('\n')
+
+    # Schema is compiled once per class and data-shape
+    assert schema is new_data.get_schema()
+    assert schema is not data.get_schema()
+
+    # ------------------------------
+    print(' Compiled vs. Generic Packing ')
+    print('---------------------')
+    packed_dataclass, conversion_code = new_data.pack_to_bytes()
+    packed_generic, conversion_code_generic = new_data.pack_to_bytes_generic()
+    print(packed_dataclass)
+    print(packed_generic)
+    print('---------------------')
+    print('\n')
+
+    assert packed_dataclass == packed_generic
+    assert conversion_code == conversion_code_generic
+
+    # ------------------------------
+    print(' Compiled vs. Generic Remap ')
+    print('---------------------')
+    unpacked_data = data.remap_from_bytes(packed_dataclass, conversion_code)
+    unpacked_generic = TestClass6(0.0, TestClass3(TestClass1(), TestClass2(lista_mi=[0.0, 0.0, 0.0])), TestClass1()).remap_from_bytes_generic(packed_dataclass, conversion_code)
+    print(unpacked_data)
+    print(unpacked_generic)
+    print(data)
+    print('---------------------')
+    print('\n')
+
+    assert unpacked_data == unpacked_generic
+    assert data.class3.class2.name == 'jens'
+
+    # Type-Map is built once per class and layout
+    assert data.type_map is new_data.type_map
+
+    # Schema is compiled per layout (value types of undeclared fields)
+    int_data = TestClass2('jens', 35, 1.92, [1, 2])
+    float_data = TestClass2('jens', 35.5, 1.92, [1.5, 2.5])
+    assert int_data.get_schema() is not float_data.get_schema()
+    assert float_data.pack_to_bytes() == float_data.pack_to_bytes_generic()
+    assert int_data.pack_to_bytes() == int_data.pack_to_bytes_generic()
+
+def test5():
+    # ------------------------------
+    new_data_1 = TestClass1(456.675, 995)
+    new_data_2 = TestClass2('jens', 35, 1.92, [99.0, 88.0, 77.0])
+    new_data_3 = TestClass3(new_data_1, new_data_2)
+    new_data_7 = TestClass7(808.8, new_data_3, new_data_1)
+    # ------------------------------
+
+    data = TestClass7(0.909, TestClass3(TestClass1(), TestClass2(lista_mi=[1.852, 77.0, 995.0])), TestClass1())
+    new_data = new_data_7
+
+    # ------------------------------
+    print('\n')
+    print(' Generated Codec ')
+    print('---------------------')
+    schema = new_data.get_schema()
+    print(schema.source)
+    print('---------------------')
+    print('\n')
+
+    assert schema.is_generated
+
+    # ------------------------------
+    print(' Generated vs. Generic Packing ')
+    print('---------------------')
+    packed_dataclass, conversion_code = new_data.pack_to_bytes()
+    print(packed_dataclass)
+    print('---------------------')
+    print('\n')
+
+    assert (packed_dataclass, conversion_code) == new_data.pack_to_bytes_generic()
+
+    # ------------------------------
+    print(' Generated Remap ')
+    print('---------------------')
+    unpacked_data = data.remap_from_bytes(packed_dataclass, conversion_code)
+    print(unpacked_data)
+    print(data)
+    print('---------------------')
+    print('\n')
+
+    assert unpacked_data == CommToolbox.unpack_from_bytes(packed_dataclass, conversion_code)
+    assert data.class3.class2.lista_mi == [99.0, 88.0, 77.0]
+
+def test6():
+    # ------------------------------
+    new_data_1 = TestClass1(456.675, 995)
+    new_data_2 = TestClass2('jens', 35, 1.92, [99.0, 88.0, 77.0])
+    new_data_3 = TestClass3(new_data_1, new_data_2)
+    new_data_6 = TestClass6(808.8, new_data_3, new_data_1)
+    # ------------------------------
+
+    data = TestClass6(0.909, TestClass3(TestClass1(), TestClass2('olse', lista_mi=[1.852, 77.0, 995.0])), TestClass1())
+    new_data = new_data_6
+
+    # ------------------------------
+    print('\n')
+    print(' Pack into Buffer ')
+    print('---------------------')
+    buffer = bytearray(64)
+    size = new_data.pack_into(buffer, 8)
+    print(size)
+    print(buffer)
+    print('---------------------')
+    print('\n')
+
+    assert bytes(buffer[8:8 + size]) == new_data.pack_to_bytes()[0]
+
+    # ------------------------------
+    print(' Unpack from Buffer ')
+    print('---------------------')
+    size = data.unpack_from(memoryview(buffer), 8)
+    print(size)
+    print(data)
+    print('---------------------')
+    print('\n')
+
+    assert data.class3.class2.name == 'jens'
+    assert data.class1.engelsk_mil == 995
+
+    # ------------------------------
+    print(' Unpack from Buffer (In-Place) ')
+    print('---------------------')
+    data = TestClass6(0.909, TestClass3(TestClass1(), TestClass2('olse', lista_mi=[1.852, 77.0, 995.0])), TestClass1())
+    class2 = data.class3.class2
+    lista_mi = class2.lista_mi
+    size = data.unpack_from(buffer, 8, in_place=True)
+    print(size)
+    print(data)
+    print('---------------------')
+    print('\n')
+
+    assert data.class3.class2 is class2
+    assert data.class3.class2.lista_mi is lista_mi
+    assert lista_mi == [99.0, 88.0, 77.0]
+
+def test7():
+    # ------------------------------
+    trajectory = [TestClass1(0.5 * i, i) for i in range(1000)]
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Batch Packing ')
+    print('---------------------')
+    packed_batch, conversion_code = TestClass1.pack_batch(trajectory)
+    print(len(packed_batch))
+    print(conversion_code)
+    print('---------------------')
+    print('\n')
+
+    assert packed_batch == b''.join(item.pack_to_bytes()[0] for item in trajectory)
+
+    # ------------------------------
+    print(' Batch Unpacking ')
+    print('---------------------')
+    unpacked_batch = list(TestClass1().iter_unpack_batch(packed_batch, conversion_code))
+    print(unpacked_batch[:3])
+    print('---------------------')
+    print('\n')
+
+    assert len(unpacked_batch) == len(trajectory)
+    assert unpacked_batch[999].engelsk_mil == 999
+
+def test8():
+    # ------------------------------
+    data = TestClass8('jens', 'ab', [1.852, 77.0], [99, 88, 77])
+    new_data = TestClass8('olsen', 'abcdefgh', [], [1])
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Declared Fields ')
+    print('---------------------')
+    schema = data.get_schema()
+    print(schema)
+    print(schema.shape)
+    print('---------------------')
+    print('\n')
+
+    assert new_data.get_schema() is schema
+    assert data.get_byte_conversion() == new_data.get_byte_conversion()
+
+    # ------------------------------
+    print(' Pack and Remap ')
+    print('---------------------')
+    packed_data, conversion_code = data.pack_to_bytes()
+    new_data.remap_from_bytes(packed_data, conversion_code)
+    print(new_data)
+    print('---------------------')
+    print('\n')
+
+    assert new_data.name == 'jens'
+    assert new_data.tag == 'ab'
+    assert new_data.lista_mi == [struct.unpack('!f', struct.pack('!f', 1.852))[0], 77.0, 0.0, 0.0]
+    assert new_data.lista_var == [99, 88, 77]
+
+    try:
+        TestClass8(lista_var=[1, 2, 3, 4, 5]).pack_to_bytes()
+        assert False
+    except ValueError:
+        pass
+
+    # Fixed-capacity string keeps inner NUL-bytes,
+    # and values ending with a NUL-byte are rejected (padding)
+    for data_type in (TestClass8, TestClass14):
+        schema = data_type().get_schema()
+        assert schema.remap(schema.unpack(schema.pack(data_type('a\x00b')))).name == 'a\x00b'
+        try:
+            schema.pack(data_type('ab\x00'))
+            assert False
+        except ValueError:
+            pass
+
+    # Length-prefixes beyond the capacity are rejected when unpacking
+    # (would otherwise read the following values)
+    for data_type in (TestClass8, TestClass14):
+        packed, conversion_code = data_type(tag='ab').pack_to_bytes()
+        packed = bytearray(packed)
+        struct.pack_into('!H', packed, 8, 200)
+        try:
+            data_type().remap_from_bytes(bytes(packed), conversion_code)
+            assert False
+        except ValueError:
+            pass
+
+    for data_type in (TestClass15, TestClass16):
+        packed = bytearray(data_type([1], 7, 8).pack_to_bytes()[0])
+        assert struct.unpack_from('!H', packed)[0] == 1
+        struct.pack_into('!H', packed, 0, 4)
+        for in_place in (False, True):
+            new_data = data_type()
+            try:
+                new_data.unpack_from(packed, 0, in_place=in_place)
+                assert False
+            except ValueError:
+                pass
+            assert new_data == data_type()
+
+def test9():
+    # ------------------------------
+    schema = TestClass9.compile_schema()
+    data = TestClass9(1.852, 100000, 4000000000)
+    new_data = TestClass9()
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Class Schema ')
+    print('---------------------')
+    print(schema)
+    print('---------------------')
+    print('\n')
+
+    assert schema.conversion_code == 'diIfh'
+    assert data.get_schema() is schema
+    assert TestClass9.compile_schema() is schema
+
+    # ------------------------------
+    print(' Pack and Remap ')
+    print('---------------------')
+    packed_data, conversion_code = data.pack_to_bytes()
+    new_data.remap_from_bytes(packed_data, conversion_code)
+    print(new_data)
+    print('---------------------')
+    print('\n')
+
+    assert new_data.nautisk_mil == 1.852
+    assert new_data.engelsk_mil == 100000
+    assert new_data.teller == 4000000000
+
+    try:
+        TestClass2.compile_schema()
+        assert False
+    except TypeError:
+        pass
+
+def test10():
+
+    async def loopback():
+        # ------------------------------
+        udpComm = AsyncUDPCommunication(Port=0)
+        await udpComm.config()
+        server = asyncio.create_task(udpComm.serve())
+
+        udpClient = AsyncUDPClient(RemotePort=udpComm.port)
+        await udpClient.config()
+        # ------------------------------
+
+        # ------------------------------
+        print('\n')
+        print(' Async Send and Receive ')
+        print('---------------------')
+        for i in range(5):
+            udpClient.send(AxisData(float(i), 107.5, 0.5))
+        replies = [await udpClient.receive(1.0) for i in range(5)]
+
+        # Reply of an earlier message is queued for receive, not returned by the request
+        udpClient.send(AxisData(1.0, 107.5, 0.5))
+        reply = await udpClient.request(AxisData(45.0, 107.5, 0.5))
+        late_reply = await udpClient.receive(1.0)
+
+        # Concurrent requests receive their own replies
+        concurrent = await asyncio.gather(*[udpClient.request(AxisData(float(i), 107.5, 0.5)) for i in range(5)])
+        print(replies[-1])
+        print(reply)
+        print('---------------------')
+        print('\n')
+
+        # Invalid datagrams are counted as decode errors
+        # (truncated header, invalid definitions, truncated and invalid data-content)
+        schemaID = AxisData().get_schema().schema_id
+        for data in (bytes(4),
+                     CommToolbox.pack_header(0, 7, 0, CommSchema.SCHEMA_DEFINITION_ID) + b'[{"id":',
+                     CommToolbox.pack_header(0, 4, 0, schemaID) + bytes(4),
+                     CommToolbox.pack_header(0, TestClass8().get_schema().size, 0, TestClass8().get_schema().schema_id)
+                     + b'\xff' * TestClass8().get_schema().size):
+            udpComm.protocol.datagram_received(data, ('127.0.0.1', 0))
+
+        # Messages the server can not pack are counted as decode errors,
+        # and the server keeps serving
+        udpComm.protocol.queue.put_nowait((replies[0][0], AxisData('olsen', 107.5, 0.5), ('127.0.0.1', 0)))
+        served = await udpClient.request(AxisData(46.0, 107.5, 0.5))
+        decode_errors = udpComm.protocol.decode_errors
+
+        # Timed out requests are no longer pending
+        udpComm.close()
+        try:
+            await udpClient.request(AxisData(47.0, 107.5, 0.5), 0.05)
+            assert False
+        except asyncio.TimeoutError:
+            pass
+        pending = len(udpClient.protocol.requests)
+
+        server.cancel()
+        udpClient.close()
+        return replies, reply, late_reply, concurrent, served, decode_errors, pending
+
+    replies, reply, late_reply, concurrent, served, decode_errors, pending = asyncio.run(loopback())
+
+    assert [header.sequence for header, message, address in replies] == [0, 1, 2, 3, 4]
+    assert replies[4][1] == AxisData(4.0, 107.5, 0.5)
+    assert reply == AxisData(45.0, 107.5, 0.5)
+    assert late_reply[1] == AxisData(1.0, 107.5, 0.5)
+    assert concurrent == [AxisData(float(i), 107.5, 0.5) for i in range(5)]
+    assert served == AxisData(46.0, 107.5, 0.5)
+    assert decode_errors == 5
+    assert pending == 0
+
+def test11():
+    # ------------------------------
+    reactor = CommReactor()
+    receiver, sender = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    received = []
+    ticks = []
+    # ------------------------------
+
+    reactor.register(receiver, lambda sock: received.append(sock.recv(512)))
+    reactor.call_every(0.01, ticks.append, 1)
+    reactor.call_later(0.05, reactor.stop)
+    sender.send(b'olsen')
+    reactor.run()
+
+    # ------------------------------
+    print('\n')
+    print(' Reactor ')
+    print('---------------------')
+    print(received)
+    print(len(ticks))
+    print('---------------------')
+    print('\n')
+
+    assert received == [b'olsen']
+    assert len(ticks) >= 3
+
+    sender.close()
+    reactor.close()
+
+def test12():
+    # ------------------------------
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    pool = CommToolbox.BufferPool(4, 64)
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Receive Batch ')
+    print('---------------------')
+    for i in range(6):
+        sender.sendto(AxisData(float(i)).pack_frame(2, i), receiver.getsockname())
+    time.sleep(0.05)
+    receiver.settimeout(1.0)
+    batch = CommToolbox.recv_batch(receiver, pool)
+    sequences = [CommToolbox.unpack_header(data).sequence for data, address in batch]
+    timeout = receiver.gettimeout()
+    receiver.setblocking(False)
+    batch = CommToolbox.recv_batch(receiver, pool)
+    sequences += [CommToolbox.unpack_header(data).sequence for data, address in batch]
+    print(sequences)
+    print('---------------------')
+    print('\n')
+
+    assert sequences == [0, 1, 2, 3, 4, 5]
+    assert timeout == 1.0
+    assert type(batch[0][0]) is memoryview
+    assert CommToolbox.recv_batch(receiver, pool) == []
+
+    sender.close()
+    receiver.close()
+
+def test13():
+    # ------------------------------
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    drop_counting = CommToolbox.configure_socket(receiver, CommToolbox.LocalConfig(ReceiveBufferSize=4096))
+    receiver.bind(('127.0.0.1', 0))
+    receiver.setblocking(False)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    pool = CommToolbox.BufferPool(64, 512)
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Kernel Drops ')
+    print('---------------------')
+    for i in range(1000):
+        sender.sendto(bytes(256), receiver.getsockname())
+    while CommToolbox.recv_batch(receiver, pool, drop_counting=drop_counting):
+        pass
+    sender.sendto(bytes(256), receiver.getsockname())
+    CommToolbox.recv_batch(receiver, pool, drop_counting=drop_counting)
+    print(drop_counting)
+    print(pool.kernel_drops)
+    print('---------------------')
+    print('\n')
+
+    # Kernel drop counting is only supported on Linux
+    assert (pool.kernel_drops > 0) or not drop_counting
+
+    sender.close()
+    receiver.close()
+
+def test14():
+
+    # Rate-limited logging
+    # (records of the same message beyond the rate are suppressed, and counted)
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('test14')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    rateFilter = CommToolbox.RateLimitFilter(rate = 3, interval = 60.0)
+    logger.addFilter(rateFilter)
+
+    for i in range(10):
+        logger.debug('Packet received: %s', i)
+    logger.debug('Other message')
+
+    # Next window
+    # (number of suppressed records is added to the first record of the window)
+    record = logger.makeRecord('test14', logging.DEBUG, __file__, 0, 'Packet received: %s', (10,), None)
+    record.created += 60.0
+    logger.handle(record)
+
+    assert [record.args for record in records] == [(0,), (1,), (2,), (), (10,)]
+    assert records[-1].getMessage() == 'Packet received: 10 [7 similar messages suppressed]'
+
+    # Filter shared by several threads
+    # (every record is either emitted or counted as suppressed)
+    sharedFilter = CommToolbox.RateLimitFilter(rate = 100, interval = 60.0)
+    record = logging.LogRecord('test14', logging.DEBUG, __file__, 0, 'Shared message', (), None)
+    emitted = []
+    threads = [threading.Thread(target = lambda: emitted.append(sum(sharedFilter.filter(record) for i in range(10000)))) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record = logging.LogRecord('test14', logging.DEBUG, __file__, 0, 'Shared message', (), None)
+    record.created += 60.0
+    assert sum(emitted) == 100
+    assert sharedFilter.filter(record) and (record.getMessage() == 'Shared message [%d similar messages suppressed]' % (40000 - 100))
+
+    # Quiet endpoints do not change the level of the shared logger
+    levels = [logging.getLogger(name).level for name in ('udp_communication', 'udp_client')]
+    UDPCommunication(Port = 0, Quiet = True).serverSocket.close()
+    UDPClient(Quiet = True).clientSocket.close()
+    assert [logging.getLogger(name).level for name in ('udp_communication', 'udp_client')] == levels
+
+def test15():
+
+    # Histogram
+    # (percentiles are the upper bound of the bucket)
+    histogram = Histogram()
+    for i in range(1000):
+        histogram.record(3e-6)
+    histogram.record(0.25)
+    assert histogram.percentile(50.0) == 5e-6
+    assert histogram.percentile(99.9) == 5e-6
+    assert histogram.percentile(100.0) == 0.25
+    assert histogram.maximum == 0.25
+
+    # Counting from several threads
+    # (no lost updates, metrics are pickled without their locks)
+    metrics = CommMetrics('Threads')
+    def count():
+        for i in range(10000):
+            metrics.count_in(1, 10)
+            metrics.count('decode_errors')
+            metrics.decode_time.record(1e-6)
+    threads = [threading.Thread(target = count) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics = pickle.loads(pickle.dumps(metrics))
+    metrics.merge(metrics)
+    threadSnapshot = metrics.snapshot()
+    assert (threadSnapshot['packets_in'], threadSnapshot['bytes_in']) == (80000, 800000)
+    assert threadSnapshot['decode_errors'] == 80000
+    assert threadSnapshot['decode_time']['count'] == 80000
+
+    # Metrics of a server and client round trip
+    server = UDPCommunication(Port = 0, Quiet = True)
+    client = UDPClient(RemotePort = server.serverSocket.getsockname()[1], Quiet = True)
+    client.sendSchemas()
+    server.connect()
+    for i in range(5):
+        thread = threading.Thread(target = server.connect)
+        thread.start()
+        client.sendData()
+        thread.join()
+    server.handle_message(bytes(4), ('127.0.0.1', 0))
+
+    serverMetrics = server.metrics.snapshot()
+    clientMetrics = client.metrics.snapshot()
+    schemaID = AxisData().get_schema().schema_id
+
+    # Report
+    # ------------------------------
+    print('\n')
+    print(' Communication Metrics ')
+    print('---------------------')
+    print(serverMetrics['types'])
+    print(clientMetrics['round_trip_time'])
+    server.metrics.dump()
+    print('---------------------')
+    print('\n')
+
+    assert serverMetrics['types'][schemaID] == {'packets_in' : 5, 'bytes_in' : 5 * len(AxisData().pack_frame(0)),
+                                                'packets_out' : 5, 'bytes_out' : 5 * len(AxisData().pack_frame(0))}
+    assert serverMetrics['packets_in'] == 6
+    assert serverMetrics['decode_errors'] == 1
+    assert serverMetrics['decode_time']['count'] == 5
+    assert clientMetrics['packets_out'] == 6
+    assert clientMetrics['packets_in'] == 5
+    assert clientMetrics['round_trip_time']['count'] == 5
+    assert clientMetrics['encode_time']['count'] == 5
+    assert clientMetrics['timeouts'] == 0
+
+    # Merged metrics
+    merged = CommMetrics()
+    merged.merge(server.metrics)
+    merged.merge(server.metrics)
+    assert merged.snapshot()['packets_in'] == 12
+    assert merged.decode_time.count == 10
+
+    server.serverSocket.close()
+    client.clientSocket.close()
+
+def test16():
+
+    # Loopback round-trip benchmark
+    # (few round trips, only the results are checked)
+    results = benchmark_latency.run_benchmark(['AxisData', 'payload:64'], count = 50, warmup = 5)
+
+    # Report of the results compared to a baseline
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        benchmark_latency.report(results, baseline = results)
+    assert all(name in output.getvalue() for name in results)
+    assert output.getvalue().count('+0.0%') == 4 * len(results)
+
+    assert list(results) == ['AxisData', 'payload:64']
+    assert results['AxisData']['size'] == len(AxisData().pack_frame(0))
+    assert results['payload:64']['size'] == CommToolbox.HEADER_SIZE + 64
+    for result in results.values():
+        assert result['timeouts'] == 0
+        assert 0.0 < result['p50'] <= result['p99'] <= result['p99.9'] <= result['max']
+
+def test17():
+
+    # Codec microbenchmark
+    # (short measurements, only the results are checked)
+    results = benchmark_codec.run_benchmark(['flat', 'list'], min_time = 0.001, repeat = 1)
+
+    # Report of the results compared to a baseline
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        benchmark_codec.report(results, baseline = results)
+    assert all(name in output.getvalue() for name in results)
+    assert output.getvalue().count('+0.0%') == len(results)
+
+    for shape in ('flat', 'list'):
+        # Every path packs to the same bytes, except pickle
+        assert results[shape + '/generic/pack_to_bytes']['bytes'] == results[shape + '/compiled/pack_to_bytes']['bytes']
+        assert results[shape + '/codegen/pack_to_bytes']['bytes'] == results[shape + '/compiled/pack_to_bytes']['bytes']
+        assert results[shape + '/pickle/pack_to_bytes']['bytes'] > results[shape + '/compiled/pack_to_bytes']['bytes']
+    assert results['flat/compiled/remap']['bytes'] == len(AxisData().pack_frame(0)) - CommToolbox.HEADER_SIZE
+    assert all(result['ops'] > 0.0 for result in results.values())
+
+def test18():
+
+    # Port sharing is not supported on every platform
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        return
+
+    # Worker processes sharing a port (SO_REUSEPORT)
+    udpWorkers = UDPWorkerServer(Port = 0, Workers = 2, ReportInterval = 0.05, RestartDelay = 0.0)
+    udpWorkers.start()
+    try:
+        clients = [UDPClient(RemotePort = udpWorkers.port, Quiet = True) for i in range(4)]
+        for client in clients:
+            for i in range(5):
+                assert client.sendData() is not None
+
+        # Invalid datagrams are dropped by the workers
+        # (the workers are not restarted)
+        for client in clients:
+            client.clientSocket.sendto(bytes(4), ('127.0.0.1', udpWorkers.port))
+            assert client.sendData() is not None
+
+        # Worker is killed and restarted
+        # (metrics reported by the killed worker are kept,
+        #  the worker is killed once every handled datagram is reported)
+        deadline = time.monotonic() + 5.0
+        while (udpWorkers.metrics().snapshot()['packets_in'] < 24) and (time.monotonic() < deadline):
+            udpWorkers.supervise(0.05)
+        assert udpWorkers.metrics().snapshot()['packets_in'] == 24
+        assert udpWorkers.restarts == 0
+        udpWorkers.workers[0].kill()
+        udpWorkers.workers[0].join()
+        udpWorkers.supervise(0.1)
+        assert udpWorkers.restarts == 1
+        assert udpWorkers.workers[0].is_alive()
+
+        for client in clients:
+            for i in range(5):
+                assert client.sendData() is not None
+            client.clientSocket.close()
+    finally:
+        udpWorkers.stop()
+
+    snapshot = udpWorkers.metrics().snapshot()
+
+    assert len(udpWorkers.workerMetrics) == 3
+    assert snapshot['packets_in'] == snapshot['packets_out'] == 44
+    assert snapshot['decode_errors'] == 4
+
+def test19():
+
+    # Bounded ring, drop policies
+    ring = BoundedRing(3, DROP_OLDEST)
+    for i in range(5):
+        ring.put(i)
+    assert [ring.get(0) for i in range(3)] == [2, 3, 4]
+    ring = BoundedRing(3, DROP_NEWEST)
+    for i in range(5):
+        ring.put(i)
+    assert [ring.get(0) for i in range(3)] == [0, 1, 2]
+    assert ring.gauges()['dropped'] == 2
+
+    # Block: the producer waits for space
+    ring = BoundedRing(1, BLOCK)
+    ring.put(0)
+    producer = threading.Thread(target = ring.put, args = (1,))
+    producer.start()
+    producer.join(0.05)
+    assert producer.is_alive()
+    assert ring.get(1.0) == 0
+    producer.join(1.0)
+    assert ring.get(1.0) == 1
+
+    # Pipeline with a slow handler
+    # (the receiver keeps receiving, the oldest datagrams are dropped)
+    handled = []
+    def handler(data, remote_address):
+        time.sleep(0.02)
+        handled.append(CommToolbox.unpack_header(data).sequence)
+
+    udpPipeline = UDPPipeline(UDPCommunication(Port = 0, Quiet = True), Handler = handler, QueueSize = 4)
+    udpPipeline.start()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    for i in range(20):
+        sender.sendto(AxisData().pack_frame(0, i), ('127.0.0.1', udpPipeline.udpComm.port))
+    time.sleep(0.1)
+    udpPipeline.stop()
+    gauges = udpPipeline.gauges()
+
+    assert gauges['queued'] == 20
+    assert gauges['high_water'] == 4
+    assert gauges['dropped'] > 0
+    assert gauges['handled'] == len(handled) == 20 - gauges['dropped']
+    assert handled[-4:] == [16, 17, 18, 19]
+    assert udpPipeline.udpComm.metrics.drops == gauges['dropped']
+
+    sender.close()
+    udpPipeline.udpComm.serverSocket.close()
+
+def test20():
+
+    # Echo server replying in reverse order
+    # (the first send of sequence 3 is dropped, and replied when sent again)
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(2.0)
+    def serve():
+        received = [server.recvfrom(512) for i in range(8)]
+        for data, address in reversed(received):
+            if CommToolbox.unpack_header(data).sequence != 3:
+                server.sendto(data, address)
+        data, address = server.recvfrom(512)
+        server.sendto(data, address)
+    thread = threading.Thread(target = serve)
+    thread.start()
+
+    # Pipelined requests
+    # (replies are matched by sequence number)
+    client = UDPClient(RemotePort = server.getsockname()[1], Quiet = True, Window = 8)
+    messages = [AxisData(float(i), 2.0, 3.0) for i in range(8)]
+    futures = [client.sendRequest(message, Timeout = 0.2, Retries = 1) for message in messages]
+    replies = [future.result(2.0) for future in futures]
+    thread.join()
+    assert client.waitRequests(1.0)
+
+    # Deadline without retries
+    # (no reply, the window of the client is released)
+    start = time.perf_counter()
+    future = client.sendRequest(Timeout = 0.05)
+    try:
+        future.result(2.0)
+        timeout = False
+    except TimeoutError:
+        timeout = True
+    elapsed = time.perf_counter() - start
+    snapshot = client.metrics.snapshot()
+
+    assert replies == messages
+    assert snapshot['retransmits'] == 1
+    assert snapshot['round_trip_time']['count'] == 7
+    assert timeout and (snapshot['timeouts'] == 1)
+    assert elapsed < 1.0
+    assert not client.pending
+
+    client.close()
+    server.close()
+
+    # Blocking send
+    # (a stale reply and an invalid datagram are dropped before the reply of the message)
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(('127.0.0.1', 0))
+    server.settimeout(2.0)
+    def serve_stale():
+        data, address = server.recvfrom(512)
+        server.sendto(AxisData(9.0, 9.0, 9.0).pack_frame(0, 99), address)
+        server.sendto(bytes(4), address)
+        server.sendto(data, address)
+    thread = threading.Thread(target = serve_stale)
+    thread.start()
+    client = UDPClient(RemotePort = server.getsockname()[1], Quiet = True)
+    reply = client.sendData(AxisData(1.0, 2.0, 3.0))
+    thread.join()
+
+    assert reply == AxisData(1.0, 2.0, 3.0)
+    assert client.lateReplies == 1
+    assert client.metrics.decode_errors == 1
+
+    # Replies of lists and nested classes without default values
+    # (decoded by the Schema ID of the reply)
+    def serve_echo():
+        for i in range(2):
+            data, address = server.recvfrom(512)
+            server.sendto(data, address)
+    thread = threading.Thread(target = serve_echo)
+    thread.start()
+    messages = [TestClass2(heigth=1.5, lista_mi=[1.5, 77.0, 995.0]), TestClass3(TestClass1(0.5, 1609), TestClass2(heigth=1.5, lista_mi=[0.5]))]
+    replies = [client.sendData(message) for message in messages]
+    thread.join()
+
+    assert replies == messages
+
+    # Pipelined requests of lists and nested classes
+    # (sequence number wraps at 32 bits)
+    thread = threading.Thread(target = serve_echo)
+    thread.start()
+    client.sequence = 0xFFFFFFFF
+    futures = [client.sendRequest(message) for message in messages]
+    replies = [future.result(2.0) for future in futures]
+    thread.join()
+
+    assert replies == messages
+    assert client.sequence == 1
+
+    # Cancelled request is not completed by its reply
+    # (the reply is counted as late, the reply receiver thread is kept)
+    cancelled = threading.Event()
+    def serve_cancelled():
+        data, address = server.recvfrom(512)
+        cancelled.wait(2.0)
+        server.sendto(data, address)
+    thread = threading.Thread(target = serve_cancelled)
+    thread.start()
+    future = client.sendRequest(messages[0])
+    assert future.cancel()
+    cancelled.set()
+    thread.join()
+    assert client.waitRequests(1.0)
+    assert client.lateReplies == 2
+    assert client.replyReceiver.is_alive()
+
+    # Invalid reply to a blocking send through the reply receiver thread
+    # (content length does not match the schema of the reply)
+    def serve_invalid():
+        data, address = server.recvfrom(512)
+        header = CommToolbox.unpack_header(data)
+        server.sendto(CommToolbox.pack_header(0, 4, header.sequence, header.schema_id) + bytes(4), address)
+    thread = threading.Thread(target = serve_invalid)
+    thread.start()
+    reply = client.sendData(AxisData(1.0, 2.0, 3.0))
+    thread.join()
+
+    assert reply is None
+    assert client.metrics.decode_errors == 2
+
+    client.close()
+    server.close()
+
+def test21():
+
+    # Receiver of the published messages
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(1.0)
+
+    # Cyclic publisher
+    # (cycle 10 is slow, the following cycles are missed)
+    def update(message, cycle):
+        message.axis1 = float(cycle)
+        if cycle == 10:
+            time.sleep(0.0105)
+
+    udpPublisher = UDPPublisher(RemotePort = receiver.getsockname()[1], Period = 0.002, BusyWait = 0.25,
+                                TypeID = CommToolbox.COMM_CONST.MATLAB_CLIENT, Update = update)
+    start = time.perf_counter()
+    udpPublisher.run(Cycles = 50)
+    elapsed = time.perf_counter() - start
+    statistics = udpPublisher.statistics()
+
+    # Received messages
+    received = []
+    for i in range(statistics['cycles']):
+        data = receiver.recv(512)
+        header = CommToolbox.unpack_header(data)
+        axisData = AxisData()
+        axisData.unpack_from(data, header.header_length)
+        received.append((header.sequence, header.type_id, axisData.axis1))
+
+    # Absolute deadlines: the last sent cycle is sent after its deadline,
+    # missed cycles are skipped, not sent (no cumulative drift)
+    # (the upper bound only catches a schedule drifting by whole periods on a loaded machine)
+    cycles = [int(axis1) for sequence, type_id, axis1 in received]
+    assert cycles[-1] * 0.002 <= elapsed < 50 * 0.002 + 0.5
+    assert statistics['overruns'] >= 1
+    assert statistics['missed_cycles'] >= 4
+    assert statistics['cycles'] + statistics['missed_cycles'] >= 50
+    assert statistics['lateness']['count'] == statistics['cycles']
+    assert [sequence for sequence, type_id, axis1 in received] == list(range(statistics['cycles']))
+    assert all(type_id == CommToolbox.COMM_CONST.MATLAB_CLIENT for sequence, type_id, axis1 in received)
+    assert (cycles == sorted(set(cycles))) and (cycles[-1] < 50)
+
+    udpPublisher.publisherSocket.close()
+
+    # Message of variable length
+    # (the list grows every cycle, the Send Buffer follows the schema of the message)
+    def grow(message, cycle):
+        message.lista_mi.append(float(cycle))
+
+    udpPublisher = UDPPublisher(RemotePort = receiver.getsockname()[1], Period = 0.001,
+                                Message = TestClass2(heigth = 1.5), Update = grow)
+    udpPublisher.run(Cycles = 3)
+    for i in range(3):
+        data = receiver.recv(512)
+        header = CommToolbox.unpack_header(data)
+        schema = CommSchema.get_registered_schema(header.schema_id)
+        assert (len(data) == header.header_length + header.content_length) and (header.content_length == schema.size)
+        assert schema.remap(schema.unpack_from(data, header.header_length)).lista_mi == [float(cycle) for cycle in range(i + 1)]
+
+    udpPublisher.publisherSocket.close()
+
+    # Failing update-callback and message that can not be packed
+    # (counted as encode errors, the following cycles are sent)
+    def fail(message, cycle):
+        if cycle == 1:
+            raise RuntimeError('update failed')
+        message.axis1 = 'olsen' if cycle == 2 else float(cycle)
+
+    udpPublisher = UDPPublisher(RemotePort = receiver.getsockname()[1], Period = 0.01, Update = fail)
+    udpPublisher.run(Cycles = 4)
+    received = []
+    for i in range(2):
+        data = receiver.recv(512)
+        header = CommToolbox.unpack_header(data)
+        received.append((header.sequence, AxisData().get_schema().remap(AxisData().get_schema().unpack_from(data, header.header_length)).axis1))
+
+    assert received == [(0, 0.0), (1, 3.0)]
+    assert udpPublisher.metrics.encode_errors == 2
+    assert udpPublisher.metrics.snapshot()['packets_out'] == 2
+
+    udpPublisher.publisherSocket.close()
+    receiver.close()
+
+def test22():
+    # ------------------------------
+    data = ['olsen jan to', 1.5, 2.5, 3.5]
+    packed_data = struct.pack(CommToolbox.COMM_CONST.Network + '12s3f', data[0].encode('UTF-8'), *data[1:])
+
+    # ------------------------------
+    print('\n')
+    print(' Compiled Conversion-Code ')
+    print('---------------------')
+    _struct, string_indices = CommToolbox.compile_conversion_code('12s3f')
+    unpacked_data = CommToolbox.unpack_from_bytes(packed_data, '12s3f')
+    print(_struct.format)
+    print(string_indices)
+    print(unpacked_data)
+    print('---------------------')
+    print('\n')
+
+    # Multi-digit string length is a single value, repeat count is one value per count
+    assert _struct.size == 24
+    assert string_indices == (0,)
+    assert unpacked_data == tuple(data)
+
+    # Round trip of packed data
+    packed_data, conversion_code, _ = CommToolbox.pack_to_bytes(data)
+    assert conversion_code == '12sfff'
+    assert CommToolbox.unpack_from_bytes(packed_data, conversion_code) == tuple(data)
+    assert CommToolbox.unpack_from_bytes(packed_data, '12s3f') == tuple(data)
+
+@dataclass
+class TestClass13(GenericCommClass):
+    lista_a : list = field(default_factory=list)
+    lista_b : list = field(default_factory=list)
+
+def test23():
+    # ------------------------------
+    data_21 = TestClass13([1.5, 2.5], [3.5])
+    data_12 = TestClass13([1.5], [2.5, 3.5])
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' Schema Identity ')
+    print('---------------------')
+    schema_21 = data_21.get_schema()
+    schema_12 = data_12.get_schema()
+    print(schema_21, schema_21.shape, schema_21.schema_id)
+    print(schema_12, schema_12.shape, schema_12.schema_id)
+    print('---------------------')
+    print('\n')
+
+    # Same conversion-code and paths, different data-shape
+    assert schema_21.conversion_code == schema_12.conversion_code
+    assert schema_21 != schema_12
+    assert schema_21.schema_id != schema_12.schema_id
+
+    # Both schemas are registered
+    assert CommSchema.get_registered_schema(schema_21.schema_id) is schema_21
+    assert CommSchema.get_registered_schema(schema_12.schema_id) is schema_12
+
+def test24():
+
+    # NumPy is an optional dependency
+    try:
+        import numpy
+    except ImportError:
+        print('NumPy is not installed, skipping test')
+        return
+
+    # ------------------------------
+    trajectory = [TestClass6(0.5 * i, TestClass3(TestClass1(1.5 * i, i), TestClass2('jens', i, 1.92, [float(i), 2.0])),
+                             TestClass1(2.5 * i, -i)) for i in range(100)]
+    data_21 = [TestClass13([float(i), 2.0], [3.0]) for i in range(10)]
+    data_12 = [TestClass13([float(i)], [2.0, 3.0]) for i in range(10)]
+    # ------------------------------
+
+    # ------------------------------
+    print('\n')
+    print(' NumPy Batch Unpacking ')
+    print('---------------------')
+    packed_batch, conversion_code = TestClass6.pack_batch(trajectory)
+    array = trajectory[0].unpack_batch_numpy(packed_batch, conversion_code)
+    print(array.dtype)
+    print(array[:3])
+    print('---------------------')
+    print('\n')
+
+    # Records decoded by NumPy match the records decoded by the schema
+    assert len(array) == len(trajectory)
+    assert array.dtype.itemsize == trajectory[0].get_schema().size
+    assert list(array['verdi']) == [item.verdi for item in trajectory]
+    assert list(array['class3']['class1']['engelsk_mil']) == [item.class3.class1.engelsk_mil for item in trajectory]
+    assert list(array['class1']['engelsk_mil']) == [item.class1.engelsk_mil for item in trajectory]
+    assert [bytes(name).decode('UTF-8') for name in array['class3']['class2']['name']] == ['jens'] * len(trajectory)
+    assert array['class3']['class2']['lista_mi'].tolist() == [item.class3.class2.lista_mi for item in trajectory]
+
+    # Packing the NumPy array gives the packed records
+    assert array.tobytes() == packed_batch
+
+    # ------------------------------
+    print(' NumPy dtype of Data-Shapes ')
+    print('---------------------')
+    dtype_21 = data_21[0].to_numpy_dtype()
+    dtype_12 = data_12[0].to_numpy_dtype()
+    print(dtype_21)
+    print(dtype_12)
+    print('---------------------')
+    print('\n')
+
+    # Shapes (2, 1) and (1, 2) have different dtypes
+    assert dtype_21['lista_a'].shape == (2,) and dtype_21['lista_b'].shape == (1,)
+    assert dtype_12['lista_a'].shape == (1,) and dtype_12['lista_b'].shape == (2,)
+
+    # Round trip of both data-shapes
+    for items in (data_21, data_12):
+        packed_batch, conversion_code = TestClass13.pack_batch(items)
+        array = items[0].unpack_batch_numpy(packed_batch)
+        assert array['lista_a'].tolist() == [item.lista_a for item in items]
+        assert array['lista_b'].tolist() == [item.lista_b for item in items]
+        assert array.tobytes() == packed_batch
+
+def test25():
+
+    # Server with a registered message
+    server = UDPCommunication(Port = 0, Quiet = True, Messages = [AxisData(), TestClass8()])
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    receiver.settimeout(1.0)
+    address = receiver.getsockname()
+
+    def frame(content, header_length = CommToolbox.HEADER_SIZE, content_length = None, schema_id = None):
+        return CommToolbox.HEADER_STRUCT.pack(CommToolbox.HEADER_VERSION, 0, header_length, 0,
+                                              len(content) if content_length is None else content_length,
+                                              AxisData().get_schema().schema_id if schema_id is None else schema_id) + content
+
+    # Invalid datagrams
+    # (every datagram is counted as a decode error, and not sent back)
+    invalid = [frame(bytes(4)),                                                         # Truncated data-content
+               frame(bytes(12), header_length = 0),                                     # Header length shorter than header
+               frame(bytes(12), content_length = 16),                                   # Content length longer than datagram
+               frame(b'[{"id": 1', schema_id = CommSchema.SCHEMA_DEFINITION_ID),         # Invalid JSON definitions
+               frame(b'[{"id": 1}]', schema_id = CommSchema.SCHEMA_DEFINITION_ID),       # Incomplete definitions
+               frame(bytes(12), schema_id = 0xFFFFFFFF),                                # Unknown Schema ID
+               frame(b'\xff' * TestClass8().get_schema().size, schema_id = TestClass8().get_schema().schema_id)]  # Invalid UTF-8
+    for data in invalid:
+        server.handle_message(data, address)
+
+    # Valid datagram is still handled
+    server.handle_message(AxisData(1.0, 2.0, 3.0).pack_frame(0), address)
+    reply = receiver.recv(512)
+
+    # Report
+    # ------------------------------
+    print('\n')
+    print(' Invalid Data ')
+    print('---------------------')
+    print(server.metrics.snapshot()['decode_errors'])
+    print(server.messages)
+    print('---------------------')
+    print('\n')
+
+    assert server.metrics.decode_errors == len(invalid)
+    assert reply == AxisData(1.0, 2.0, 3.0).pack_frame(0)
+    assert server.messages[AxisData().get_schema().schema_id] == AxisData(1.0, 2.0, 3.0)
+
+    server.serverSocket.close()
+    receiver.close()
+
+def test26():
+
+    # Schema definitions of generated, declared and variable-length layouts
+    # (rebuilt without code-generated functions)
+    messages = [TestClass7(0.909, TestClass3(TestClass1(), TestClass2(lista_mi=[1.852, 77.0])), TestClass1()),
+                TestClass8('axis', 'tag', [1.0, 2.0], [3, 4]), TestClass2(lista_mi=[1.852, 77.0, 995.0])]
+    packed = CommSchema.pack_definitions([message.get_schema() for message in messages])
+    schemas = CommSchema.register_definitions(packed)
+
+    # Invalid definitions
+    # (Schema ID recomputed, only the checks of the definition reject them)
+    def definition(**entries):
+        _definition = dict(json.loads(packed)[0], **entries)
+        _definition['id'] = CommSchema.get_schema_id(_definition['plan'][0], _definition['codes'], _definition['paths'],
+                                                     _definition['kinds'], _definition['shape'], _definition['capacities'])
+        return _definition
+
+    _paths = json.loads(packed)[0]['paths']
+    _plan = json.loads(packed)[0]['plan']
+    invalid = [definition(paths = ['verdi\n__import__("os").system("exit")'] + _paths[1:]),   # Path is not an identifier
+               definition(paths = ['__class__.__init__'] + _paths[1:]),                        # Path is not a field
+               definition(paths = ['import'] + _paths[1:]),                                    # Path is a keyword
+               definition(kinds = [9] + json.loads(packed)[0]['kinds'][1:]),                   # Leaf-kind out of range
+               definition(codes = ['x'] + json.loads(packed)[0]['codes'][1:]),                 # Invalid Format-Code
+               definition(codes = json.loads(packed)[0]['codes'] + ['f']),                     # Too many Format-Codes
+               definition(shape = [-1]),                                                       # Negative length
+               definition(plan = ['TestClass7); import os; (', _plan[1]]),                     # Class name is not an identifier
+               definition(plan = [_plan[0], [[0, 1000, None, 'verdi']] + _plan[1][1:]])]       # Flat index out of range
+
+    # Definition of a local class with reordered fields
+    # (the values would be assigned to the wrong fields of the local class)
+    axisDefinition = CommSchema.get_definition(AxisData().get_schema())
+    axisDefinition['paths'] = ['axis3', 'axis2', 'axis1']
+    axisDefinition['plan'] = ['AxisData', [[0, i, None, name] for i, name in enumerate(axisDefinition['paths'])]]
+    axisDefinition['id'] = CommSchema.get_schema_id('AxisData', axisDefinition['codes'], axisDefinition['paths'],
+                                                    axisDefinition['kinds'], axisDefinition['shape'], axisDefinition['capacities'])
+    invalid.append(axisDefinition)
+
+    # Definition of an unknown class beyond the number of created dataclass types
+    maxTypes = CommSchema.MAX_DEFINITION_TYPES
+    CommSchema.MAX_DEFINITION_TYPES = 0
+    try:
+        CommSchema.schema_from_definition(definition(paths = ['remote'] + _paths[1:],
+                                                     plan = ['RemoteClass26', [_plan[1][0][:3] + ['remote']] + _plan[1][1:]]))
+        assert False
+    except ValueError:
+        pass
+    finally:
+        CommSchema.MAX_DEFINITION_TYPES = maxTypes
+    errors = 0
+    for _definition in invalid:
+        try:
+            CommSchema.schema_from_definition(_definition)
+        except ValueError:
+            errors += 1
+
+    # Invalid definitions received by a server
+    # (counted as decode errors)
+    server = UDPCommunication(Port = 0, Quiet = True)
+    for _definition in invalid:
+        _content = json.dumps([_definition]).encode('UTF-8')
+        server.handle_message(CommToolbox.pack_header(0, len(_content), 0, CommSchema.SCHEMA_DEFINITION_ID) + _content,
+                              ('127.0.0.1', 0))
+
+    # Report
+    # ------------------------------
+    print('\n')
+    print(' Schema Definitions ')
+    print('---------------------')
+    print(schemas)
+    print(errors)
+    print(server.metrics.snapshot()['decode_errors'])
+    print('---------------------')
+    print('\n')
+
+    assert [schema.schema_id for schema in schemas] == [message.get_schema().schema_id for message in messages]
+    assert not any(schema.is_generated for schema in schemas)
+    for schema, message in zip(schemas, messages):
+        assert schema.pack(schema.remap(schema.unpack(message.get_schema().pack(message)))) == message.get_schema().pack(message)
+    assert errors == len(invalid)
+    assert server.metrics.decode_errors == len(invalid)
+
+    server.serverSocket.close()
+
 # Main
 # ------------------------------
 if __name__ == "__main__":
@@ -266,4 +1520,34 @@ if __name__ == "__main__":
 
     # test2()
 
-    test3()
\ No newline at end of file
+    test3()
+
+def test27():
+    # ------------------------------
+    maxSchemas = CommSchema.MAX_CACHED_SCHEMAS
+    CommSchema.MAX_CACHED_SCHEMAS = 4
+    # ------------------------------
+
+    # Schema-cache of a class with value-dependent layout is bounded
+    # (least recently used schemas and Type-Maps are evicted, and schemas unregistered)
+    try:
+        first = TestClass2(lista_mi = [0]).get_schema()
+        firstTypeMap = CommSchema.get_type_map(TestClass2(lista_mi = [0]))
+        typeMaps = [CommSchema.get_type_map(TestClass2(lista_mi = [0] * length)) for length in range(1, 20)]
+        schemas = [TestClass2(lista_mi = [0] * length).get_schema() for length in range(1, 20)]
+
+        assert CommSchema.get_schema_by_code(TestClass2, first.conversion_code) is None
+        assert CommSchema.get_registered_schema(first.schema_id) is None
+        assert sum(CommSchema.get_registered_schema(schema.schema_id) is schema for schema in schemas) == 4
+        assert CommSchema.get_schema_by_code(TestClass2, schemas[-1].conversion_code) is schemas[-1]
+        assert CommSchema.get_type_map(TestClass2(lista_mi = [0] * 19)) is typeMaps[-1]
+
+        # Evicted layouts are compiled again
+        assert TestClass2(lista_mi = [0]).get_schema().conversion_code == first.conversion_code
+        assert CommSchema.get_registered_schema(first.schema_id) is not None
+        assert CommSchema.get_type_map(TestClass2(lista_mi = [0])) is not firstTypeMap
+
+        # Most recently used schemas are kept
+        assert TestClass2(lista_mi = [0] * 19).get_schema() is schemas[-1]
+    finally:
+        CommSchema.MAX_CACHED_SCHEMAS = maxSchemas
@@ -1,29 +1,58 @@
 # UDP Communication Server
 # ------------------------------
 # Description:
-# UDP Communication Server for 
+# UDP Communication Server for
 # sending and recieving UDP packages
 
 # Version
 # ------------------------------
+# 0.5   -   Updated with bounded TCP connections (frames
+#           larger than the maximum frame size close the
+#           connection, reading is paused while the pending
+#           output exceeds its maximum)
+#           [17.10.2026]
+# 0.4   -   Updated with validation of received frames
+#           (invalid TCP frames close the connection,
+#           undecodable messages are counted and dropped),
+#           quiet mode of the instance (logging levels
+#           are left to "configure_logging")
+#           [17.10.2026]
+# 0.3   -   Updated with Communication Metrics
+#           (counters, periodic dump by the reactor)
+#           [16.10.2026]
+# 0.2   -   Updated with quiet mode, per-packet reports
+#           through rate-limited logging
+#           [16.10.2026]
+# 0.1   -   Updated with Communication Reactor
+#           (selectors), several UDP and TCP listeners
+#           in one thread, framing with header
+#           [16.10.2026]
 # 0.0   -   Initial version
 #           [17.07.2022] - Jan T. Olsen
 
 # Import packages
+from collections import deque
 import logging
 import sys
 import socket
-import select
 import time
 
 # Import Toolbox
 import comm_toolbox as CommToolbox
 
 # Import Class Files
-from lib.generic_commdata import GenericCommClass
+import lib.comm_schema as CommSchema
+from lib.comm_metrics import CommMetrics
+from lib.comm_reactor import CommReactor
+from comm_data import AxisData
 
 # Logging Configuration
-logging.basicConfig(format='%(levelname)s - %(asctime)s: %(message)s',datefmt='%H:%M:%S', level=logging.DEBUG)
+CommToolbox.configure_logging(logging.DEBUG)
+
+# Logger
+# (per-packet reports are rate-limited, and only formatted when emitted)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
 
 # UDP Server Class
 # ------------------------------
@@ -32,14 +61,50 @@ class UDPServer():
     # Class constructor
     # ------------------------------
     # Assign default class arguments
-    def __init__(self, ip = '127.0.0.1', port = 10000) -> None:
+    def __init__(self, ip = '127.0.0.1', port = 10000, tcp_port = None, buffer_size = 512, quiet = False, metrics_interval = None,
+                 max_frame_size = None, max_pending = None) -> None:
 
         # Class attributes
         # ------------------------------
         # If no class arguments where given default values are used
-        self.ip = ip 
+        self.ip = ip
         self.port = port
         self.address = (ip, port)
+        self.tcp_port = tcp_port
+        self.buffer_size = buffer_size
+
+        # Maximum size of a TCP frame (header and data-content)
+        # (same as a UDP datagram, if no size is given)
+        self.max_frame_size = buffer_size if max_frame_size is None else max_frame_size
+
+        # Maximum size of the data pending to be sent on a TCP connection
+        # (reading from the connection is paused until the data is sent)
+        self.max_pending = 64 * buffer_size if max_pending is None else max_pending
+
+        # Quiet production mode
+        # (per-packet reports are not logged, only warnings,
+        #  the level of the shared logger is left to "configure_logging")
+        self.quiet = quiet
+
+        # Communication Reactor
+        # (every listener and connection is served by the reactor in one thread)
+        self.reactor = CommReactor()
+
+        # Data pending to be sent (per socket)
+        # and data received on TCP connections (incomplete messages)
+        self.pending = {}
+        self.received = {}
+
+        # TCP connections paused from reading (too much data pending)
+        self.paused = set()
+
+        # Time of the last received data
+        self.last_received = time.monotonic()
+
+        # Communication Metrics
+        # (dumped by the reactor, if an interval is given)
+        self.metrics = CommMetrics('UDP Server')
+        self.metrics_interval = metrics_interval
 
         # Server Configuration
         self.config()
@@ -48,108 +113,350 @@ class UDPServer():
     # ------------------------------
     def config(self):
 
+        # UDP listener
+        self.server_socket = self.add_udp_listener(self.address)
+        self.port = self.server_socket.getsockname()[1]
+
+        # TCP listener
+        # (optional, same messages framed on a stream)
+        if self.tcp_port is not None:
+            self.tcp_socket = self.add_tcp_listener((self.ip, self.tcp_port))
+            self.tcp_port = self.tcp_socket.getsockname()[1]
+
+        # Register Messages
+        # (schemas are registered in the Schema Registry)
+        AxisData.compile_schema()
+
+        # Timer reporting connection timeout
+        self.reactor.call_every(CommToolbox.COMM_CONST.TIMEOUT, self.check_timeout)
+
+        # Timer dumping the metrics
+        if self.metrics_interval is not None:
+            self.reactor.call_every(self.metrics_interval, self.metrics.dump, logger)
+
+        # Report
+        logger.info('UDP Server: Successfully configured with address: (%s:%s)', format(self.ip), format(self.port))
+
+    # Add UDP Listener
+    # ------------------------------
+    def add_udp_listener(self, address : tuple) -> socket.socket:
+        """
+        Add a UDP socket bound to an address, served by the reactor
+        :param address: Local address (IP, Port)
+        :return socket: UDP socket
+        """
+
         # Create a UDP socket
-        self.server_socket = socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.UDP) 
-        # self.server_socket = socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.TCP) 
+        _socket = socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.UDP)
+
+        # Enable re-use of Address
+        _socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+
+        # Bind address and IP
+        _socket.bind(address)
+
+        # Register socket with the reactor
+        # (non-blocking, read-callback)
+        self.pending[_socket] = deque()
+        self.reactor.register(_socket, self.read_udp)
+
+        # Report
+        logger.info('UDP Server: UDP listener on (%s:%s)', *_socket.getsockname())
+
+        # Function return
+        return _socket
+
+    # Add TCP Listener
+    # ------------------------------
+    def add_tcp_listener(self, address : tuple) -> socket.socket:
+        """
+        Add a TCP socket listening on an address, served by the reactor
+        :param address: Local address (IP, Port)
+        :return socket: TCP listening socket
+        """
+
+        # Create a TCP socket
+        _socket = socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.TCP)
 
         # Enable re-use of Address
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        _socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
 
         # Bind address and IP
-        self.server_socket.bind(self.address)
+        _socket.bind(address)
 
         # Listen to new TCP connections
-        # self.server_socket.listen()
+        _socket.listen()
 
-        # Disable blocking
-        self.server_socket.setblocking(False)
+        # Register socket with the reactor
+        # (non-blocking, new connections are accepted by the read-callback)
+        self.reactor.register(_socket, self.accept_tcp)
 
-        # Define socket-lists to be used with select() functionality
-        self.input_sockets = [self.server_socket]
-        self.output_sockets = [self.server_socket]
-        self.error_sockets = [self.server_socket]
+        # Report
+        logger.info('UDP Server: TCP listener on (%s:%s)', *_socket.getsockname())
+
+        # Function return
+        return _socket
+
+    # Handle Message
+    # ------------------------------
+    def handle_message(self, data, remote_address : tuple):
+        """
+        Handle a received message (Communication Header and data-content)
+        :param data: Received message (bytes, bytearray)
+        :param remote_address: Remote address (IP, Port)
+        :return reply: Message to be returned to the remote address (None: no reply)
+        """
+
+        self.last_received = time.monotonic()
+
+        # Header
+        try:
+            header = CommToolbox.unpack_header(data)
+        except ValueError as error:
+            self.metrics.count('decode_errors')
+            logger.warning('UDP Server: Invalid data received from %s: %s', remote_address, error)
+            return None
+
+        # Schema Definitions
+        # (exchanged once at startup, registered in the Schema Registry)
+        self.metrics.count_in(header.schema_id, header.header_length + header.content_length)
+        if header.schema_id == CommSchema.SCHEMA_DEFINITION_ID:
+            try:
+                schemas = CommSchema.register_definitions(memoryview(data)[header.header_length:header.header_length + header.content_length])
+            except CommSchema.DECODE_ERRORS as error:
+                self.metrics.count('decode_errors')
+                logger.warning('UDP Server: Invalid schema definitions received from %s: %s', remote_address, error)
+                return None
+            if not self.quiet:
+                logger.info('UDP Server: Schema definitions received from %s: %s', remote_address, schemas)
+            return None
+
+        # Data
+        schema = CommSchema.get_registered_schema(header.schema_id)
+        if schema is None:
+            self.metrics.count('decode_errors')
+            logger.warning('UDP Server: Unknown Schema ID received from %s: %s', remote_address, header.schema_id)
+            return None
+
+        # Check data-content against the size of the schema
+        if header.content_length != schema.size:
+            self.metrics.count('decode_errors')
+            logger.warning('UDP Server: Invalid data received from %s: Content length %s does NOT match %r',
+                           remote_address, header.content_length, schema)
+            return None
+
+        # Report
+        # (message is only decoded to be reported, using the Schema Registry)
+        if (not self.quiet) and logger.isEnabledFor(logging.DEBUG):
+            try:
+                message = schema.remap(schema.unpack_from(data, header.header_length))
+            except CommSchema.DECODE_ERRORS as error:
+                self.metrics.count('decode_errors')
+                logger.warning('UDP Server: Invalid data received from %s: %s', remote_address, error)
+                return None
+            logger.debug('UDP Server: Data received from %s (Type ID: %s, Sequence: %s): %s', remote_address,
+                         header.type_id, header.sequence, message)
+
+        # Function return
+        # (just returning incoming data)
+        self.metrics.count_out(header.schema_id, header.header_length + header.content_length)
+        return bytes(data[:header.header_length + header.content_length])
+
+    # Read UDP Socket
+    # ------------------------------
+    def read_udp(self, udp_socket : socket.socket):
+
+        # Receive every queued datagram
+        # (until the socket would block)
+        while True:
+            try:
+                data, remote_address = udp_socket.recvfrom(self.buffer_size)
+            except BlockingIOError:
+                return
+            except OSError as error:
+                logger.warning('UDP Server: Receive error: %s', error)
+                return
+
+            # Handle message and send reply
+            reply = self.handle_message(data, remote_address)
+            if reply is not None:
+                self.send_udp(udp_socket, reply, remote_address)
+
+    # Send UDP Datagram
+    # ------------------------------
+    def send_udp(self, udp_socket : socket.socket, data : bytes, remote_address : tuple):
+
+        # Send directly if no data is pending
+        _pending = self.pending[udp_socket]
+        if not _pending:
+            try:
+                udp_socket.sendto(data, remote_address)
+                return
+            except BlockingIOError:
+                pass
+
+        # Queue data until the socket is writable
+        _pending.append((data, remote_address))
+        self.reactor.set_writer(udp_socket, self.write_udp)
+
+    # Write UDP Socket
+    # ------------------------------
+    def write_udp(self, udp_socket : socket.socket):
+
+        # Send pending datagrams
+        # (until the socket would block)
+        _pending = self.pending[udp_socket]
+        while _pending:
+            data, remote_address = _pending[0]
+            try:
+                udp_socket.sendto(data, remote_address)
+            except BlockingIOError:
+                return
+            _pending.popleft()
+
+        # No data pending
+        self.reactor.set_writer(udp_socket, None)
+
+    # Accept TCP Connection
+    # ------------------------------
+    def accept_tcp(self, tcp_socket : socket.socket):
+        try:
+            connection, remote_address = tcp_socket.accept()
+        except BlockingIOError:
+            return
+
+        # Register connection with the reactor
+        self.pending[connection] = bytearray()
+        self.received[connection] = bytearray()
+        self.reactor.register(connection, self.read_tcp)
 
         # Report
-        logging.info('UDP Server: Successfully configured with address: (%s:%s)', format(self.ip), format(self.port))
+        logger.info('UDP Server: TCP connection from %s', remote_address)
 
+    # Read TCP Connection
+    # ------------------------------
+    def read_tcp(self, connection : socket.socket):
+        try:
+            data = connection.recv(self.buffer_size)
+        except BlockingIOError:
+            return
+        except ConnectionError:
+            data = b''
+
+        # Connection closed by remote
+        if not data:
+            self.close_tcp(connection)
+            return
+
+        # Handle the received messages
+        self.received[connection] += data
+        self.handle_tcp(connection)
+
+    # Handle TCP Messages
+    # ------------------------------
+    def handle_tcp(self, connection : socket.socket):
+
+        # Split received data into messages
+        # (a message is complete when header and data-content are received)
+        _received = self.received[connection]
+        _pending = self.pending[connection]
+        while len(_received) >= CommToolbox.HEADER_SIZE:
+            _version, _, _header_length, _, _content_length, _ = CommToolbox.HEADER_STRUCT.unpack_from(_received)
+            _length = _header_length + _content_length
+
+            # Invalid frame closes the connection
+            # (the start of the next message can not be found,
+            #  and frames larger than the maximum frame size are not buffered)
+            if (_version != CommToolbox.HEADER_VERSION) or (_header_length < CommToolbox.HEADER_SIZE) or (_length > self.max_frame_size):
+                self.metrics.count('decode_errors')
+                logger.warning('UDP Server: Invalid frame received from %s (Version: %s, Header length: %s, Length: %s)',
+                               connection.getpeername(), _version, _header_length, _length)
+                self.close_tcp(connection)
+                return
+
+            if len(_received) < _length:
+                break
+
+            # Pause reading while too much data is pending
+            # (the remaining messages are handled when the data has been sent)
+            if len(_pending) >= self.max_pending:
+                if connection not in self.paused:
+                    self.paused.add(connection)
+                    self.reactor.modify(connection, None, self.write_tcp)
+                return
+
+            # Handle message and send reply
+            reply = self.handle_message(_received[:_length], connection.getpeername())
+            del _received[:_length]
+            if reply is not None:
+                _pending += reply
+                self.reactor.set_writer(connection, self.write_tcp)
+
+    # Write TCP Connection
+    # ------------------------------
+    def write_tcp(self, connection : socket.socket):
+        _pending = self.pending[connection]
+        try:
+            _sent = connection.send(_pending)
+        except BlockingIOError:
+            return
+        except ConnectionError:
+            self.close_tcp(connection)
+            return
+        del _pending[:_sent]
+
+        # Resume reading
+        # (handling the remaining messages first)
+        if (connection in self.paused) and (len(_pending) < self.max_pending):
+            self.paused.discard(connection)
+            self.reactor.modify(connection, self.read_tcp, self.write_tcp)
+            self.handle_tcp(connection)
+            if connection not in self.pending:
+                return
+
+        # No data pending
+        if not _pending:
+            self.reactor.set_writer(connection, None)
+
+    # Close TCP Connection
+    # ------------------------------
+    def close_tcp(self, connection : socket.socket):
+        logger.info('UDP Server: TCP connection closed')
+        self.reactor.unregister(connection)
+        self.pending.pop(connection, None)
+        self.received.pop(connection, None)
+        self.paused.discard(connection)
+        connection.close()
+
+    # Check Connection Timeout
+    # ------------------------------
+    def check_timeout(self):
+        # Timeout: No data received within the timeout
+        if time.monotonic() - self.last_received >= CommToolbox.COMM_CONST.TIMEOUT:
+            # Report
+            logger.warning('UDP Server: Connection timeout, waiting ...')
 
     # Establish Server Connection
     # ------------------------------
     def connect(self):
-        
+
         # Report
-        logging.info('UDP Server: Establish connection')
+        logger.info('UDP Server: Establish connection')
 
-        # Connection Loop
-        # ------------------------------
-        while True:
-            
-            # Try to establish a connection with sockets 
-            try:
+        # Run the reactor
+        # (blocks until a socket is ready or a timer is due, no polling)
+        try:
+            self.reactor.run()
+
+        # Exception(s)
+        except KeyboardInterrupt:
+            logger.exception('UDP Server: keyboard interrupt, exiting')
+            self.reactor.close()
+            sys.exit()
 
-                # Calls Unix select() system call or Windows select() WinSock call with three parameters:
-                #   - rlist - sockets to be monitored for incoming data
-                #   - wlist - sockets for data to be send to (checks if for example buffers are not full and socket is ready to send some data)
-                #   - xlist - sockets to be monitored for exceptions
-                #   - timeout - timeout (seconds) before blocking-call is released, if no connection is established
-                # Returns lists:
-                #   - reading - sockets we received some data on (that way we don't have to check sockets manually)
-                #   - writing - sockets ready for data to be send thru them
-                #   - errors  - sockets with some exceptions
-                # This is a blocking call, code execution will "wait" here and "get" notified in case any action should be taken
-                read_sockets, write_sockets, exception_sockets = select.select(self.input_sockets, 
-                                                                            [], #self.output_sockets, 
-                                                                            self.error_sockets,
-                                                                            CommToolbox.COMM_CONST.TIMEOUT)
-
-                # Iterate over Read-Sockets
-                # ------------------------------
-                for socket in read_sockets:
-                    
-                    print('reading')
-                
-                # Iterate over Write-Sockets
-                # ------------------------------
-                for socket in write_sockets:
-                    
-                    print('writing')
-
-                # Handle Exception-Sockets
-                # ------------------------------
-                for socket in exception_sockets:
-
-                    # If exception-socket exist in input-sockets
-                    if socket in self.input_sockets:
-                        # Remove entry from inputs-sockets
-                        self.input_sockets.remove(socket)
-
-                    # If exception-socket exist in output-sockets
-                    if socket in self.output_sockets:
-                        # Remove entry from outputs-sockets
-                        self.output_sockets.remove(socket)
-
-                    # Report
-                    logging.warning('UDP Server: Exception socket')
-
-                    # Close exception-socket
-                    socket.close()
-
-                # Timeout: No sockets are found
-                # ------------------------------
-                # (read-, write-, and expection-sockets are empty)
-                if not (read_sockets and write_sockets and exception_sockets):
-
-                    # Report
-                    logging.warning('UDP Server: Connection timeout, retrying ...')
-
-            # Exception(s)
-            except KeyboardInterrupt:
-                logging.exception('UDP Server: keyboard interrupt, exiting')
-                sys.exit()
-    
 
 def main():
-    logging.info('Hello World')
+    logger.info('Hello World')
 
 # Main
 # ------------------------------
@@ -160,5 +467,3 @@ if __name__ == "__main__":
     udp_server = UDPServer()
 
     udp_server.connect()
-
-
@@ -0,0 +1,415 @@
+# UDP Async Communication
+# ------------------------------
+# Description:
+# Asyncio datagram endpoints for sending and recieving UDP packages
+# A single event loop serves many peers, incomming datagrams are decoded
+# into Generic-Communication-Dataclasses and queued for "receive"
+# (no blocking receive after every send)
+
+# Version
+# ------------------------------
+# 0.3   -   Updated with concurrent requests (replies resolve
+#           the pending request of their sequence number),
+#           and per-datagram error handling of the server
+#           [17.10.2026]
+# 0.2   -   Updated with decode error counting (invalid
+#           definitions and data-content are dropped),
+#           and replies matched by sequence number
+#           [17.10.2026]
+# 0.1   -   Updated with per-datagram reports
+#           through rate-limited logging
+#           [16.10.2026]
+# 0.0   -   Initial version
+#           [16.10.2026]
+
+# Import packages
+import asyncio
+import logging
+import socket
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+import lib.comm_schema as CommSchema
+from comm_data import AxisData
+
+# Logger
+# (per-datagram reports are rate-limited, and only formatted when emitted)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
+
+# UDP Datagram Protocol
+# ------------------------------
+class UDPProtocol(asyncio.DatagramProtocol):
+    """
+    UDP Datagram Protocol
+    Decodes incomming datagrams (Communication Header and data-content) into new objects
+    using the Schema Registry (by Schema ID of the header), and queues them as
+    (header, message, remote address). Replies of pending requests resolve the
+    future of their sequence number instead. Schema definitions are registered
+    in the Schema Registry, messages that can not be decoded are dropped
+    """
+
+    def __init__(self, QueueSize : int) -> None:
+        self.transport = None
+        self.queue = asyncio.Queue(QueueSize)
+
+        # Pending requests
+        # (sequence number : future of the reply)
+        self.requests = {}
+
+        # Number of received messages that could not be decoded
+        # (invalid header, invalid definitions, unknown Schema ID or invalid data-content)
+        self.decode_errors = 0
+
+        # Number of decoded messages dropped
+        # (full queue)
+        self.dropped = 0
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data : bytes, address : tuple) -> None:
+
+        # Header
+        try:
+            header = CommToolbox.unpack_header(data)
+        except ValueError as error:
+            self.decode_errors += 1
+            logger.warning("Invalid data received from %s: %s", address, error)
+            return
+
+        # Schema Definitions
+        # (exchanged once at startup, registered in the Schema Registry)
+        if header.schema_id == CommSchema.SCHEMA_DEFINITION_ID:
+            try:
+                CommSchema.register_definitions(memoryview(data)[header.header_length:header.header_length + header.content_length])
+            except CommSchema.DECODE_ERRORS as error:
+                self.decode_errors += 1
+                logger.warning("Invalid schema definitions received from %s: %s", address, error)
+            return
+
+        # Data
+        # (decoded to a new object using the Schema Registry)
+        schema = CommSchema.get_registered_schema(header.schema_id)
+        if schema is None:
+            self.decode_errors += 1
+            logger.warning("Unknown Schema ID received from %s: %s", address, header.schema_id)
+            return
+
+        # Check data-content against the size of the schema
+        if header.content_length != schema.size:
+            self.decode_errors += 1
+            logger.warning("Invalid data received from %s: Content length %s does NOT match %r",
+                           address, header.content_length, schema)
+            return
+
+        # Data-content can not be decoded (e.g. invalid UTF-8 string)
+        try:
+            message = schema.remap(schema.unpack_from(data, header.header_length))
+        except CommSchema.DECODE_ERRORS as error:
+            self.decode_errors += 1
+            logger.warning("Invalid data received from %s: %s", address, error)
+            return
+
+        # Reply of a pending request
+        future = self.requests.pop(header.sequence, None)
+        if future is not None:
+            if not future.done():
+                future.set_result((header, message, address))
+            return
+
+        # Queue received message
+        # (dropped if the receiver does not keep up)
+        try:
+            self.queue.put_nowait((header, message, address))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def error_received(self, error : Exception) -> None:
+        logger.warning("UDP Error: %s", error)
+
+
+# UDP Async Endpoint
+# ------------------------------
+class _AsyncUDPEndpoint():
+    """
+    Async UDP Endpoint
+    Parent class of the async UDP server and client, holding the datagram transport
+    and protocol, and the async send and receive of messages
+    """
+
+    # Constants
+    # ------------------------------
+    # Address family
+    IPV4 = socket.AF_INET
+    IPV6 = socket.AF_INET6
+
+    def __init__(self, TypeID : int, QueueSize : int = None) -> None:
+        self.typeID = TypeID
+        self.queueSize = 1024 if QueueSize is None else QueueSize
+        self.transport = None
+        self.protocol = None
+
+        # Sequence number of sent messages
+        self.sequence = 0
+
+    # Register Message
+    # ------------------------------
+    def register_message(self, message) -> None:
+        """
+        Register a message (Generic-Communication-Dataclass) to be received
+        The schema of the message is registered in the Schema Registry
+        :param message: Message object or type (GenericCommClass)
+        """
+        if isinstance(message, type):
+            message.compile_schema()
+        else:
+            message.get_schema()
+
+    # Create Datagram Endpoint
+    # ------------------------------
+    async def _create_endpoint(self, **kwargs) -> None:
+        """
+        Create the datagram endpoint (transport and protocol) on the running event loop
+        :param kwargs: Local or remote address (see "loop.create_datagram_endpoint")
+        """
+        loop = asyncio.get_running_loop()
+        self.transport, self.protocol = await loop.create_datagram_endpoint(
+            lambda: UDPProtocol(self.queueSize), family = self.IPV4, **kwargs)
+
+    # Close
+    # ------------------------------
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    # Send
+    # ------------------------------
+    def send(self, message, address : tuple = None) -> None:
+        """
+        Send a message (Communication Header and data-content)
+        Sending does not block, the datagram is handed to the transport
+        :param message: Message object (GenericCommClass)
+        :param address: Remote address (default: connected remote address)
+        """
+        self.transport.sendto(message.pack_frame(self.typeID, self.sequence), address)
+
+        # Sequence number wraps with the header field (32 bits)
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+
+    # Receive
+    # ------------------------------
+    async def receive(self, timeout : float = None) -> tuple:
+        """
+        Receive the next decoded message
+        :param timeout: Timeout in seconds (default: wait forever)
+        :return header: Communication Header (COMM_HEADER)
+        :return message: Decoded message (GenericCommClass)
+        :return address: Remote address (tuple)
+        """
+        return await asyncio.wait_for(self.protocol.queue.get(), timeout)
+
+
+# UDP Async Communication Class
+# ------------------------------
+class AsyncUDPCommunication(_AsyncUDPEndpoint):
+    """
+    Async UDP Communication (Server)
+    Receives messages from many peers on a single socket
+    """
+
+    # Class constructor
+    def __init__(self, Address=None, Port=None, Messages=None, QueueSize=None):
+        super().__init__(CommToolbox.COMM_CONST.SERVER, QueueSize)
+
+        # Class arguments and default values
+        # ------------------------------
+        # Set IP-Address as default value
+        # If no argument value was given
+        if Address is None:
+            self.address = '127.0.0.1'
+        # Set IP-Address equal to class input
+        else:
+            self.address = Address
+
+        # Set Port as default value
+        # If no argument value was given
+        if Port is None:
+            self.port = 22010
+        # Set Port equal to class input
+        else:
+            self.port = Port
+
+        # Set Messages as default value
+        # If no argument value was given
+        if Messages is None:
+            Messages = [AxisData]
+        # Register Messages
+        for message in Messages:
+            self.register_message(message)
+
+    # UDP Server Configuration
+    # ------------------------------
+    async def config(self):
+        # Create a datagram endpoint
+        # Bind address and IP
+        await self._create_endpoint(local_addr = (self.address, self.port))
+        self.port = self.transport.get_extra_info('sockname')[1]
+
+        # Report to terminal
+        print("------------------------------")
+        print("Async UPD Server: Successfully configured")
+        print("IP Address: " + format(self.address))
+        print("Port: " + format(self.port))
+        print("------------------------------")
+
+    # UDP Server Serve
+    # ------------------------------
+    async def serve(self):
+        """
+        Serve peers until cancelled
+        (just returning incoming data to the sender)
+        Messages that can not be packed are counted as decode errors and dropped
+        """
+        while True:
+            header, message, remote_address = await self.receive()
+
+            # Pack with the schema of the message
+            # (messages of schema definitions are not Generic-Communication-Dataclasses)
+            schema = CommSchema.get_registered_schema(header.schema_id)
+            if schema is None:
+                self.protocol.decode_errors += 1
+                logger.warning("Unknown Schema ID received from %s: %s", remote_address, header.schema_id)
+                continue
+
+            try:
+                bytes2send = CommToolbox.pack_header(self.typeID, schema.size, header.sequence, header.schema_id) + schema.pack(message)
+            except CommSchema.DECODE_ERRORS as error:
+                self.protocol.decode_errors += 1
+                logger.warning("Invalid data received from %s: %s", remote_address, error)
+                continue
+            self.transport.sendto(bytes2send, remote_address)
+
+
+# UDP Async Client Class
+# ------------------------------
+class AsyncUDPClient(_AsyncUDPEndpoint):
+    """
+    Async UDP Client
+    Sends messages to a single remote server, replies are received asynchronously
+    """
+
+    # Class constructor
+    def __init__(self, RemoteAddress=None, RemotePort=None, TypeID=None, QueueSize=None):
+
+        # Class arguments and default values
+        # ------------------------------
+        # Set Type-ID as default value
+        # If no argument value was given
+        if TypeID is None:
+            TypeID = CommToolbox.COMM_CONST.GUI_CLIENT
+        super().__init__(TypeID, QueueSize)
+
+        # Set IP-Address as default value
+        # If no argument value was given
+        if RemoteAddress is None:
+            self.remoteAddress = '127.0.0.1'
+        # Set IP-Address equal to class input
+        else:
+            self.remoteAddress = RemoteAddress
+
+        # Set Port as default value
+        # If no argument value was given
+        if RemotePort is None:
+            self.remotePort = 22010
+        # Set Port equal to class input
+        else:
+            self.remotePort = RemotePort
+
+    # UDP Client Configuration
+    # ------------------------------
+    async def config(self):
+        # Create a datagram endpoint
+        # (connected to the remote address)
+        await self._create_endpoint(remote_addr = (self.remoteAddress, self.remotePort))
+
+        # Report to terminal
+        print("------------------------------")
+        print("Async UPD Client: Successfully configured")
+        print("IP Address: " + format(self.remoteAddress))
+        print("Port: " + format(self.remotePort))
+        print("------------------------------")
+
+    # UDP Client Send Schemas
+    # ------------------------------
+    def sendSchemas(self, Messages=None):
+        """
+        Send the schema definitions of the messages to the server
+        (sent once at startup, afterwards messages only carry the Schema ID in the header)
+        :param Messages: Message objects (GenericCommClass) (default: Axis-Data)
+        """
+
+        # Set Messages as default value
+        # If no argument value was given
+        if Messages is None:
+            Messages = [AxisData()]
+
+        # Packing schema definitions
+        definitions = CommSchema.pack_definitions([message.get_schema() for message in Messages])
+        self.transport.sendto(CommToolbox.pack_header(self.typeID, len(definitions), self.sequence, CommSchema.SCHEMA_DEFINITION_ID) + definitions)
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+
+    # UDP Client Request
+    # ------------------------------
+    async def request(self, message, timeout : float = CommToolbox.COMM_CONST.TIMEOUT):
+        """
+        Send a message and wait for its reply
+        The reply resolves the pending request of its sequence number, so concurrent
+        requests do not receive each other's replies (late replies of timed out
+        requests are queued for "receive")
+        :param message: Message object (GenericCommClass)
+        :param timeout: Timeout in seconds (default: COMM_CONST.TIMEOUT)
+        :return message: Decoded reply (GenericCommClass)
+        """
+        _sequence = self.sequence
+        future = asyncio.get_running_loop().create_future()
+        self.protocol.requests[_sequence] = future
+
+        # Wait for the reply with the sequence number of the request
+        # (the pending request is removed on timeout or cancellation)
+        try:
+            self.send(message)
+            header, reply, remote_address = await asyncio.wait_for(future, timeout)
+        finally:
+            if self.protocol.requests.get(_sequence) is future:
+                del self.protocol.requests[_sequence]
+        return reply
+
+
+# Main
+# ------------------------------
+async def main():
+    udpComm = AsyncUDPCommunication(Port = 0)
+    await udpComm.config()
+    server = asyncio.create_task(udpComm.serve())
+
+    udpClient = AsyncUDPClient(RemotePort = udpComm.port)
+    await udpClient.config()
+    udpClient.sendSchemas()
+
+    # Send several messages before awaiting the replies
+    # (round trips overlap instead of one blocking round trip per message)
+    for i in range(10):
+        udpClient.send(AxisData(45.0 + i, 107.5, 0.33))
+    for i in range(10):
+        header, message, remote_address = await udpClient.receive(CommToolbox.COMM_CONST.TIMEOUT)
+        print("Received: " + format(header.sequence) + " " + format(message))
+
+    server.cancel()
+    udpClient.close()
+    udpComm.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,14 +5,100 @@
 
 # Version
 # ------------------------------
+# 0.8   -   Updated with quiet mode of the instance
+#           (logging levels are left to "configure_logging"),
+#           replies decoded using the Schema Registry,
+#           sequence numbers wrapping at 32 bits
+#           [17.10.2026]
+# 0.7   -   Updated with pipelined requests
+#           (in-flight window, replies matched by
+#           sequence number, deadlines, retransmission
+#           and futures)
+#           [17.10.2026]
+# 0.6   -   Updated with messages of any type
+#           sent by "sendData", reply returned
+#           [17.10.2026]
+# 0.5   -   Updated with Communication Metrics
+#           (packet, byte, timeout and decode error
+#           counters, encode, decode and round-trip
+#           time histograms), reply timeout
+#           [16.10.2026]
+# 0.4   -   Updated with quiet mode, per-packet reports
+#           through level-gated, rate-limited logging
+#           [16.10.2026]
+# 0.3   -   Updated with socket buffer sizes
+#           [16.10.2026]
+# 0.2   -   Updated with receive into
+#           a Receive Buffer Pool (recvfrom_into)
+#           [16.10.2026]
+# 0.1   -   Updated with Communication Header framing
+#           and exchange of schema definitions
+#           [16.10.2026]
 # 0.0   -   Initial version
 #           [16.06.2022] - Jan T. Olsen
 
 # Import packages
+from concurrent.futures import CancelledError, Future, InvalidStateError, TimeoutError as FutureTimeoutError
+import logging
+import select
 import socket
 import struct
+import threading
 import time
 
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+import lib.comm_schema as CommSchema
+from lib.comm_metrics import CommMetrics
+from comm_data import AxisData
+
+# Logger
+# (per-packet reports are rate-limited, and only formatted when emitted)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
+
+# Pending Request
+# ------------------------------
+class _Request():
+    """
+    Pending Request
+    Request sent by "sendRequest" and waiting for its reply (by sequence number)
+    """
+
+    __slots__ = ('future', 'message', 'frame', 'timeout', 'deadline', 'retries', 'sent', 'retransmitted')
+
+    def __init__(self, message, frame : bytearray, timeout : float, retries : int) -> None:
+        self.future = Future()
+        self.message = message
+        self.frame = frame
+        self.timeout = timeout
+        self.retries = retries
+        self.retransmitted = False
+        self.sent = 0.0
+        self.deadline = 0.0
+
+    def complete(self, result = None, error : Exception = None) -> bool:
+        """
+        Complete the future with the reply or an error
+        (a future cancelled by its caller is not completed)
+        :param result: Reply (GenericCommClass)
+        :param error: Error (Exception)
+        :return completed: Future was completed (bool)
+        """
+        if self.future.done():
+            return False
+        try:
+            if error is None:
+                self.future.set_result(result)
+            else:
+                self.future.set_exception(error)
+        except InvalidStateError:
+            return False
+        return True
+
+
 # UDP-Client Class
 # ------------------------------
 class UDPClient():
@@ -29,7 +115,8 @@ class UDPClient():
     TCP = socket.SOCK_STREAM
 
     # Class constructor
-    def __init__(self, RemoteAddress=None, RemotePort=None, BufferSize=None):
+    def __init__(self, RemoteAddress=None, RemotePort=None, BufferSize=None, TypeID=None,
+                 ReceiveBufferSize=None, SendBufferSize=None, Quiet=None, Metrics=None, Window=None):
         
         # Class arguments and default values
         # ------------------------------
@@ -57,6 +144,69 @@ class UDPClient():
         else:
             self.bufferSize = BufferSize 
 
+        # Set Type-ID as default value
+        # If no argument value was given
+        if TypeID is None:
+            self.typeID = CommToolbox.COMM_CONST.GUI_CLIENT
+        # Set Type-ID equal to class input
+        else:
+            self.typeID = TypeID
+
+        # Set Quiet as default value
+        # If no argument value was given
+        # (quiet production mode: per-packet reports are not logged,
+        #  the level of the shared logger is left to "configure_logging")
+        if Quiet is None:
+            self.quiet = False
+        # Set Quiet equal to class input
+        else:
+            self.quiet = Quiet
+
+        # Set Metrics as default value
+        # If no argument value was given
+        # (metrics can be shared by several endpoints)
+        if Metrics is None:
+            self.metrics = CommMetrics('UDP Client')
+        # Set Metrics equal to class input
+        else:
+            self.metrics = Metrics
+
+        # Sequence number of sent messages
+        self.sequence = 0
+
+        # Receive Buffer Pool
+        # (replies are received into a preallocated slot)
+        self.receivePool = CommToolbox.BufferPool(1, self.bufferSize)
+
+        # Set Window as default value
+        # If no argument value was given
+        # (maximum number of requests waiting for their reply, see "sendRequest")
+        if Window is None:
+            self.window = 64
+        # Set Window equal to class input
+        else:
+            self.window = Window
+
+        # Pending requests (by sequence number)
+        # (replies are received by the reply receiver thread, started by the first request)
+        self.pending = {}
+        self.pendingCondition = threading.Condition()
+        self.replyReceiver = None
+        self.replyPool = CommToolbox.BufferPool(self.window, self.bufferSize)
+        self.stopEvent = threading.Event()
+
+        # Number of replies received without a pending request
+        # (after the deadline, duplicates of retransmitted requests,
+        #  or replies of other sequence numbers received by "sendData")
+        self.lateReplies = 0
+
+        # Remote Configuration
+        # (socket buffer sizes, system default if no argument value was given)
+        self.remoteConfig = CommToolbox.RemoteConfig(self.remoteAddress, self.remotePort, self.bufferSize,
+                                                     ReceiveBufferSize=ReceiveBufferSize,
+                                                     SendBufferSize=SendBufferSize,
+                                                     DropCounting=False)
+
         # Communication Configuration
         # ------------------------------
         self.config()
@@ -67,6 +217,12 @@ class UDPClient():
         # Create a datagram socket
         self.clientSocket = socket.socket(self.IPV4, self.UDP) 
 
+        # Socket buffer sizes
+        CommToolbox.configure_socket(self.clientSocket, self.remoteConfig)
+
+        # Reply timeout
+        self.clientSocket.settimeout(CommToolbox.COMM_CONST.TIMEOUT)
+
         # Report to terminal
         print("------------------------------")
         print("UPD Client: Successfully configured")
@@ -74,9 +230,51 @@ class UDPClient():
         print("Port: " + format(self.remotePort))
         print("------------------------------")
 
+    # UDP Client Send Schemas
+    # ------------------------------
+    def sendSchemas(self, Messages=None):
+        """
+        Send the schema definitions of the messages to the server
+        (sent once at startup, afterwards messages only carry the Schema ID in the header)
+        :param Messages: Message objects (GenericCommClass) (default: Axis-Data)
+        """
+
+        # Set Messages as default value
+        # If no argument value was given
+        if Messages is None:
+            Messages = [AxisData()]
+
+        # Packing schema definitions
+        definitions = CommSchema.pack_definitions([message.get_schema() for message in Messages])
+        bytes2send = CommToolbox.pack_header(self.typeID, len(definitions), self.sequence, CommSchema.SCHEMA_DEFINITION_ID) + definitions
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+
+        # Send data
+        self.clientSocket.sendto(bytes2send, (self.remoteAddress, self.remotePort))
+        self.metrics.count_out(CommSchema.SCHEMA_DEFINITION_ID, len(bytes2send))
+
+        # Report sent data
+        if not self.quiet:
+            logger.info("Schema definitions sent from Client: %s bytes", len(definitions))
+
     # UDP Client Send Data
     # ------------------------------
-    def sendData(self):
+    def sendData(self, Message=None):
+        """
+        Send a message to the server and receive the reply
+        :param Message: Message object (GenericCommClass) (default: Axis-Data)
+        :return message: Received reply, decoded by the Schema ID of the reply (None: no reply)
+        """
+
+        # Replies are received by the reply receiver thread
+        # (send as a request and wait for its reply,
+        #  no reply, a cancelled request or an invalid reply returns None)
+        if self.replyReceiver is not None:
+            try:
+                return self.sendRequest(Message).result()
+            except (TimeoutError, FutureTimeoutError, CancelledError, *CommSchema.DECODE_ERRORS) as error:
+                logger.warning("No reply received: %r", error)
+                return None
 
         # Data
         # ------------------------------
@@ -84,38 +282,329 @@ class UDPClient():
         # clientMessage = "Hello UPD Server (not yet matlab)"
         # byte2send = str.encode(clientMessage)
 
-        axis1 = 45.0
-        axis2 = 107.5
-        axis3 = 0.33
+        # Set Message as default value
+        # If no argument value was given
+        if Message is None:
+            axis1 = 45.0
+            axis2 = 107.5
+            axis3 = 0.33
+            Message = AxisData(axis1, axis2, axis3)
         
         # Packing data
-        axis_pos = struct.pack('!fff', axis1, axis2, axis3)
-
-        bytes2send = axis_pos
+        # (Communication Header and data-content)
+        _start = time.perf_counter()
+        sequence = self.sequence
+        bytes2send = Message.pack_frame(self.typeID, sequence)
+        _sent = time.perf_counter()
+        self.metrics.encode_time.record(_sent - _start)
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
 
         # Send data
         self.clientSocket.sendto(bytes2send, (self.remoteAddress, self.remotePort))
+        self.metrics.count_out(Message.get_schema().schema_id, len(bytes2send))
 
         # Report sent data
-        print("\n")
-        print("Data sent from Client:")
-        print("------------------------------")
-        print("     " + format(struct.unpack('!fff', bytes2send)))
-        print("------------------------------")
+        if not self.quiet:
+            logger.debug("Data sent from Client (Sequence: %s): %s", sequence, Message)
 
         # Recieved Data
-        data, remoteAddress = self.clientSocket.recvfrom(self.bufferSize)
+        # (reply with the sequence number of the message)
+        _reply = self._receive_reply(sequence, _sent + CommToolbox.COMM_CONST.TIMEOUT)
+        if _reply is None:
+            self.metrics.count('timeouts')
+            logger.warning("No reply received within timeout (Sequence: %s)", sequence)
+            return None
+        header, data, remoteAddress = _reply
+        self.metrics.round_trip_time.record(time.perf_counter() - _sent)
 
-        print("\n")
-        print("Received Data:")
-        print("------------------------------")
-        print(" IP Address: " + format(remoteAddress[0]))
-        print(" Port: " + format(remoteAddress[1]))
-        print("------------------------------")
-        print("     " + format(struct.unpack('!fff', data)))
-        print("------------------------------")
+        # Unpack data
+        # (decoded to a new object using the Schema Registry)
+        _start = time.perf_counter()
+        try:
+            received = self._decode_reply(header, data)
+        except CommSchema.DECODE_ERRORS as error:
+            self.metrics.count('decode_errors')
+            logger.warning("Invalid data received from %s: %s", remoteAddress, error)
+            return None
+        self.metrics.decode_time.record(time.perf_counter() - _start)
+
+        # Report received data
+        if not self.quiet:
+            logger.debug("Data received from %s (Sequence: %s): %s", remoteAddress, header.sequence, received)
+
+        # Function return
+        return received
+
+    # Receive Reply
+    # ------------------------------
+    def _receive_reply(self, sequence : int, deadline : float):
+        """
+        Receive the reply of a sequence number (see "sendData")
+        Invalid datagrams and replies of other sequence numbers (e.g. late replies
+        of earlier messages) are dropped until the deadline
+        :param sequence: Sequence number of the sent message (int)
+        :param deadline: Deadline of the reply (time.perf_counter)
+        :return reply: Communication Header, received data and remote address (None: no reply within the deadline)
+        """
+        while True:
+
+            # Wait for data until the deadline
+            _remaining = deadline - time.perf_counter()
+            try:
+                if (_remaining <= 0.0) or not select.select([self.clientSocket], [], [], _remaining)[0]:
+                    return None
+                _batch = CommToolbox.recv_batch(self.clientSocket, self.receivePool)
+            except (BlockingIOError, socket.timeout):
+                continue
+            if not _batch:
+                continue
+            data, remoteAddress = _batch[0]
+
+            # Header
+            try:
+                header = CommToolbox.unpack_header(data)
+            except ValueError as error:
+                self.metrics.count('decode_errors')
+                logger.warning("Invalid data received from %s: %s", remoteAddress, error)
+                continue
+            self.metrics.count_in(header.schema_id, len(data))
+
+            # Reply of another sequence number
+            if header.sequence != sequence:
+                self.lateReplies += 1
+                if not self.quiet:
+                    logger.debug("Late reply received from %s (Sequence: %s)", remoteAddress, header.sequence)
+                continue
+
+            # Function return
+            return header, data, remoteAddress
+
+    # Decode Reply
+    # ------------------------------
+    def _decode_reply(self, header, data):
+        """
+        Decode a reply to a new object, using the Schema Registry (by Schema ID of the header)
+        (the schema of a sent message is registered, including the data-shape of its lists)
+        :param header: Communication Header (COMM_HEADER)
+        :param data: Received data (memoryview of a Receive Buffer Pool)
+        :return reply: Decoded reply (GenericCommClass)
+        """
+        schema = CommSchema.get_registered_schema(header.schema_id)
+        if schema is None:
+            raise ValueError('Unknown Schema ID {%s}' %header.schema_id)
+
+        # Check data-content against the size of the schema
+        if header.content_length != schema.size:
+            raise ValueError('Content length {%s} does NOT match {%r}' %(header.content_length, schema))
+
+        # Function return
+        return schema.remap(schema.unpack_from(data, header.header_length))
+
+    # UDP Client Send Request
+    # ------------------------------
+    def sendRequest(self, Message=None, Timeout=None, Retries=None) -> Future:
+        """
+        Send a message to the server without waiting for the reply
+        Replies are matched to the requests by sequence number, on a reply receiver thread.
+        Several requests can wait for their reply (up to the window), sending
+        waits while the window is full
+        :param Message: Message object (GenericCommClass) (default: Axis-Data)
+        :param Timeout: Deadline of the reply in seconds, after each send (default: COMM_CONST.TIMEOUT)
+        :param Retries: Number of times the request is sent again after its deadline (default: 0)
+        :return future: Future of the reply, decoded by the Schema ID of the reply
+                        (TimeoutError: no reply received within the deadline of the last send)
+        """
+
+        # Set Message as default value
+        # If no argument value was given
+        if Message is None:
+            Message = AxisData(45.0, 107.5, 0.33)
+
+        # Set Timeout and Retries as default values
+        # If no argument value was given
+        if Timeout is None:
+            Timeout = CommToolbox.COMM_CONST.TIMEOUT
+        if Retries is None:
+            Retries = 0
+
+        # Start reply receiver thread
+        if self.replyReceiver is None:
+            self.replyReceiver = threading.Thread(target=self._receive_replies, name='UDP Client Replies', daemon=True)
+            self.replyReceiver.start()
+
+        _schemaID = Message.get_schema().schema_id
+        with self.pendingCondition:
+            # Wait for the window
+            while len(self.pending) >= self.window:
+                self.pendingCondition.wait()
+
+            # Packing data
+            sequence = self.sequence
+            self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+            _start = time.perf_counter()
+            request = _Request(Message, Message.pack_frame(self.typeID, sequence), Timeout, Retries)
+            self.metrics.encode_time.record(time.perf_counter() - _start)
+
+            # Send data
+            # (request is pending before it is sent, the reply can not arrive before it)
+            request.sent = time.perf_counter()
+            request.deadline = request.sent + Timeout
+            self.pending[sequence] = request
+            self.clientSocket.sendto(request.frame, (self.remoteAddress, self.remotePort))
+        self.metrics.count_out(_schemaID, len(request.frame))
+
+        # Report sent data
+        if not self.quiet:
+            logger.debug("Request sent from Client (Sequence: %s): %s", sequence, Message)
+
+        # Function return
+        return request.future
+
+    # UDP Client Wait Requests
+    # ------------------------------
+    def waitRequests(self, Timeout=None) -> bool:
+        """
+        Wait until every pending request has received its reply (or passed its deadline)
+        :param Timeout: Time to wait in seconds (default: wait until done)
+        :return done: No pending requests (bool)
+        """
+        with self.pendingCondition:
+            return self.pendingCondition.wait_for(lambda: not self.pending, Timeout)
+
+    # Reply Receiver
+    # ------------------------------
+    def _receive_replies(self):
+        while not self.stopEvent.is_set():
+
+            # Deadlines
+            # (wait for replies until the next deadline)
+            _timeout = self._check_deadlines()
+
+            # Received replies
+            try:
+                if not select.select([self.clientSocket], [], [], _timeout)[0]:
+                    continue
+                _batch = CommToolbox.recv_batch(self.clientSocket, self.replyPool)
+            except (BlockingIOError, socket.timeout):
+                continue
+            except (OSError, ValueError):
+                # Socket closed
+                if self.stopEvent.is_set() or self.clientSocket.fileno() < 0:
+                    return
+                continue
+            _received = time.perf_counter()
+            for data, remoteAddress in _batch:
+                self._handle_reply(data, remoteAddress, _received)
+
+    # Handle Reply
+    # ------------------------------
+    def _handle_reply(self, data, remoteAddress, received : float):
+
+        # Header
+        try:
+            header = CommToolbox.unpack_header(data)
+        except ValueError as error:
+            self.metrics.count('decode_errors')
+            logger.warning("Invalid data received from %s: %s", remoteAddress, error)
+            return
+        self.metrics.count_in(header.schema_id, len(data))
+
+        # Pending request of the sequence number
+        with self.pendingCondition:
+            request = self.pending.pop(header.sequence, None)
+            self.pendingCondition.notify_all()
+        if (request is None) or request.future.cancelled():
+            self.lateReplies += 1
+            if not self.quiet:
+                logger.debug("Late reply received from %s (Sequence: %s)", remoteAddress, header.sequence)
+            return
+
+        # Round-trip time
+        # (not measured for retransmitted requests, the reply can be of any send)
+        if not request.retransmitted:
+            self.metrics.round_trip_time.record(received - request.sent)
+
+        # Unpack data
+        # (decoded to a new object using the Schema Registry)
+        _start = time.perf_counter()
+        try:
+            reply = self._decode_reply(header, data)
+        except CommSchema.DECODE_ERRORS as error:
+            self.metrics.count('decode_errors')
+            request.complete(error = error)
+            return
+        self.metrics.decode_time.record(time.perf_counter() - _start)
+
+        # Report received data
+        if not self.quiet:
+            logger.debug("Reply received from %s (Sequence: %s): %s", remoteAddress, header.sequence, reply)
+        request.complete(reply)
+
+    # Check Deadlines
+    # ------------------------------
+    def _check_deadlines(self) -> float:
+        """
+        Send requests again after their deadline, or fail them (no retries left)
+        :return timeout: Time until the next deadline in seconds (at most 0.1, the stop event is checked)
+        """
+        _now = time.perf_counter()
+        _timeout = 0.1
+        _expired = []
+        with self.pendingCondition:
+            for sequence, request in list(self.pending.items()):
+                if request.deadline > _now:
+                    _timeout = min(_timeout, request.deadline - _now)
+                    continue
+
+                # Send request again
+                if request.retries > 0:
+                    request.retries -= 1
+                    request.retransmitted = True
+                    request.deadline = _now + request.timeout
+                    _timeout = min(_timeout, request.timeout)
+                    self.clientSocket.sendto(request.frame, (self.remoteAddress, self.remotePort))
+                    self.metrics.count('retransmits')
+                    continue
+
+                # No reply within the deadline
+                del self.pending[sequence]
+                _expired.append((sequence, request))
+            if _expired:
+                self.pendingCondition.notify_all()
+
+        # Fail requests
+        # (outside the lock, callbacks of the futures may send new requests)
+        for sequence, request in _expired:
+            if not request.complete(error = TimeoutError('No reply received within deadline (Sequence: %s)' %(sequence))):
+                continue
+            self.metrics.count('timeouts')
+            logger.warning("No reply received within deadline (Sequence: %s)", sequence)
+
+        # Function return
+        return _timeout
+
+    # UDP Client Close
+    # ------------------------------
+    def close(self):
+        """
+        Close the client (pending requests are cancelled)
+        """
+        self.stopEvent.set()
+        if self.replyReceiver is not None:
+            self.replyReceiver.join()
+        with self.pendingCondition:
+            _pending = list(self.pending.values())
+            self.pending.clear()
+            self.pendingCondition.notify_all()
+        for request in _pending:
+            request.future.cancel()
+        self.clientSocket.close()
 
 if __name__ == "__main__":
+    CommToolbox.configure_logging()
+
     udpClient = UDPClient()
 
+    udpClient.sendSchemas()
+
     udpClient.sendData()
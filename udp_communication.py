@@ -5,14 +5,54 @@
 
 # Version
 # ------------------------------
+# 0.8   -   Updated with quiet mode of the instance
+#           (logging levels are left to "configure_logging")
+#           [17.10.2026]
+# 0.7   -   Updated with kernel drop check used by
+#           the receive pipeline, see "udp_pipeline"
+#           [17.10.2026]
+# 0.6   -   Updated with port sharing (SO_REUSEPORT),
+#           see "udp_workers"
+#           [17.10.2026]
+# 0.5   -   Updated with Communication Metrics
+#           (packet, byte and error counters,
+#           decode time histogram)
+#           [16.10.2026]
+# 0.4   -   Updated with quiet mode, per-packet reports
+#           through level-gated, rate-limited logging
+#           [16.10.2026]
+# 0.3   -   Updated with socket buffer sizes
+#           and kernel drop reporting
+#           [16.10.2026]
+# 0.2   -   Updated with batched receive into
+#           a Receive Buffer Pool (recvfrom_into)
+#           [16.10.2026]
+# 0.1   -   Updated with Communication Header framing
+#           (messages are decoded by Schema ID,
+#           using the Schema Registry)
+#           [16.10.2026]
 # 0.0   -   Initial version
 #           [16.06.2022] - Jan T. Olsen
 
 # Import packages
+import logging
 import socket
 import struct
 import time
 
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+import lib.comm_schema as CommSchema
+from lib.comm_metrics import CommMetrics
+from comm_data import AxisData
+
+# Logger
+# (per-packet reports are rate-limited, and only formatted when emitted)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
+
 # UDP-Communication Class
 # ------------------------------
 class UDPCommunication():
@@ -29,7 +69,9 @@ class UDPCommunication():
     TCP = socket.SOCK_STREAM
 
     # Class constructor
-    def __init__(self, Address=None, Port=None, BufferSize=None):
+    def __init__(self, Address=None, Port=None, BufferSize=None, Messages=None, BatchSize=None,
+                 ReceiveBufferSize=None, SendBufferSize=None, Quiet=None, Metrics=None, MetricsInterval=None,
+                 ReusePort=None):
         
         # Class arguments and default values
         # ------------------------------
@@ -57,6 +99,66 @@ class UDPCommunication():
         else:
             self.bufferSize = BufferSize 
 
+        # Set BatchSize as default value
+        # If no argument value was given
+        # (number of datagrams received per wakeup)
+        if BatchSize is None:
+            self.batchSize = 1
+        # Set BatchSize equal to class input
+        else:
+            self.batchSize = BatchSize
+
+        # Receive Buffer Pool
+        # (datagrams are received into preallocated slots)
+        self.receivePool = CommToolbox.BufferPool(self.batchSize, self.bufferSize)
+
+        # Set Quiet as default value
+        # If no argument value was given
+        # (quiet production mode: per-packet reports are not logged,
+        #  only warnings such as invalid data and kernel drops,
+        #  the level of the shared logger is left to "configure_logging")
+        if Quiet is None:
+            self.quiet = False
+        # Set Quiet equal to class input
+        else:
+            self.quiet = Quiet
+
+        # Local Configuration
+        # (socket buffer sizes, system default if no argument value was given,
+        #  port sharing with other sockets bound to the same address)
+        self.localConfig = CommToolbox.LocalConfig(self.address, self.port, self.bufferSize,
+                                                   ReceiveBufferSize=ReceiveBufferSize,
+                                                   SendBufferSize=SendBufferSize,
+                                                   ReusePort=bool(ReusePort))
+
+        # Cumulative number of datagrams dropped by the kernel (reported)
+        self.kernelDrops = 0
+
+        # Set Metrics as default value
+        # If no argument value was given
+        # (metrics can be shared by several endpoints)
+        if Metrics is None:
+            self.metrics = CommMetrics('UDP Server')
+        # Set Metrics equal to class input
+        else:
+            self.metrics = Metrics
+
+        # Periodic dump of the metrics
+        # (no dump if no argument value was given)
+        self.metricsDump = None
+        if MetricsInterval is not None:
+            self.metricsDump = self.metrics.dump_every(MetricsInterval, logger)
+
+        # Set Messages as default value
+        # If no argument value was given
+        # (messages are decoded by the Schema ID of the header)
+        self.messages = {}
+        if Messages is None:
+            Messages = [AxisData()]
+        # Register Messages
+        for message in Messages:
+            self.register_message(message)
+
         # Communication Configuration
         # ------------------------------
         self.config()
@@ -69,49 +171,139 @@ class UDPCommunication():
         # Create a datagram socket
         self.serverSocket = socket.socket(self.IPV4, self.UDP) 
 
+        # Socket buffer sizes, kernel drop counting and port sharing
+        self.dropCounting = CommToolbox.configure_socket(self.serverSocket, self.localConfig)
+
         # Bind address and IP
         self.serverSocket.bind((self.address, self.port))
+        self.port = self.serverSocket.getsockname()[1]
 
         # Report to terminal
         print("------------------------------")
         print("UPD Server: Successfully configured")
         print("IP Address: " + format(self.address))
         print("Port: " + format(self.port))
+        print("Receive Buffer: " + format(self.serverSocket.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)))
+        print("Send Buffer: " + format(self.serverSocket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)))
+        print("Kernel Drop Counting: " + format(self.dropCounting))
         print("------------------------------")
 
+    # Register Message
+    # ------------------------------
+    def register_message(self, message):
+        """
+        Register a message (Generic-Communication-Dataclass) to be received
+        Incomming messages with the related Schema ID are decoded into this object
+        :param message: Message object (GenericCommClass)
+        """
+        self.messages[message.get_schema().schema_id] = message
+
     # UDP Server Connection
     # ------------------------------
     def connect(self):
         # Connection
-        data, remote_address = self.serverSocket.recvfrom(self.bufferSize)
+        # (every ready datagram is received, up to the batch size)
+        for data, remote_address in CommToolbox.recv_batch(self.serverSocket, self.receivePool, drop_counting=self.dropCounting):
+            self.handle_message(data, remote_address)
+
+        # Report datagrams dropped by the kernel
+        self.check_kernel_drops()
+
+    # UDP Server Check Kernel Drops
+    # ------------------------------
+    def check_kernel_drops(self):
+        """
+        Report datagrams dropped by the kernel
+        (receive queue overflow since the last report, see "CommToolbox.configure_socket")
+        """
+        if self.receivePool.kernel_drops != self.kernelDrops:
+            self.metrics.count('drops', self.receivePool.kernel_drops - self.kernelDrops)
+            logger.warning("Datagrams dropped by kernel: %s (total: %s)",
+                           self.receivePool.kernel_drops - self.kernelDrops, self.receivePool.kernel_drops)
+            self.kernelDrops = self.receivePool.kernel_drops
+
+    # UDP Server Handle Message
+    # ------------------------------
+    def handle_message(self, data, remote_address):
+        """
+        Handle a received message (Communication Header and data-content)
+        :param data: Received message (memoryview of the Receive Buffer Pool)
+        :param remote_address: Remote address (IP, Port)
+        """
+
+        # Header
+        try:
+            header = CommToolbox.unpack_header(data)
+        except ValueError as error:
+            self.metrics.count('decode_errors')
+            logger.warning("Invalid data received from Client %s: %s", remote_address, error)
+            return
+        self.metrics.count_in(header.schema_id, len(data))
+
+        # Schema Definitions
+        # (exchanged once at startup, registered in the Schema Registry)
+        if header.schema_id == CommSchema.SCHEMA_DEFINITION_ID:
+            try:
+                schemas = CommSchema.register_definitions(data[header.header_length:header.header_length + header.content_length])
+            except CommSchema.DECODE_ERRORS as error:
+                self.metrics.count('decode_errors')
+                logger.warning("Invalid schema definitions received from Client %s: %s", remote_address, error)
+                return
+            if not self.quiet:
+                logger.info("Schema definitions received from Client %s: %s", remote_address, schemas)
+            return
 
         # Data
-        udp_data = format(struct.unpack('!fff', data))
+        # (decoded in-place into the registered message of the Schema ID,
+        #  or to a new object using the Schema Registry)
+        message = self.messages.get(header.schema_id)
+        schema = CommSchema.get_registered_schema(header.schema_id)
+        if schema is None:
+            self.metrics.count('decode_errors')
+            logger.warning("Unknown Schema ID received from Client %s: %s", remote_address, header.schema_id)
+            return
+
+        # Check data-content against the size of the schema
+        elif header.content_length != schema.size:
+            self.metrics.count('decode_errors')
+            logger.warning("Invalid data received from Client %s: Content length %s does NOT match %r",
+                           remote_address, header.content_length, schema)
+            return
+
+        else:
+            try:
+                if message is not None:
+                    _start = time.perf_counter()
+                    message.unpack_from(data, header.header_length, in_place=True)
+                    self.metrics.decode_time.record(time.perf_counter() - _start)
+
+                # Message is only decoded to be reported
+                elif (not self.quiet) and logger.isEnabledFor(logging.DEBUG):
+                    message = schema.remap(schema.unpack_from(data, header.header_length))
+
+            # Data-content can not be decoded (e.g. invalid UTF-8 string)
+            except CommSchema.DECODE_ERRORS as error:
+                self.metrics.count('decode_errors')
+                logger.warning("Invalid data received from Client %s: %s", remote_address, error)
+                return
 
         # Report received data
-        print("\n")
-        print("Data received from Client:")
-        print("------------------------------")
-        print(" IP Address: " + format(remote_address[0]))
-        print(" Port: " + format(remote_address[1]))
-        print("------------------------------")
-        print("     " + udp_data)
-        print("------------------------------")
+        if not self.quiet:
+            logger.debug("Data received from Client %s (Type ID: %s, Sequence: %s): %s",
+                         remote_address, header.type_id, header.sequence, message)
 
         # Send Data
         # (just returning incoming data)
         self.serverSocket.sendto(data, remote_address)
+        self.metrics.count_out(header.schema_id, len(data))
 
-        print("\n")
-        print("Data sent to Client:")
-        print("------------------------------")
-        print(" IP Address: " + format(remote_address[0]))
-        print(" Port: " + format(remote_address[1]))
-        print("------------------------------")
-        print("     " + udp_data)
-        print("------------------------------")
+        # Report sent data
+        if not self.quiet:
+            logger.debug("Data sent to Client %s: %s", remote_address, message)
 
 if __name__ == "__main__":
+    CommToolbox.configure_logging()
+
     udpComm = UDPCommunication()
 
     while True:
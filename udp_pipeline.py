@@ -0,0 +1,321 @@
+# UDP Receive Pipeline
+# ------------------------------
+# Description:
+# Receive pipeline for the UDP Communication
+# A receiver thread only receives datagrams (copied from the Receive Buffer Pool)
+# into a bounded ring, and a pool of worker threads decodes and handles them.
+# A slow handler fills the ring instead of the kernel receive buffer, and
+# overload is handled by the drop policy of the ring:
+#  - Drop-oldest : The oldest queued datagram is dropped (latest data is kept)
+#  - Drop-newest : The received datagram is dropped (queued data is kept)
+#  - Block : The receiver waits for space (the kernel buffer fills and drops)
+# Queue depth, high-water mark and drops are available as gauges
+
+# Version
+# ------------------------------
+# 0.0   -   Initial version
+#           [17.10.2026]
+
+# Import packages
+from collections import deque
+import logging
+import queue
+import socket
+import threading
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+from udp_communication import UDPCommunication
+
+# Logger
+# (drop reports are rate-limited)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
+
+# Drop Policies
+DROP_OLDEST : str = 'drop-oldest'
+DROP_NEWEST : str = 'drop-newest'
+BLOCK       : str = 'block'
+DROP_POLICIES : tuple = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# Bounded Ring
+# ------------------------------
+class BoundedRing():
+    """
+    Bounded Ring
+    Thread-safe queue with a fixed capacity and a drop policy for a full ring
+    (see "DROP_POLICIES"). Counts queued, dropped and taken items, and the
+    highest number of queued items (high-water mark)
+    """
+
+    def __init__(self, capacity : int, policy : str = DROP_OLDEST) -> None:
+        if capacity < 1:
+            raise ValueError('BoundedRing: ERROR - Capacity {%s} is invalid' %(capacity))
+        if policy not in DROP_POLICIES:
+            raise ValueError('BoundedRing: ERROR - Drop policy {%s} is unsupported' %(policy))
+        self.capacity = capacity
+        self.policy = policy
+        self.closed = False
+
+        # Gauges
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.high_water = 0
+
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # Put
+    # ------------------------------
+    def put(self, item) -> bool:
+        """
+        Queue an item (a full ring is handled by the drop policy)
+        :param item: Item
+        :return queued: Item is queued (bool) (False: item is dropped, or the ring is closed)
+        """
+        with self._lock:
+            if self.closed:
+                return False
+
+            # Full ring
+            if len(self._items) >= self.capacity:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    while (len(self._items) >= self.capacity) and (not self.closed):
+                        self._not_full.wait()
+                    if self.closed:
+                        return False
+
+            # Queue item
+            self._items.append(item)
+            self.put_count += 1
+            if len(self._items) > self.high_water:
+                self.high_water = len(self._items)
+            self._not_empty.notify()
+
+        # Function return
+        return True
+
+    # Get
+    # ------------------------------
+    def get(self, timeout : float = None):
+        """
+        Take the oldest item
+        :param timeout: Time to wait for an item in seconds (default: wait forever)
+        :return item: Item (raises queue.Empty on timeout, or when the ring is closed and empty)
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: self._items or self.closed, timeout):
+                raise queue.Empty
+            if not self._items:
+                raise queue.Empty
+            _item = self._items.popleft()
+            self.get_count += 1
+            self._not_full.notify()
+
+        # Function return
+        return _item
+
+    # Close
+    # ------------------------------
+    def close(self) -> None:
+        """
+        Close the ring (no more items are queued, waiting threads are woken)
+        """
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    # Gauges
+    # ------------------------------
+    def gauges(self) -> dict:
+        """
+        Gauges of the ring
+        :return gauges: Depth, high-water mark, capacity, and number of queued, taken and dropped items (dict)
+        """
+        with self._lock:
+            return {'depth' : len(self._items),
+                    'high_water' : self.high_water,
+                    'capacity' : self.capacity,
+                    'policy' : self.policy,
+                    'queued' : self.put_count,
+                    'handled' : self.get_count,
+                    'dropped' : self.dropped}
+
+
+# UDP Pipeline Class
+# ------------------------------
+class UDPPipeline():
+    """
+    UDP Receive Pipeline
+    Receives datagrams of a UDP Communication on a receiver thread, and handles them
+    on a pool of worker threads (see "BoundedRing" for the drop policies)
+    """
+
+    # Class constructor
+    def __init__(self, UDPComm=None, Handler=None, Workers=None, QueueSize=None, DropPolicy=None):
+
+        # Class arguments and default values
+        # ------------------------------
+        # Set UDP Communication as default value
+        # If no argument value was given
+        if UDPComm is None:
+            self.udpComm = UDPCommunication()
+        # Set UDP Communication equal to class input
+        else:
+            self.udpComm = UDPComm
+
+        # Set Workers as default value
+        # If no argument value was given
+        if Workers is None:
+            self.workerCount = 1
+        # Set Workers equal to class input
+        else:
+            self.workerCount = Workers
+
+        # Set Handler as default value
+        # If no argument value was given
+        # (handler of the UDP Communication decodes in-place into the registered
+        #  messages, several workers need a thread-safe handler)
+        if Handler is None:
+            if self.workerCount > 1:
+                raise ValueError('UDPPipeline: ERROR - Several workers need a thread-safe handler')
+            self.handler = self.udpComm.handle_message
+        # Set Handler equal to class input
+        else:
+            self.handler = Handler
+
+        # Set QueueSize as default value
+        # If no argument value was given
+        if QueueSize is None:
+            QueueSize = 1024
+
+        # Set DropPolicy as default value
+        # If no argument value was given
+        if DropPolicy is None:
+            DropPolicy = DROP_OLDEST
+
+        # Bounded Ring
+        # (received datagrams as (data, remote address))
+        self.ring = BoundedRing(QueueSize, DropPolicy)
+
+        self.receiver = None
+        self.workers = []
+        self.stopEvent = threading.Event()
+
+    # Start Pipeline
+    # ------------------------------
+    def start(self):
+        """
+        Start the receiver and worker threads
+        """
+
+        # Timeout socket
+        # (the stop event is checked between receives)
+        self.udpComm.serverSocket.settimeout(0.1)
+
+        self.stopEvent.clear()
+        self.receiver = threading.Thread(target = self._receive, name = 'UDP Receiver', daemon = True)
+        self.workers = [threading.Thread(target = self._work, name = 'UDP Worker ' + format(i), daemon = True)
+                        for i in range(self.workerCount)]
+        for worker in self.workers:
+            worker.start()
+        self.receiver.start()
+
+    # Stop Pipeline
+    # ------------------------------
+    def stop(self, timeout : float = 5.0):
+        """
+        Stop the receiver and worker threads (queued datagrams are handled before the workers stop)
+        :param timeout: Time to wait for each thread in seconds (float)
+        """
+        self.stopEvent.set()
+        if self.receiver is not None:
+            self.receiver.join(timeout)
+        self.ring.close()
+        for worker in self.workers:
+            worker.join(timeout)
+
+    # Receiver
+    # ------------------------------
+    def _receive(self):
+        _udpComm = self.udpComm
+        _ring = self.ring
+        while not self.stopEvent.is_set():
+            try:
+                _batch = CommToolbox.recv_batch(_udpComm.serverSocket, _udpComm.receivePool,
+                                                drop_counting = _udpComm.dropCounting)
+            except socket.timeout:
+                continue
+            except OSError as error:
+                logger.warning('Receive error: %s', error)
+                continue
+
+            # Queue datagrams
+            # (copied from the Receive Buffer Pool, the slots are reused by the next receive)
+            for data, remote_address in _batch:
+                _dropped = _ring.dropped
+                _ring.put((bytes(data), remote_address))
+                if _ring.dropped != _dropped:
+                    _udpComm.metrics.count('drops', _ring.dropped - _dropped)
+                    logger.warning('Receive queue full, datagram dropped (policy: %s, total: %s)', _ring.policy, _ring.dropped)
+
+            # Report datagrams dropped by the kernel
+            _udpComm.check_kernel_drops()
+
+    # Worker
+    # ------------------------------
+    def _work(self):
+        while True:
+            try:
+                data, remote_address = self.ring.get(0.1)
+            except queue.Empty:
+                if self.ring.closed:
+                    return
+                continue
+
+            # Handle datagram
+            # (an error of the handler does not stop the worker)
+            try:
+                self.handler(data, remote_address)
+            except Exception:
+                logger.exception('Handler error, datagram from %s', remote_address)
+
+    # Gauges
+    # ------------------------------
+    def gauges(self) -> dict:
+        """
+        Gauges of the pipeline (queue depth, high-water mark, drops)
+        :return gauges: Gauges of the ring and number of kernel drops (dict)
+        """
+        _gauges = self.ring.gauges()
+        _gauges['kernel_drops'] = self.udpComm.kernelDrops
+        return _gauges
+
+
+if __name__ == "__main__":
+    CommToolbox.configure_logging()
+
+    udpPipeline = UDPPipeline()
+    udpPipeline.start()
+
+    try:
+        while True:
+            udpPipeline.receiver.join(5.0)
+            logger.info('Pipeline gauges: %s', udpPipeline.gauges())
+    except KeyboardInterrupt:
+        udpPipeline.stop()
@@ -0,0 +1,311 @@
+# UDP Publisher
+# ------------------------------
+# Description:
+# Cyclic publisher sending a Generic-Communication-Dataclass at a fixed period
+# (e.g. axis data to MATLAB and PLC peers at a 1 - 4 ms cycle)
+# Cycles are scheduled at absolute deadlines (start + n * period), a late cycle
+# does not delay the following cycles (no cumulative drift). The thread sleeps
+# until the last part of the cycle, which is optionally busy-waited for a
+# precise send time. Lateness, period jitter, overruns and missed cycles are recorded
+
+# Version
+# ------------------------------
+# 0.2   -   Updated with error handling per cycle
+#           (update-callback and packing errors are
+#           counted, the following cycles are sent)
+#           [17.10.2026]
+# 0.1   -   Updated with messages of variable length
+#           (Send Buffer follows the schema of the message)
+#           [17.10.2026]
+# 0.0   -   Initial version
+#           [17.10.2026]
+
+# Import packages
+import logging
+import socket
+import threading
+import time
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+from lib.comm_metrics import CommMetrics, Histogram
+from comm_data import AxisData
+
+# Logger
+# (overrun and error reports are rate-limited)
+logger = logging.getLogger(__name__)
+logger.addFilter(CommToolbox.RateLimitFilter())
+
+# UDP Publisher Class
+# ------------------------------
+class UDPPublisher():
+    """
+    UDP Publisher
+    Sends a message (Communication Header and data-content) to a remote address every period:
+     - Lateness : Send time after the deadline of the cycle (histogram, seconds)
+     - Period jitter : Deviation of the time between two sends from the period (histogram, seconds)
+     - Overruns : Cycles finished after the deadline of the next cycle
+     - Missed cycles : Cycles skipped after an overrun (the schedule is kept, not caught up)
+    """
+
+    # Class constructor
+    def __init__(self, RemoteAddress=None, RemotePort=None, Period=None, Message=None, TypeID=None,
+                 BusyWait=None, Update=None, Metrics=None):
+
+        # Class arguments and default values
+        # ------------------------------
+        # Set IP-Address as default value
+        # If no argument value was given
+        if RemoteAddress is None:
+            self.remoteAddress = '127.0.0.1'
+        # Set IP-Address equal to class input
+        else:
+            self.remoteAddress = RemoteAddress
+
+        # Set Port as default value
+        # If no argument value was given
+        if RemotePort is None:
+            self.remotePort = 22010
+        # Set Port equal to class input
+        else:
+            self.remotePort = RemotePort
+
+        # Set Period as default value
+        # If no argument value was given
+        # (cycle time in seconds)
+        if Period is None:
+            self.period = 0.004
+        # Set Period equal to class input
+        else:
+            self.period = Period
+        if self.period <= 0.0:
+            raise ValueError('UDPPublisher: ERROR - Period {%s} is invalid' %(self.period))
+
+        # Set Message as default value
+        # If no argument value was given
+        if Message is None:
+            self.message = AxisData(45.0, 107.5, 0.33)
+        # Set Message equal to class input
+        else:
+            self.message = Message
+
+        # Set Type-ID as default value
+        # If no argument value was given
+        if TypeID is None:
+            self.typeID = CommToolbox.COMM_CONST.GUI_CLIENT
+        # Set Type-ID equal to class input
+        else:
+            self.typeID = TypeID
+
+        # Set BusyWait as default value
+        # If no argument value was given
+        # (fraction of the period busy-waited before the deadline, 0.0: sleep only)
+        if BusyWait is None:
+            self.busyWait = 0.0
+        # Set BusyWait equal to class input
+        else:
+            self.busyWait = BusyWait
+        if not 0.0 <= self.busyWait <= 1.0:
+            raise ValueError('UDPPublisher: ERROR - Busy-wait fraction {%s} is invalid' %(self.busyWait))
+
+        # Set Update as default value
+        # If no argument value was given
+        # (called as Update(message, cycle) before every send, e.g. to set the axis positions)
+        self.update = Update
+
+        # Set Metrics as default value
+        # If no argument value was given
+        if Metrics is None:
+            self.metrics = CommMetrics('UDP Publisher')
+        # Set Metrics equal to class input
+        else:
+            self.metrics = Metrics
+
+        # Cycle Statistics
+        self.lateness = Histogram()
+        self.periodJitter = Histogram()
+        self.cycles = 0
+        self.overruns = 0
+        self.missedCycles = 0
+
+        # Sequence number of sent messages
+        self.sequence = 0
+
+        self.publisher = None
+        self.stopEvent = threading.Event()
+
+        # Communication Configuration
+        # ------------------------------
+        self.config()
+
+    # UDP Publisher Configuration
+    # ------------------------------
+    def config(self):
+        # Create a datagram socket
+        # (connected to the remote address)
+        self.publisherSocket = socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.UDP)
+        self.publisherSocket.connect((self.remoteAddress, self.remotePort))
+
+        # Send Buffer
+        # (header and message are packed into the same buffer every cycle,
+        #  resized if the schema of the message changes, see "publish")
+        self.schema = self.message.get_schema()
+        self.sendBuffer = bytearray(CommToolbox.HEADER_SIZE + self.schema.size)
+
+        # Report to terminal
+        print("------------------------------")
+        print("UPD Publisher: Successfully configured")
+        print("IP Address: " + format(self.remoteAddress))
+        print("Port: " + format(self.remotePort))
+        print("Period: " + format(self.period * 1e3) + " ms")
+        print("------------------------------")
+
+    # Wait Until Deadline
+    # ------------------------------
+    def _wait_until(self, deadline : float) -> None:
+
+        # Sleep until the busy-wait part of the cycle
+        _remaining = deadline - self.busyWait * self.period - time.perf_counter()
+        if _remaining > 0.0:
+            time.sleep(_remaining)
+
+        # Busy-wait until the deadline
+        while time.perf_counter() < deadline:
+            pass
+
+    # Publish Message
+    # ------------------------------
+    def publish(self, cycle : int) -> None:
+        """
+        Send the message (updated by the update-callback)
+        A failing update-callback or message that can not be packed is counted
+        as an encode error, and the cycle is not sent
+        :param cycle: Cycle number (int)
+        """
+        try:
+            if self.update is not None:
+                self.update(self.message, cycle)
+
+            # Schema of the message
+            # (follows the data-shape of the message, e.g. a list changed by the update-callback,
+            #  the Send Buffer is resized with the size of the schema)
+            _start = time.perf_counter()
+            _schema = self.message.get_schema()
+            if _schema is not self.schema:
+                self.schema = _schema
+                if len(self.sendBuffer) != CommToolbox.HEADER_SIZE + _schema.size:
+                    self.sendBuffer = bytearray(CommToolbox.HEADER_SIZE + _schema.size)
+
+            # Packing data
+            CommToolbox.pack_header_into(self.sendBuffer, 0, self.typeID, _schema.size, self.sequence, _schema.schema_id)
+            _schema.pack_into(self.message, self.sendBuffer, CommToolbox.HEADER_SIZE)
+
+        # Exception(s)
+        # (the publisher thread is kept, the next cycle is sent regardless)
+        except Exception as error:
+            self.metrics.count('encode_errors')
+            logger.warning("Publish error in cycle %s: %r", cycle, error)
+            return
+        self.metrics.encode_time.record(time.perf_counter() - _start)
+
+        # Sequence number wraps with the header field (32 bits)
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+
+        # Send data
+        try:
+            self.publisherSocket.send(self.sendBuffer)
+        except OSError as error:
+            # (e.g. remote port unreachable, the next cycle is sent regardless)
+            self.metrics.count('drops')
+            logger.warning("Publish error (Sequence: %s): %s", self.sequence - 1, error)
+            return
+        self.metrics.count_out(self.schema.schema_id, len(self.sendBuffer))
+
+    # Run Publisher
+    # ------------------------------
+    def run(self, Cycles=None):
+        """
+        Publish the message every period until stopped
+        :param Cycles: Number of cycles (default: until stopped)
+        """
+        self.stopEvent.clear()
+        _period = self.period
+        _cycle = 0
+        _deadline = time.perf_counter()
+        _previous = None
+
+        while (not self.stopEvent.is_set()) and ((Cycles is None) or (_cycle < Cycles)):
+            self._wait_until(_deadline)
+
+            # Lateness and period jitter
+            _now = time.perf_counter()
+            self.lateness.record(_now - _deadline)
+            if _previous is not None:
+                self.periodJitter.record(abs(_now - _previous - _period))
+            _previous = _now
+
+            self.publish(_cycle)
+            self.cycles += 1
+            _cycle += 1
+
+            # Deadline of the next cycle
+            # (absolute, a late cycle does not move the schedule)
+            _deadline += _period
+
+            # Overrun: Deadline of the next cycle has passed
+            # (missed cycles are skipped, not sent back-to-back)
+            _now = time.perf_counter()
+            if _now > _deadline:
+                _missed = int((_now - _deadline) // _period)
+                self.overruns += 1
+                self.missedCycles += _missed
+                _deadline += _missed * _period
+                _cycle += _missed
+                logger.warning("Cycle overrun, %s cycles missed (total overruns: %s)", _missed, self.overruns)
+
+    # Start Publisher
+    # ------------------------------
+    def start(self, Cycles=None):
+        """
+        Run the publisher on a thread
+        :param Cycles: Number of cycles (default: until stopped)
+        """
+        self.publisher = threading.Thread(target=self.run, args=(Cycles,), name='UDP Publisher', daemon=True)
+        self.publisher.start()
+
+    # Stop Publisher
+    # ------------------------------
+    def stop(self):
+        """
+        Stop the publisher (after the current cycle)
+        """
+        self.stopEvent.set()
+        if self.publisher is not None:
+            self.publisher.join()
+
+    # Statistics
+    # ------------------------------
+    def statistics(self) -> dict:
+        """
+        Cycle statistics
+        :return statistics: Number of cycles, overruns and missed cycles,
+                            lateness and period jitter (histograms, seconds) (dict)
+        """
+        return {'period' : self.period,
+                'cycles' : self.cycles,
+                'overruns' : self.overruns,
+                'missed_cycles' : self.missedCycles,
+                'lateness' : self.lateness.snapshot(),
+                'period_jitter' : self.periodJitter.snapshot()}
+
+if __name__ == "__main__":
+    CommToolbox.configure_logging()
+
+    udpPublisher = UDPPublisher(Period = 0.004, TypeID = CommToolbox.COMM_CONST.MATLAB_CLIENT, BusyWait = 0.25)
+
+    try:
+        udpPublisher.run()
+    except KeyboardInterrupt:
+        logger.info("Publisher statistics: %s", udpPublisher.statistics())
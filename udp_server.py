@@ -5,6 +5,9 @@
 
 # Version
 # ------------------------------
+# 0.1   -   Updated with batched receive into
+#           a Receive Buffer Pool (recvfrom_into)
+#           [16.10.2026]
 # 0.0   -   Initial version
 #           [11.06.2022] - Jan T. Olsen
 
@@ -13,11 +16,15 @@ import socket
 import struct
 import time
 
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
 # Configuration
 # ------------------------------
 UDP_IP = "127.0.0.1"
 UDP_Port = 9090
 bufferSize = 1024
+batchSize = 64
 
 serverMessage = "Hello UPD Client (Matlab)"
 byte2send = str.encode(serverMessage)
@@ -41,6 +48,11 @@ serverSocket = socket.socket(IPv4, UDP)
 # Bind address and IP
 serverSocket.bind((UDP_IP, UDP_Port))
 
+# Receive Buffer Pool
+# (datagrams are received into preallocated slots)
+receivePool = CommToolbox.BufferPool(batchSize, bufferSize)
+axisStruct = struct.Struct('!fff')
+
 # Connection
 # ------------------------------
 
@@ -51,20 +63,21 @@ print("UPD Server: Up and listening")
 while(True):
     
     # Connection
-    data, address = serverSocket.recvfrom(bufferSize)
+    # (every ready datagram is received, up to the batch size)
+    for data, address in CommToolbox.recv_batch(serverSocket, receivePool):
 
-    # Received data
-    connectionIP = "Client IP Address: " + format(address)
-    connectionMessage = "Message from Client: " + format(struct.unpack('!fff', data))
-    
-    # Print data
-    print(connectionIP)
-    print(connectionMessage)
-
-    # Send data
-    address_matlab = ('127.0.0.1', 9091)
-    serverSocket.sendto(data, address_matlab)
-    print("UPD Server: Message sent to: {}".format(address_matlab))
+        # Received data
+        connectionIP = "Client IP Address: " + format(address)
+        connectionMessage = "Message from Client: " + format(axisStruct.unpack_from(data))
+
+        # Print data
+        print(connectionIP)
+        print(connectionMessage)
+
+        # Send data
+        address_matlab = ('127.0.0.1', 9091)
+        serverSocket.sendto(data, address_matlab)
+        print("UPD Server: Message sent to: {}".format(address_matlab))
 
         
 
@@ -0,0 +1,306 @@
+# UDP Worker Server
+# ------------------------------
+# Description:
+# Multi-core UDP Communication using worker processes
+# Every worker process runs a UDP Communication bound to the same address
+# with port sharing (SO_REUSEPORT), the kernel spreads the peers across
+# the workers (by address hash, a peer is always served by the same worker).
+# A supervisor restarts workers that exit, and aggregates the metrics
+# reported by the workers
+
+# Version
+# ------------------------------
+# 0.2   -   Updated with metrics received while stopping
+#           (workers exit once their reports are received)
+#           [17.10.2026]
+# 0.1   -   Updated with error handling per datagram
+#           (workers and their Schema Registry are kept)
+#           [17.10.2026]
+# 0.0   -   Initial version
+#           [17.10.2026]
+
+# Import packages
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+import time
+
+# Import Toolbox
+import comm_toolbox as CommToolbox
+
+# Import Class Files
+from lib.comm_metrics import CommMetrics
+from udp_communication import UDPCommunication
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# UDP Worker
+# ------------------------------
+def _run_worker(index : int, address : str, port : int, kwargs : dict, report_interval : float,
+                metrics_queue, stop) -> None:
+    """
+    Run a UDP Communication in a worker process until stopped
+    (target of the worker processes, metrics are reported on the metrics queue)
+    """
+
+    # UDP Communication
+    # (bound to the shared address)
+    udpComm = UDPCommunication(Address = address, Port = port, ReusePort = True,
+                               Metrics = CommMetrics('UDP Worker ' + format(index)), **kwargs)
+
+    # Timeout socket
+    # (the stop event is checked, and metrics reported, between receives)
+    udpComm.serverSocket.settimeout(min(report_interval, 0.1))
+    _reported = time.monotonic()
+
+    try:
+        while not stop.is_set():
+            try:
+                _batch = CommToolbox.recv_batch(udpComm.serverSocket, udpComm.receivePool, drop_counting=udpComm.dropCounting)
+            except socket.timeout:
+                _batch = ()
+
+            # Handle every datagram
+            # (a datagram that can not be handled is counted and dropped,
+            #  the worker is not restarted and keeps its Schema Registry)
+            for data, remote_address in _batch:
+                try:
+                    udpComm.handle_message(data, remote_address)
+                except Exception as error:
+                    udpComm.metrics.count('decode_errors')
+                    logger.warning('UDP Workers: Worker %s failed to handle data from %s: %s', index, remote_address, error)
+            udpComm.check_kernel_drops()
+
+            # Report metrics
+            if time.monotonic() - _reported >= report_interval:
+                metrics_queue.put((index, os.getpid(), udpComm.metrics))
+                _reported = time.monotonic()
+
+    # Report final metrics
+    finally:
+        metrics_queue.put((index, os.getpid(), udpComm.metrics))
+        udpComm.serverSocket.close()
+
+
+# UDP Worker Server Class
+# ------------------------------
+class UDPWorkerServer():
+    """
+    UDP Worker Server (Supervisor)
+    Starts a number of worker processes, each running a UDP Communication
+    bound to the same address (SO_REUSEPORT). Workers that exit are restarted,
+    and the metrics of the workers are aggregated (metrics of exited workers are kept)
+    """
+
+    # Class constructor
+    def __init__(self, Address=None, Port=None, Workers=None, ReportInterval=None, MetricsInterval=None,
+                 RestartDelay=None, **kwargs):
+
+        # Class arguments and default values
+        # ------------------------------
+        # Set IP-Address as default value
+        # If no argument value was given
+        if Address is None:
+            self.address = '127.0.0.1'
+        # Set IP-Address equal to class input
+        else:
+            self.address = Address
+
+        # Set Port as default value
+        # If no argument value was given
+        # (port 0: a free port is shared by the workers)
+        if Port is None:
+            self.port = 22010
+        # Set Port equal to class input
+        else:
+            self.port = Port
+
+        # Set Workers as default value
+        # If no argument value was given
+        # (one worker per CPU core)
+        if Workers is None:
+            self.workerCount = os.cpu_count() or 1
+        # Set Workers equal to class input
+        else:
+            self.workerCount = Workers
+
+        # Set ReportInterval as default value
+        # If no argument value was given
+        # (interval of the metrics reported by the workers)
+        if ReportInterval is None:
+            self.reportInterval = 1.0
+        # Set ReportInterval equal to class input
+        else:
+            self.reportInterval = ReportInterval
+
+        # Set MetricsInterval as default value
+        # If no argument value was given
+        # (interval of the aggregated metrics dump, no dump if no argument value was given)
+        self.metricsInterval = MetricsInterval
+
+        # Set RestartDelay as default value
+        # If no argument value was given
+        # (minimum time between restarts of a worker)
+        if RestartDelay is None:
+            self.restartDelay = 1.0
+        # Set RestartDelay equal to class input
+        else:
+            self.restartDelay = RestartDelay
+
+        # Arguments of the UDP Communication of the workers
+        # (BufferSize, Messages, BatchSize, etc)
+        kwargs.setdefault('Quiet', True)
+        self.workerArguments = kwargs
+
+        # Worker processes and start time (by worker index)
+        self.workers = {}
+        self.started = {}
+        self.restarts = 0
+
+        # Metrics of the worker processes (by process ID)
+        # (metrics are cumulative, the last report of every worker process
+        #  is kept, including the worker processes that have exited)
+        self.workerMetrics = {}
+
+        self.metricsQueue = multiprocessing.Queue()
+        self.stopEvent = multiprocessing.Event()
+        self._dumped = time.monotonic()
+
+    # Start Workers
+    # ------------------------------
+    def start(self):
+        """
+        Start the worker processes
+        """
+
+        # Free port
+        # (released before the workers are started, a socket bound
+        #  by the supervisor would be inherited by the workers)
+        if self.port == 0:
+            with socket.socket(CommToolbox.COMM_CONST.IPV4, CommToolbox.COMM_CONST.UDP) as _socket:
+                _socket.bind((self.address, 0))
+                self.port = _socket.getsockname()[1]
+
+        # Start workers
+        for index in range(self.workerCount):
+            self._start_worker(index)
+
+        # Report
+        logger.info('UDP Workers: %s workers started on (%s:%s)', self.workerCount, self.address, self.port)
+
+    def _start_worker(self, index : int) -> None:
+        _worker = multiprocessing.Process(target = _run_worker, name = 'UDP Worker ' + format(index), daemon = True,
+                                          args = (index, self.address, self.port, self.workerArguments,
+                                                  self.reportInterval, self.metricsQueue, self.stopEvent))
+        _worker.start()
+        self.workers[index] = _worker
+        self.started[index] = time.monotonic()
+
+    # Receive Metrics
+    # ------------------------------
+    def _receive_metrics(self, timeout : float) -> None:
+
+        # Wait for the first report, then receive every queued report
+        try:
+            _report = self.metricsQueue.get(timeout = timeout)
+        except queue.Empty:
+            return
+        while True:
+            index, pid, metrics = _report
+            self.workerMetrics[pid] = metrics
+
+            try:
+                _report = self.metricsQueue.get_nowait()
+            except queue.Empty:
+                return
+
+    # Supervise Workers
+    # ------------------------------
+    def supervise(self, timeout : float = 0.1) -> None:
+        """
+        Receive the metrics of the workers and restart exited workers
+        :param timeout: Time to wait for metrics in seconds (float)
+        """
+        self._receive_metrics(timeout)
+
+        # Restart exited workers
+        # (last reported metrics of the exited worker process are kept)
+        for index, worker in list(self.workers.items()):
+            if worker.is_alive() or self.stopEvent.is_set():
+                continue
+            if time.monotonic() - self.started[index] < self.restartDelay:
+                continue
+            logger.warning('UDP Workers: Worker %s exited (exit code: %s), restarting', index, worker.exitcode)
+            self.restarts += 1
+            self._start_worker(index)
+
+        # Dump aggregated metrics
+        if (self.metricsInterval is not None) and (time.monotonic() - self._dumped >= self.metricsInterval):
+            self.metrics().dump(logger)
+            self._dumped = time.monotonic()
+
+    # Aggregated Metrics
+    # ------------------------------
+    def metrics(self) -> CommMetrics:
+        """
+        Aggregated metrics of every worker process (last reported by the worker processes)
+        :return metrics: Communication Metrics
+        """
+        _metrics = CommMetrics('UDP Workers')
+        for metrics in self.workerMetrics.values():
+            _metrics.merge(metrics)
+            _metrics.started = min(_metrics.started, metrics.started)
+
+        # Function return
+        return _metrics
+
+    # Stop Workers
+    # ------------------------------
+    def stop(self, timeout : float = 5.0) -> None:
+        """
+        Stop the worker processes (the final metrics of the workers are received)
+        :param timeout: Time to wait for the workers in seconds (float)
+        """
+        self.stopEvent.set()
+        _deadline = time.monotonic() + timeout
+
+        # Receive metrics until the workers have exited
+        # (a worker process does not exit before its queued reports are received)
+        while any(worker.is_alive() for worker in self.workers.values()) and (time.monotonic() < _deadline):
+            self._receive_metrics(0.05)
+
+        # Terminate remaining workers, and receive the last reports
+        for worker in self.workers.values():
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+        self._receive_metrics(0.1)
+
+    # Run
+    # ------------------------------
+    def run(self) -> None:
+        """
+        Start the workers and supervise them until interrupted
+        """
+        self.start()
+        try:
+            while True:
+                self.supervise(1.0)
+
+        # Exception(s)
+        except KeyboardInterrupt:
+            logger.info('UDP Workers: keyboard interrupt, exiting')
+        finally:
+            self.stop()
+            self.metrics().dump(logger)
+
+
+if __name__ == "__main__":
+    CommToolbox.configure_logging(logging.INFO)
+
+    udpWorkers = UDPWorkerServer(MetricsInterval = 5.0)
+
+    udpWorkers.run()